@@ -12,124 +12,163 @@ Schema notes:
   - If CSV only has a single `alliance` (legacy), create `alliances` using
     that value for 2020 and copy to other years as needed.
 - bihar_election_results_consolidated.csv -> JSON keeps all fields, including
-  runner fields for 2010/2015/2020. Output objects are written with a
-  canonical key order for readability.
+  runner fields for every year. Output objects are written with a
+  canonical key order for readability (results_long.wide_order, derived
+  from the y<year>_* columns present).
 - Other CSV files are converted as-is (row-per-object) without field renaming.
+
+Streaming: rows are read, transformed and written one at a time, so memory
+stays flat regardless of input size. Pass --ndjson to write newline-delimited
+JSON (<stem>.ndjson, one compact object per line) instead of a JSON array,
+or --compact for a JSON array without indentation (for publishing; the
+indent=2 default is the reviewable copy). Serialization goes through
+json_io (orjson when installed, same bytes as stdlib).
+--profile / --cprofile record per-stage timings (see stage_profile.py).
 """
 
 import csv
-import json
 import pathlib
 import sys
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Iterable, Iterator
+
+import json_io
+import stage_profile
+from results_long import wide_order
 
 
-def _preferred_order_for(filename: str) -> List[str] | None:
+def _preferred_order_for(filename: str, keys: Iterable[str] = ()) -> List[str] | None:
     name = filename.lower()
     if name.startswith("bihar_election_results_consolidated"):
-        return [
-            "no","constituency_name","slug","district","reserved",
-            "lok_sabha_no","lok_sabha",
-            # 2010
-            "y2010_winner_name","y2010_winner_party","y2010_winner_votes",
-            "y2010_runner_name","y2010_runner_party","y2010_runner_votes",
-            "y2010_margin",
-            # 2015
-            "y2015_winner_name","y2015_winner_party","y2015_winner_votes",
-            "y2015_runner_name","y2015_runner_party","y2015_runner_votes",
-            "y2015_margin",
-            # 2020
-            "y2020_winner_name","y2020_winner_party","y2020_winner_votes",
-            "y2020_runner_name","y2020_runner_party","y2020_runner_votes",
-            "y2020_margin",
-            # 2025 placeholders
-            "y2025_winner_name","y2025_winner_party","y2025_winner_votes",
-            "y2025_runner_name","y2025_runner_party","y2025_runner_votes",
-            "y2025_margin",
-            # current
-            "current_mla_name","current_mla_party","current_mla_alliance","current_remarks",
-            "diff_party_vs_2020","diff_name_vs_2020",
-        ]
+        # Year columns follow the data (results_long.wide_order), not a fixed list
+        return wide_order(keys)
     if name.startswith("parties"):
         # Do not enforce order for parties; schema writes nested "alliances"
         return None
     return None
 
 
-def csv_to_records(csv_path: pathlib.Path) -> List[Dict[str, Any]]:
+def iter_csv_records(csv_path: pathlib.Path) -> Iterator[Dict[str, Any]]:
     with csv_path.open(encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
-        return [row for row in reader]
-
-
-def write_json(records: List[Dict[str, Any]], json_path: pathlib.Path) -> None:
-    json_path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
-
-
-def convert_file(csv_path: pathlib.Path) -> None:
-    records = csv_to_records(csv_path)
-
-    stem = csv_path.stem.lower()
-
-    # Schema-aware transformation for parties.csv -> new parties.json (alliances per year)
-    if stem.startswith("parties") and records:
-        transformed: List[Dict[str, Any]] = []
-        for row in records:
-            # Extract alliances for years with sensible fallbacks
-            def a(yr: int) -> str:
-                return (
-                    (row.get(f"alliance_{yr}") or row.get("alliance_2020") or row.get("alliance") or "").strip()
-                )
-            alliances = {
-                "2010": a(2010),
-                "2015": a(2015),
-                "2020": a(2020),
-                "2025": a(2025),
-            }
-            transformed.append(
-                {
-                    "code": (row.get("code", "").strip()),
-                    "name": (row.get("name", "").strip()),
-                    "color": (row.get("color", "").strip()),
-                    # Preserve flat fields if present
-                    "alliance": (row.get("alliance", "").strip()),
-                    "alliance_colour_code": (row.get("alliance_colour_code", "").strip()),
-                    "alliances": alliances,
-                }
-            )
-        records = transformed
-
-    # Canonical key order for consolidated results
-    preferred = _preferred_order_for(stem)
-    if preferred and records:
-        projected: List[Dict[str, Any]] = []
-        for r in records:
-            # Build in canonical order first
-            ordered: Dict[str, Any] = {k: r.get(k, "") for k in preferred}
-            # Append any extra keys at the end to avoid data loss
-            for k, v in r.items():
-                if k not in ordered:
-                    ordered[k] = v
-            projected.append(ordered)
-        records = projected
-
-    json_path = csv_path.with_suffix(".json")
-    write_json(records, json_path)
-    print(f"Converted {csv_path.name} -> {json_path.name} ({len(records)} records)")
+        for row in reader:
+            yield row
+
+
+def csv_to_records(csv_path: pathlib.Path) -> List[Dict[str, Any]]:
+    return list(iter_csv_records(csv_path))
+
+
+def _parties_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Extract alliances for years with sensible fallbacks
+    def a(yr: int) -> str:
+        return (
+            (row.get(f"alliance_{yr}") or row.get("alliance_2020") or row.get("alliance") or "").strip()
+        )
+    alliances = {
+        "2010": a(2010),
+        "2015": a(2015),
+        "2020": a(2020),
+        "2025": a(2025),
+    }
+    return {
+        "code": (row.get("code", "").strip()),
+        "name": (row.get("name", "").strip()),
+        "color": (row.get("color", "").strip()),
+        # Preserve flat fields if present
+        "alliance": (row.get("alliance", "").strip()),
+        "alliance_colour_code": (row.get("alliance_colour_code", "").strip()),
+        "alliances": alliances,
+    }
+
+
+def _ordered_record(row: Dict[str, Any], preferred: List[str]) -> Dict[str, Any]:
+    # Build in canonical order first
+    ordered: Dict[str, Any] = {k: row.get(k, "") for k in preferred}
+    # Append any extra keys at the end to avoid data loss
+    for k, v in row.items():
+        if k not in ordered:
+            ordered[k] = v
+    return ordered
+
+
+def transform_records(records: Iterable[Dict[str, Any]], stem: str) -> Iterator[Dict[str, Any]]:
+    """Apply the schema-aware tweaks for `stem` one row at a time."""
+    stem = stem.lower()
+    is_parties = stem.startswith("parties")
+    # Canonical key order for consolidated results, from the (CSV header) keys of the first row
+    preferred = None
+    for row in records:
+        if preferred is None:
+            preferred = _preferred_order_for(stem, row.keys()) or []
+        # Schema-aware transformation for parties.csv -> new parties.json (alliances per year)
+        if is_parties:
+            row = _parties_record(row)
+        if preferred:
+            row = _ordered_record(row, preferred)
+        yield row
+
+
+def write_json(records: Iterable[Dict[str, Any]], json_path: pathlib.Path, pretty: bool = True) -> int:
+    """Stream records as a JSON array, byte-identical to json.dumps(list, indent=2)
+    (or to the compact json_io.dumps(list) when not `pretty`)."""
+    count = 0
+    if pretty:
+        first, sep, end = "[\n  ", ",\n  ", "\n]"
+    else:
+        first, sep, end = "[", ",", "]"
+    with json_path.open("w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(first if count == 0 else sep)
+            if pretty:
+                f.write(json_io.dumps(rec, pretty=True).replace("\n", "\n  "))
+            else:
+                f.write(json_io.dumps(rec))
+            count += 1
+        f.write(end if count else "[]")
+    return count
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], ndjson_path: pathlib.Path) -> int:
+    count = 0
+    with ndjson_path.open("w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json_io.dumps(rec))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def convert_file(csv_path: pathlib.Path, ndjson: bool = False, pretty: bool = True) -> None:
+    # With --profile, "parse" is the CSV read alone and "convert" the whole streaming pass
+    records = transform_records(stage_profile.timed_iter("parse", iter_csv_records(csv_path)), csv_path.stem)
+    with stage_profile.stage("convert"):
+        if ndjson:
+            out_path = csv_path.with_suffix(".ndjson")
+            count = write_ndjson(records, out_path)
+        else:
+            out_path = csv_path.with_suffix(".json")
+            count = write_json(records, out_path, pretty)
+    print(f"Converted {csv_path.name} -> {out_path.name} ({count} records)")
 
 
 def main(args: List[str]) -> None:
+    args, profile, cprofile = stage_profile.pop_arguments(args)
+    ndjson = "--ndjson" in args
+    compact = "--compact" in args
+    args = [a for a in args if a not in ("--ndjson", "--compact")]
     if not args:
-        print("Usage: python csv_to_json.py <file1.csv> [file2.csv ...]")
+        print("Usage: python csv_to_json.py [--ndjson | --compact] [--profile[=TRACE]] [--cprofile=FILE] <file1.csv> [file2.csv ...]")
         sys.exit(1)
 
+    stage_profile.start("csv_to_json", profile, cprofile)
     for arg in args:
         path = pathlib.Path(arg)
         if not path.exists():
             print(f"Skipping {arg}: file not found")
             continue
-        convert_file(path)
+        convert_file(path, ndjson=ndjson, pretty=not compact)
+    stage_profile.finish()
 
 
 if __name__ == "__main__":
-    main(sys.argv[1:])
+    main(sys.argv[1:])
@@ -16,31 +16,50 @@ const CONFIG = {
   RESULTS_IMPORT_SHEET_NAME: 'Results (from JSON)',
 };
 
-// Canonical results key order (as per Python scripts)
-const RESULTS_PREFERRED_KEYS = [
-  'no','constituency_name','slug','district','reserved',
-  'lok_sabha_no','lok_sabha',
-  // 2010
-  'y2010_winner_name','y2010_winner_party','y2010_winner_votes',
-  'y2010_runner_name','y2010_runner_party','y2010_runner_votes',
-  'y2010_margin',
-  // 2015
-  'y2015_winner_name','y2015_winner_party','y2015_winner_votes',
-  'y2015_runner_name','y2015_runner_party','y2015_runner_votes',
-  'y2015_margin',
-  // 2020
-  'y2020_winner_name','y2020_winner_party','y2020_winner_votes',
-  'y2020_runner_name','y2020_runner_party','y2020_runner_votes',
-  'y2020_margin',
-  // 2025 placeholders
-  'y2025_winner_name','y2025_winner_party','y2025_winner_votes',
-  'y2025_runner_name','y2025_runner_party','y2025_runner_votes',
-  'y2025_margin',
-  // current
-  'current_mla_name','current_mla_party','current_mla_alliance','current_remarks',
- 'diff_party_vs_2020','diff_name_vs_2020',
+// Canonical results column order, derived from the keys present (same rules
+// as results_long.wide_order in Python): seat fields, every y<year>_* block
+// found in the data, current MLA, diff_* flags, then any other keys.
+const RESULTS_BASE_KEYS = ['no','constituency_name','slug','district','reserved','lok_sabha_no','lok_sabha'];
+const RESULTS_CURRENT_KEYS = ['current_mla_name','current_mla_party','current_mla_alliance','current_remarks'];
+const RESULTS_YEAR_SUFFIXES = [
+  'winner_name','winner_party','winner_votes',
+  'runner_name','runner_party','runner_votes',
+  'margin',
 ];
 
+function _resultsPreferredKeys(keys) {
+  const years = {};
+  const statusYears = {};
+  let diffYear = null;
+  (keys || []).forEach(k => {
+    let m = /^y(\d{4})_(.+)$/.exec(k);
+    if (m && (RESULTS_YEAR_SUFFIXES.indexOf(m[2]) !== -1 || m[2] === 'status')) {
+      years[m[1]] = true;
+      if (m[2] === 'status') statusYears[m[1]] = true;
+      return;
+    }
+    m = /^diff_(?:party|name)_vs_(\d{4})$/.exec(k);
+    if (m) diffYear = m[1];
+  });
+  const out = RESULTS_BASE_KEYS.slice();
+  Object.keys(years).sort().forEach(y => {
+    RESULTS_YEAR_SUFFIXES.forEach(s => out.push('y' + y + '_' + s));
+    if (statusYears[y]) out.push('y' + y + '_status');
+  });
+  RESULTS_CURRENT_KEYS.forEach(k => out.push(k));
+  if (diffYear) out.push('diff_party_vs_' + diffYear, 'diff_name_vs_' + diffYear);
+  return out;
+}
+
+function _keysOf(records) {
+  const seen = {};
+  const keys = [];
+  records.forEach(r => Object.keys(r || {}).forEach(k => {
+    if (!seen[k]) { seen[k] = true; keys.push(k); }
+  }));
+  return keys;
+}
+
 function onOpen() {
   const ui = SpreadsheetApp.getUi();
   ui.createMenu('Bihar Data')
@@ -549,9 +568,10 @@ function exportResultsJsonCopy() {
   const rows = _sheetToObjects(sheet);
 
   // Keep all fields; reorder to canonical order for readability
+  const preferred = _resultsPreferredKeys(_keysOf(rows));
   const out = rows
     .map(r => _sanitizeRecordStrings(r))
-    .map(r => _reorderRecord(r, RESULTS_PREFERRED_KEYS));
+    .map(r => _reorderRecord(r, preferred));
 
   const json = JSON.stringify(out, null, 2);
   _showJsonCopyDialog('Results JSON', json);
@@ -619,14 +639,9 @@ function importResultsJsonFromText(jsonText, newSheetName) {
   }
 
   // Build header: start with preferred keys, then add any extras seen
-  const seen = {};
-  const header = [];
-  RESULTS_PREFERRED_KEYS.forEach(k => { seen[k] = true; header.push(k); });
-  data.forEach(r => {
-    Object.keys(r || {}).forEach(k => {
-      if (!seen[k]) { seen[k] = true; header.push(k); }
-    });
-  });
+  const keys = _keysOf(data);
+  const header = _resultsPreferredKeys(keys);
+  keys.forEach(k => { if (header.indexOf(k) === -1) header.push(k); });
 
   const rows = data.map(r => header.map(k => {
     const v = (r && r[k] != null) ? r[k] : '';
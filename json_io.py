@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Shared JSON serialization: orjson when installed, stdlib json otherwise.
+
+Usage (library):
+    import json_io
+    text = json_io.dumps(rows)                  # compact: {"a":1,"b":[2]}
+    text = json_io.dumps(rows, pretty=True)     # review copy: json.dumps(..., indent=2)
+    json_io.write(path, rows, pretty=True)
+    data = json_io.load(path)                   # tolerates a UTF-8 BOM
+
+Usage (CLI):
+    python json_io.py --check bihar_election_results_consolidated.json results_long.json
+    (re-serializes each file with both backends, compact and pretty, and
+    exits 1 if any output differs; needs orjson installed)
+
+Both backends produce the same bytes for the data this repo writes:
+non-ASCII is written as-is (ensure_ascii=False), pretty output is
+indent=2 with ": " after keys, compact output has no spaces, and
+non-string keys are stringified. The one known difference is exponent
+notation for floats below 1e-4 or from 1e16 up ("1e-05" vs "0.00001");
+published shares and votes never fall there, and --check verifies a file.
+Integers beyond 64 bits, which orjson rejects, fall back to stdlib for
+that call. Set BIHAR_JSON_BACKEND=json to force the stdlib backend.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, List
+
+try:
+    import orjson  # optional
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+if os.environ.get("BIHAR_JSON_BACKEND", "").lower() == "json":
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+_COMPACT = (",", ":")
+
+
+def _std_dumps(obj: Any, pretty: bool, sort_keys: bool) -> str:
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+    return json.dumps(obj, ensure_ascii=False, separators=_COMPACT, sort_keys=sort_keys)
+
+
+def dumps_bytes(obj: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """UTF-8 JSON bytes; compact unless `pretty` (indent=2)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits
+    return _std_dumps(obj, pretty, sort_keys).encode("utf-8")
+
+
+def dumps(obj: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+    """JSON text; compact unless `pretty` (indent=2)."""
+    if orjson is None:
+        return _std_dumps(obj, pretty, sort_keys)
+    return dumps_bytes(obj, pretty, sort_keys).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load(path: Path) -> Any:
+    """Parse a JSON file, skipping a UTF-8 BOM if present."""
+    data = Path(path).read_bytes()
+    if data.startswith(b"\xef\xbb\xbf"):
+        data = data[3:]
+    return loads(data) if orjson is not None else json.loads(data.decode("utf-8"))
+
+
+def write(path: Path, obj: Any, pretty: bool = False, newline: bool = False) -> None:
+    data = dumps_bytes(obj, pretty)
+    Path(path).write_bytes(data + b"\n" if newline else data)
+
+
+def check_file(path: Path) -> List[str]:
+    """Modes ("compact"/"pretty") in which orjson and stdlib disagree for `path`."""
+    obj = load(path)
+    bad = []
+    for pretty in (False, True):
+        if orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)) \
+                != _std_dumps(obj, pretty, False).encode("utf-8"):
+            bad.append("pretty" if pretty else "compact")
+    return bad
+
+
+def main(args: List[str]) -> None:
+    if not args or args[0] != "--check" or len(args) < 2:
+        print("Usage: python json_io.py --check <file.json> [file2 ...]")
+        sys.exit(1)
+    if orjson is None:
+        print("orjson is not installed; nothing to compare (stdlib backend only)")
+        sys.exit(0)
+    failed = False
+    for arg in args[1:]:
+        bad = check_file(Path(arg))
+        failed |= bool(bad)
+        print(f"{arg}: {'differs (' + ', '.join(bad) + ')' if bad else 'identical'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
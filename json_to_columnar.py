@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Convert consolidated results to a compact, dictionary-encoded columnar JSON.
+
+Usage: python json_to_columnar.py bihar_election_results_consolidated.json
+       python json_to_columnar.py --decode bihar_election_results_consolidated.columnar.json
+Outputs sit alongside inputs as <stem>.columnar.json (or <stem>.rows.json
+when decoding). CSV inputs are accepted as well.
+
+Layout:
+  {
+    "format": "columnar-v1",
+    "count": 243,
+    "fields": ["no", "constituency_name", ...],       # original key order
+    "dicts": {"party": ["BJP", ...], "district": [...], ...},
+    "encoding": {"y2020_winner_party": "party", ...},  # column -> dict name
+    "columns": {"no": [1, 2, ...], "y2020_winner_party": [0, 3, ...], ...}
+  }
+
+Schema notes:
+- Party, alliance, district, reserved and Lok Sabha name columns are stored
+  as indexes into `dicts[<name>]`; empty values are `null`.
+- Seat/Lok Sabha numbers, votes and margins are real integers ("66,860" ->
+  66860); empty or unparseable values are `null`.
+- diff_* flags are 0/1.
+- All other columns are stored as plain string arrays.
+Decoding restores the row-of-dicts shape with string values; vote counts
+come back without thousands separators.
+"""
+
+import csv
+import json
+import pathlib
+import sys
+from typing import Any, Dict, List
+
+FORMAT = "columnar-v1"
+
+# Column -> shared dictionary name
+_DICT_FIXED = {
+    "district": "district",
+    "reserved": "reserved",
+    "lok_sabha": "lok_sabha",
+    "current_mla_party": "party",
+    "current_mla_alliance": "alliance",
+}
+
+
+def _dict_name_for(field: str) -> str | None:
+    if field in _DICT_FIXED:
+        return _DICT_FIXED[field]
+    if field.startswith("y") and (field.endswith("_winner_party") or field.endswith("_runner_party")):
+        return "party"
+    return None
+
+
+def _is_int_field(field: str) -> bool:
+    if field in ("no", "lok_sabha_no"):
+        return True
+    return field.startswith("y") and (field.endswith("_votes") or field.endswith("_margin"))
+
+
+def _is_flag_field(field: str) -> bool:
+    return field.startswith("diff_")
+
+
+def parse_int(val: Any) -> int | None:
+    if val is None or isinstance(val, bool):
+        return None
+    if isinstance(val, int):
+        return val
+    s = str(val).strip().replace(",", "")
+    if not s:
+        return None
+    try:
+        return int(s)
+    except ValueError:
+        try:
+            return int(float(s))
+        except ValueError:
+            return None
+
+
+def load_records(path: pathlib.Path) -> List[Dict[str, Any]]:
+    if path.suffix.lower() == ".csv":
+        with path.open(encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+    data = json.loads(path.read_text(encoding="utf-8-sig"))
+    if not isinstance(data, list):
+        raise ValueError(f"Expected list at top level in {path.name}")
+    return data
+
+
+def _collect_fields(records: List[Dict[str, Any]]) -> List[str]:
+    seen: Dict[str, None] = {}
+    for row in records:
+        for k in row.keys():
+            if k not in seen:
+                seen[k] = None
+    return list(seen.keys())
+
+
+def encode_columnar(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    fields = _collect_fields(records)
+    dicts: Dict[str, List[str]] = {}
+    lookups: Dict[str, Dict[str, int]] = {}
+    encoding: Dict[str, str] = {}
+    columns: Dict[str, List[Any]] = {}
+
+    for field in fields:
+        raw = [r.get(field) for r in records]
+        dname = _dict_name_for(field)
+        if dname:
+            encoding[field] = dname
+            values = dicts.setdefault(dname, [])
+            lookup = lookups.setdefault(dname, {})
+            col: List[Any] = []
+            for v in raw:
+                s = "" if v is None else str(v).strip()
+                if not s:
+                    col.append(None)
+                    continue
+                idx = lookup.get(s)
+                if idx is None:
+                    idx = lookup[s] = len(values)
+                    values.append(s)
+                col.append(idx)
+            columns[field] = col
+        elif _is_int_field(field):
+            columns[field] = [parse_int(v) for v in raw]
+        elif _is_flag_field(field):
+            columns[field] = [1 if str(v).strip().lower() == "true" else 0 for v in raw]
+        else:
+            columns[field] = ["" if v is None else str(v) for v in raw]
+
+    return {
+        "format": FORMAT,
+        "count": len(records),
+        "fields": fields,
+        "dicts": dicts,
+        "encoding": encoding,
+        "columns": columns,
+    }
+
+
+def decode_columnar(obj: Dict[str, Any]) -> List[Dict[str, str]]:
+    if obj.get("format") != FORMAT:
+        raise ValueError(f"Unsupported columnar format: {obj.get('format')!r}")
+    fields = obj.get("fields") or list(obj["columns"].keys())
+    dicts = obj.get("dicts") or {}
+    encoding = obj.get("encoding") or {}
+    columns = obj["columns"]
+    count = int(obj.get("count", 0))
+
+    decoded: Dict[str, List[str]] = {}
+    for field in fields:
+        col = columns.get(field) or [None] * count
+        dname = encoding.get(field)
+        if dname:
+            values = dicts.get(dname) or []
+            decoded[field] = ["" if i is None else values[i] for i in col]
+        elif _is_flag_field(field):
+            decoded[field] = ["True" if v else "False" for v in col]
+        else:
+            decoded[field] = ["" if v is None else str(v) for v in col]
+
+    return [{f: decoded[f][i] for f in fields} for i in range(count)]
+
+
+def write_columnar(obj: Dict[str, Any], out_path: pathlib.Path) -> None:
+    out_path.write_text(json.dumps(obj, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+def convert_file(path: pathlib.Path) -> None:
+    records = load_records(path)
+    obj = encode_columnar(records)
+    out_path = path.with_name(path.stem + ".columnar.json")
+    write_columnar(obj, out_path)
+    print(f"Converted {path.name} -> {out_path.name} ({len(records)} records, {len(obj['columns'])} columns)")
+
+
+def decode_file(path: pathlib.Path) -> None:
+    obj = json.loads(path.read_text(encoding="utf-8-sig"))
+    records = decode_columnar(obj)
+    stem = path.stem[: -len(".columnar")] if path.stem.endswith(".columnar") else path.stem
+    out_path = path.with_name(stem + ".rows.json")
+    out_path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"Decoded {path.name} -> {out_path.name} ({len(records)} records)")
+
+
+def main(args: List[str]) -> None:
+    decode = False
+    if args and args[0] == "--decode":
+        decode = True
+        args = args[1:]
+    if not args:
+        print("Usage: python json_to_columnar.py [--decode] <file1.json|csv> [file2 ...]")
+        sys.exit(1)
+
+    for arg in args:
+        path = pathlib.Path(arg)
+        if not path.exists():
+            print(f"Skipping {arg}: file not found")
+            continue
+        if decode:
+            decode_file(path)
+        else:
+            convert_file(path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
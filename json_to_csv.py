@@ -9,159 +9,250 @@ Schema notes:
   - If objects have `alliances` (per‑year map), write columns:
     code,name,color,alliance_2010,alliance_2015,alliance_2020,alliance_2025
   - Else (legacy schema), write columns: code,name,color,alliance
-- bihar_election_results_consolidated.json is written as-is using a
-  canonical column order if recognized; otherwise falls back to the keys
-  of the first record.
+- bihar_election_results_consolidated.json is written as-is using the
+  canonical column order (results_long.wide_order: seat fields, each year
+  present in the data, current MLA, diffs, then any extra keys); other
+  files fall back to the keys of the first record.
+
+Streaming: JSON arrays are decoded incrementally and .ndjson inputs (one
+object per line) line by line, so only one record is held in memory. When
+the column set depends on the data (parties schema, unrecognized files) the
+input is scanned once before the write pass instead of being loaded whole.
+--profile / --cprofile record per-stage timings (see stage_profile.py).
 """
 
 import csv
 import json
 import pathlib
+import re
 import sys
-from typing import Any, List, Dict, Iterable
+from typing import Any, Callable, List, Dict, Iterable, Iterator, Tuple
+
+import stage_profile
+from results_long import wide_order
+
+
+_CHUNK_SIZE = 1 << 16
+_WS = re.compile(r"[ \t\r\n]*")
+
+
+def iter_json_array(json_path: pathlib.Path, chunk_size: int = _CHUNK_SIZE) -> Iterator[Any]:
+    """Yield elements of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with json_path.open("r", encoding="utf-8-sig") as f:
+        # Records are decoded in place at `pos`; the consumed prefix is only
+        # dropped when the next chunk is read, so each byte is copied O(1) times
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_ws() -> bool:
+            """Advance past whitespace, reading more as needed; False at end of file."""
+            nonlocal pos
+            while True:
+                pos = _WS.match(buf, pos).end()
+                if pos < len(buf):
+                    return True
+                if not fill():
+                    return False
+
+        # Opening bracket
+        if not skip_ws() or buf[pos] != "[":
+            raise ValueError(f"Expected list at top level in {json_path.name}")
+        pos += 1
+        expect_item = True
+        while True:
+            if not skip_ws():
+                raise ValueError(f"Unexpected end of file in {json_path.name}")
+            if buf[pos] == "]":
+                return
+            if not expect_item:
+                if buf[pos] != ",":
+                    raise ValueError(f"Malformed JSON array in {json_path.name}")
+                pos += 1
+                expect_item = True
+                continue
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A value not yet followed by "," or "]" may be truncated at the
+            # buffer edge (e.g. "1.5" of "1.5e3"); decode it again with more input
+            nxt = _WS.match(buf, end).end()
+            if (nxt == len(buf) or buf[nxt] not in ",]") and not eof and fill():
+                continue
+            pos = end
+            expect_item = False
+            yield item
+
+
+def iter_ndjson(ndjson_path: pathlib.Path) -> Iterator[Any]:
+    with ndjson_path.open("r", encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_json_records(json_path: pathlib.Path) -> Iterator[Dict[str, Any]]:
+    if json_path.suffix.lower() in (".ndjson", ".jsonl"):
+        return iter_ndjson(json_path)
+    return iter_json_array(json_path)
 
 
 def json_to_records(json_path: pathlib.Path) -> List[Dict[str, Any]]:
-    data = json.loads(json_path.read_text(encoding="utf-8-sig"))
-    if not isinstance(data, list):
-        raise ValueError(f"Expected list at top level in {json_path.name}")
-    return data
+    return list(iter_json_records(json_path))
 
 
-def _preferred_order_for(filename: str) -> List[str] | None:
+def _preferred_order_for(filename: str, keys: Iterable[str] = ()) -> List[str] | None:
     name = filename.lower()
     if name.startswith("bihar_election_results_consolidated"):
-        return [
-            "no","constituency_name","slug","district","reserved",
-            "lok_sabha_no","lok_sabha",
-            # 2010
-            "y2010_winner_name","y2010_winner_party","y2010_winner_votes",
-            "y2010_runner_name","y2010_runner_party","y2010_runner_votes",
-            "y2010_margin",
-            # 2015
-            "y2015_winner_name","y2015_winner_party","y2015_winner_votes",
-            "y2015_runner_name","y2015_runner_party","y2015_runner_votes",
-            "y2015_margin",
-            # 2020
-            "y2020_winner_name","y2020_winner_party","y2020_winner_votes",
-            "y2020_runner_name","y2020_runner_party","y2020_runner_votes",
-            "y2020_margin",
-            # 2025 (placeholders until results available)
-            "y2025_winner_name","y2025_winner_party","y2025_winner_votes",
-            "y2025_runner_name","y2025_runner_party","y2025_runner_votes",
-            "y2025_margin",
-            "current_mla_name","current_mla_party","current_mla_alliance","current_remarks",
-            "diff_party_vs_2020","diff_name_vs_2020",
-        ]
+        # Year columns follow the data (results_long.wide_order), not a fixed list
+        return wide_order(keys)
     if name.startswith("parties"):
         # Caller will decide exact parties columns based on detected schema
         return None
     return None
 
 
-def _collect_fieldnames(records: Iterable[Dict[str, Any]]) -> List[str]:
+def _scan(records: Iterable[Dict[str, Any]]) -> Tuple[int, bool, List[str]]:
+    """One pass over the input: record count, per-year alliances present, key union."""
+    count = 0
+    has_per_year = False
     seen: Dict[str, None] = {}
     for row in records:
+        count += 1
+        if isinstance(row.get("alliances"), dict):
+            has_per_year = True
         for k in row.keys():
             if k not in seen:
                 seen[k] = None
-    return list(seen.keys())
+    return count, has_per_year, list(seen.keys())
+
+
+def _parties_val(r: Dict[str, Any], yr: int) -> str:
+    alliances = r.get("alliances") or {}
+    return (alliances.get(str(yr))
+            or alliances.get(yr)
+            or r.get(f"alliance_{yr}")
+            or r.get("alliance")
+            or "")
 
 
-def write_csv(records: List[Dict[str, Any]], csv_path: pathlib.Path) -> None:
-    if not records:
+def write_csv(
+    records: Iterable[Dict[str, Any]],
+    csv_path: pathlib.Path,
+    scan: Tuple[int, bool, List[str]] | None = None,
+) -> int:
+    """Write records to CSV one row at a time; returns the number of rows.
+
+    `scan` is the result of `_scan` over the same records. Streaming callers
+    pass it from a separate pass; for in-memory lists it is computed here.
+    """
+    if scan is None:
+        if not isinstance(records, list):
+            records = list(records)
+        scan = _scan(records)
+    count, has_per_year, union = scan
+
+    if not count:
         csv_path.write_text("", encoding="utf-8")
-        return
+        return 0
 
-    preferred = _preferred_order_for(csv_path.stem)
+    preferred = _preferred_order_for(csv_path.stem, union)
+    project: Callable[[Dict[str, Any]], Dict[str, Any]] | None = None
 
     # Schema-aware projection for parties.json: enforce columns and order
     if csv_path.stem.lower().startswith("parties"):
         # Detect per-year alliances
-        has_per_year = any(isinstance(r.get("alliances"), dict) for r in records)
         if has_per_year:
-            def val(r, yr):
-                alliances = r.get("alliances") or {}
-                return (alliances.get(str(yr))
-                        or alliances.get(yr)
-                        or r.get(f"alliance_{yr}")
-                        or r.get("alliance")
-                        or "")
-            projected = [
-                {
+            def project(r):
+                return {
                     "code": r.get("code", ""),
                     "name": r.get("name", ""),
                     "color": r.get("color", ""),
-                    "alliance_2010": val(r, 2010),
-                    "alliance_2015": val(r, 2015),
-                    "alliance_2020": val(r, 2020),
-                    "alliance_2025": val(r, 2025),
+                    "alliance_2010": _parties_val(r, 2010),
+                    "alliance_2015": _parties_val(r, 2015),
+                    "alliance_2020": _parties_val(r, 2020),
+                    "alliance_2025": _parties_val(r, 2025),
                 }
-                for r in records
-            ]
             fieldnames = [
                 "code","name","color",
                 "alliance_2010","alliance_2015","alliance_2020","alliance_2025",
             ]
-            records_to_write = projected
         else:
-            projected = [
-                {
+            def project(r):
+                return {
                     "code": r.get("code", ""),
                     "name": r.get("name", ""),
                     "color": r.get("color", ""),
                     "alliance": r.get("alliance") or r.get("alliance_2020") or "",
                 }
-                for r in records
-            ]
             fieldnames = ["code","name","color","alliance"]
-            records_to_write = projected
     else:
-        fieldnames = preferred or list(records[0].keys())
-        records_to_write = records
-
-    # If preferred includes keys that may be missing, include them; and add any extra keys at end
-    if not preferred:
-        # Extend with any unseen keys across all rows to avoid data loss
-        union = _collect_fieldnames(records_to_write)
-        for k in union:
-            if k not in fieldnames:
-                fieldnames.append(k)
+        # Preferred order if recognized; otherwise every key seen across all rows
+        # (first record's keys first) to avoid data loss
+        fieldnames = list(preferred) if preferred else list(union)
 
+    written = 0
     with csv_path.open("w", encoding="utf-8", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        for row in records_to_write:
+        for row in records:
+            if project:
+                row = project(row)
             writer.writerow({k: row.get(k, "") for k in fieldnames})
+            written += 1
+    return written
 
 
 def convert_file(json_path: pathlib.Path) -> None:
-    records = json_to_records(json_path)
+    # Scan pass first so the write pass can stream straight from disk
+    with stage_profile.stage("scan") as st:
+        scan = _scan(iter_json_records(json_path))
+        st.records = scan[0]
     csv_path = json_path.with_suffix(".csv")
     try:
-        write_csv(records, csv_path)
-        print(f"Converted {json_path.name} -> {csv_path.name} ({len(records)} records)")
+        # With --profile, "parse" is the JSON decode alone and "write" the whole streaming pass
+        with stage_profile.stage("write"):
+            count = write_csv(stage_profile.timed_iter("parse", iter_json_records(json_path)), csv_path, scan)
+        print(f"Converted {json_path.name} -> {csv_path.name} ({count} records)")
     except PermissionError:
         # Fallback: write to a side file if the target is locked (common on Windows if open in another app)
         alt_path = csv_path.with_name(csv_path.stem + ".new.csv")
-        write_csv(records, alt_path)
+        write_csv(iter_json_records(json_path), alt_path, scan)
         print(
             f"Warning: Could not write {csv_path.name} (in use). Wrote to {alt_path.name} instead."
         )
 
 
 def main(args: List[str]) -> None:
+    args, profile, cprofile = stage_profile.pop_arguments(args)
     if not args:
-        print("Usage: python json_to_csv.py <file1.json> [file2.json ...]")
+        print("Usage: python json_to_csv.py [--profile[=TRACE]] [--cprofile=FILE] <file1.json|file1.ndjson> [file2 ...]")
         sys.exit(1)
 
+    stage_profile.start("json_to_csv", profile, cprofile)
     for arg in args:
         path = pathlib.Path(arg)
         if not path.exists():
             print(f"Skipping {arg}: file not found")
             continue
         convert_file(path)
+    stage_profile.finish()
 
 
 if __name__ == "__main__":
-    main(sys.argv[1:])
+    main(sys.argv[1:])
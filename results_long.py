@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""Long-format results table keyed by (seat, year, rank), with the wide view derived from it.
+
+Usage: python results_long.py bihar_election_results_consolidated.json
+       python results_long.py --wide results_long.json
+The first form writes results_long.json next to the input plus per-year
+slices in results/; --wide writes the wide consolidated rows
+(bihar_election_results_consolidated.json) back out of a long table.
+
+Layout of results_long.json:
+  {
+    "format": "long-v1",
+    "years": [2010, 2015, 2020, 2025],
+    "diff_year": 2020,                                   # diff_*_vs_<year> columns
+    "seat_fields": ["no", "constituency_name", ..., "current_remarks"],
+    "seats": [[1, "Valmiki Nagar", ...], ...],           # one row per seat, by no
+    "fields": ["no", "year", "rank", "name", "party", "votes", "margin", "status"],
+    "rows": [[1, 2010, 1, "Rajesh Singh", "JD(U)", "42289", "14671", ""], ...],
+    "index": {"year": {"2010": [0, 486], ...}}           # row range per year
+  }
+
+Schema notes:
+- Rows are sorted by (year, no, rank); rank 1 is the winner, rank 2 the
+  runner-up. `margin` and `status` (live counting) are carried on rank 1.
+  Seat-years without any result have no rows.
+- Votes and margins keep their published strings ("74,906" vs "42289").
+- Wide y<year>_* columns are generated from `years`, so adding an election
+  adds rows, not columns; diff_* flags are recomputed from the current MLA
+  and the diff_year winner (names by candidate id when candidate_ids.json
+  sits next to the long table, so spelling variants are not a new MLA).
+  Wide keys that fit neither table are kept as extra seat fields and come
+  back at the end of each wide row.
+
+results/ holds the same data split for consumers that render one year:
+seats.json (the seat table), <year>.json (that year's rows, without the
+year column) and index.json listing them. Unchanged files are not
+rewritten, so publishing a new year leaves older slices untouched.
+"""
+
+import bisect
+import pathlib
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Tuple
+
+import json_io
+
+FORMAT = "long-v1"
+
+BASE_FIELDS = ["no", "constituency_name", "slug", "district", "reserved", "lok_sabha_no", "lok_sabha"]
+CURRENT_FIELDS = ["current_mla_name", "current_mla_party", "current_mla_alliance", "current_remarks"]
+SEAT_FIELDS = BASE_FIELDS + CURRENT_FIELDS
+FIELDS = ["no", "year", "rank", "name", "party", "votes", "margin", "status"]
+
+# Wide column prefix per rank
+RANKS = {1: "winner", 2: "runner"}
+CANDIDATE_FIELDS = ["name", "party", "votes"]
+
+_YEAR_KEY = re.compile(r"^y(\d{4})_(.+)$")
+_DIFF_KEY = re.compile(r"^diff_(?:party|name)_vs_(\d{4})$")
+_YEAR_SUFFIXES = {f"{prefix}_{f}" for prefix in RANKS.values() for f in CANDIDATE_FIELDS} | {"margin", "status"}
+
+
+def year_fields(year: int, status: bool = False) -> List[str]:
+    """Wide columns for one election year, in canonical order."""
+    y = f"y{year}"
+    out = [f"{y}_{RANKS[rank]}_{f}" for rank in RANKS for f in CANDIDATE_FIELDS]
+    out.append(f"{y}_margin")
+    if status:
+        out.append(f"{y}_status")
+    return out
+
+
+def wide_fields(years: Iterable[int], diff_year: int | None = None, status_years: Iterable[int] = ()) -> List[str]:
+    """Canonical wide column order: seat, each year, current MLA, diffs."""
+    status_years = set(status_years)
+    out = list(BASE_FIELDS)
+    for year in sorted(years):
+        out.extend(year_fields(year, year in status_years))
+    out.extend(CURRENT_FIELDS)
+    if diff_year is not None:
+        out += [f"diff_party_vs_{diff_year}", f"diff_name_vs_{diff_year}"]
+    return out
+
+
+def _split_keys(keys: Iterable[str]) -> Tuple[List[int], int | None, List[int], List[str]]:
+    """(years, diff_year, status_years, extra keys) implied by a set of wide keys."""
+    years: Dict[int, None] = {}
+    status: Dict[int, None] = {}
+    diff_year = None
+    extras = []
+    for k in keys:
+        m = _YEAR_KEY.match(k)
+        if m and m.group(2) in _YEAR_SUFFIXES:
+            years[int(m.group(1))] = None
+            if m.group(2) == "status":
+                status[int(m.group(1))] = None
+            continue
+        m = _DIFF_KEY.match(k)
+        if m:
+            diff_year = int(m.group(1))
+            continue
+        if k not in SEAT_FIELDS:
+            extras.append(k)
+    return sorted(years), diff_year, sorted(status), extras
+
+
+def wide_order(keys: Iterable[str]) -> List[str]:
+    """Canonical order for wide consolidated rows carrying `keys`.
+
+    Years come from the y<year>_* keys present rather than a fixed list;
+    unrecognised keys keep their relative order at the end.
+    """
+    years, diff_year, status_years, extras = _split_keys(keys)
+    return wide_fields(years, diff_year, status_years) + extras
+
+
+def person_key(no: int, year: int | None = None, rank: int = 1) -> str:
+    """Key of a row ("57/2020/1") or, with no year, of a seat's current MLA ("57/mla") in candidate_ids.json."""
+    return f"{no}/mla" if year is None else f"{no}/{year}/{rank}"
+
+
+def person_ids(doc: Dict[str, Any]) -> Dict[str, str]:
+    """Row key -> candidate id from a candidate_ids.json document (scripts/build_candidate_ids.py)."""
+    return {key: cid for cid, entity in doc.get("entities", {}).items() for key in entity["mentions"]}
+
+
+def _s(val: Any) -> str:
+    return "" if val is None else str(val)
+
+
+def _int(val: Any) -> int | None:
+    try:
+        return int(str(val).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class LongTable:
+    """Seat table plus (seat, year, rank) rows, indexed by year and by seat."""
+
+    __slots__ = ("years", "diff_year", "seat_fields", "seats", "rows", "_year_ranges", "_seat_index")
+
+    def __init__(self, years: Iterable[int], diff_year: int | None, seat_fields: List[str],
+                 seats: List[List[Any]], rows: List[List[Any]]):
+        self.years = sorted(years)
+        self.diff_year = diff_year
+        self.seat_fields = list(seat_fields)
+        self.seats = sorted(seats, key=lambda s: s[0])
+        self.rows = sorted(rows, key=lambda r: (r[1], r[0], r[2]))
+        self._year_ranges: Dict[int, Tuple[int, int]] = {}
+        for i, row in enumerate(self.rows):
+            start, _stop = self._year_ranges.get(row[1], (i, i))
+            self._year_ranges[row[1]] = (start, i + 1)
+        self._seat_index = {s[0]: i for i, s in enumerate(self.seats)}
+
+    # --- lookups ------------------------------------------------------
+
+    def year_rows(self, year: int) -> List[List[Any]]:
+        """Rows for one year (a contiguous slice, sorted by seat and rank)."""
+        start, stop = self._year_ranges.get(year, (0, 0))
+        return self.rows[start:stop]
+
+    def seat_rows(self, no: int, year: int | None = None) -> List[List[Any]]:
+        """Rows for one seat, optionally limited to a year."""
+        out = []
+        for y in ([year] if year is not None else self.years):
+            rows = self.year_rows(y)
+            i = bisect.bisect_left(rows, no, key=lambda r: r[0])
+            while i < len(rows) and rows[i][0] == no:
+                out.append(rows[i])
+                i += 1
+        return out
+
+    def seat(self, no: int) -> Dict[str, Any] | None:
+        idx = self._seat_index.get(no)
+        return None if idx is None else dict(zip(self.seat_fields, self.seats[idx]))
+
+    # --- wide <-> long --------------------------------------------------
+
+    @classmethod
+    def from_wide(cls, records: Iterable[Dict[str, Any]]) -> "LongTable":
+        records = list(records)
+        keys: Dict[str, None] = {}
+        for r in records:
+            keys.update(dict.fromkeys(r))
+        years, diff_year, _status, extras = _split_keys(keys)
+        seat_fields = SEAT_FIELDS + extras
+        seats = []
+        rows = []
+        for r in records:
+            no = _int(r.get("no"))
+            if no is None:
+                continue
+            seats.append([no] + [_s(r.get(k)) for k in seat_fields[1:]])
+            for year in years:
+                y = f"y{year}"
+                for rank, prefix in RANKS.items():
+                    cand = [_s(r.get(f"{y}_{prefix}_{f}")) for f in CANDIDATE_FIELDS]
+                    extra = [_s(r.get(f"{y}_margin")), _s(r.get(f"{y}_status"))] if rank == 1 else ["", ""]
+                    if any(cand) or any(extra):
+                        rows.append([no, year, rank] + cand + extra)
+        return cls(years, diff_year, seat_fields, seats, rows)
+
+    def to_wide(self, years: Iterable[int] | None = None,
+                person_ids: Dict[str, str] | None = None) -> List[Dict[str, str]]:
+        """Wide consolidated rows (string values), optionally for a subset of years.
+
+        diff_name_vs_<year> compares spellings unless `person_ids` (see
+        person_ids()) resolves both the current MLA and the winner, in which
+        case it compares their candidate ids.
+        """
+        years = self.years if years is None else sorted(years)
+        diff_year = self.diff_year if self.diff_year in years else None
+        status_years = {r[1] for y in years for r in self.year_rows(y) if r[7]}
+        extras = self.seat_fields[len(SEAT_FIELDS):]
+        fields = wide_fields(years, diff_year, status_years)
+        by_seat: Dict[int, Dict[str, str]] = {}
+        for seat in self.seats:
+            rec = dict.fromkeys(fields, "")
+            rec.update(zip(self.seat_fields, map(_s, seat)))
+            by_seat[seat[0]] = rec
+        for year in years:
+            y = f"y{year}"
+            for no, _year, rank, *vals in self.year_rows(year):
+                rec = by_seat.get(no)
+                if rec is None:
+                    continue
+                prefix = RANKS[rank]
+                for f, v in zip(CANDIDATE_FIELDS, vals):
+                    rec[f"{y}_{prefix}_{f}"] = v
+                if rank == 1:
+                    rec[f"{y}_margin"] = vals[3]
+                    if year in status_years:
+                        rec[f"{y}_status"] = vals[4]
+        out = []
+        for rec in by_seat.values():
+            if diff_year is not None:
+                d = f"y{diff_year}_winner_"
+                for what, cur in (("party", "current_mla_party"), ("name", "current_mla_name")):
+                    won = rec[d + what]
+                    rec[f"diff_{what}_vs_{diff_year}"] = str(bool(rec[cur] and won and rec[cur] != won))
+                no = _int(rec["no"])
+                cur_id = person_ids and person_ids.get(person_key(no))
+                won_id = cur_id and person_ids.get(person_key(no, diff_year))
+                if won_id:
+                    rec[f"diff_name_vs_{diff_year}"] = str(cur_id != won_id)
+            # Extra seat fields go last, as in the files they came from
+            for k in extras:
+                rec[k] = rec.pop(k)
+            out.append(rec)
+        return out
+
+    # --- serialization ------------------------------------------------
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "format": FORMAT,
+            "years": self.years,
+            "diff_year": self.diff_year,
+            "seat_fields": self.seat_fields,
+            "seats": self.seats,
+            "fields": FIELDS,
+            "rows": self.rows,
+            "index": {"year": {str(y): list(r) for y, r in sorted(self._year_ranges.items())}},
+        }
+
+    @classmethod
+    def from_json(cls, obj: Dict[str, Any]) -> "LongTable":
+        if obj.get("format") != FORMAT:
+            raise ValueError(f"Unsupported long table format: {obj.get('format')!r}")
+        if obj.get("fields", FIELDS) != FIELDS:
+            raise ValueError(f"Unexpected row fields: {obj.get('fields')!r}")
+        return cls(obj.get("years") or [], obj.get("diff_year"), obj["seat_fields"], obj["seats"], obj["rows"])
+
+    def year_slice(self, year: int) -> Dict[str, Any]:
+        return {"format": f"{FORMAT}-year", "year": year, "fields": [f for f in FIELDS if f != "year"],
+                "rows": [[r[0]] + r[2:] for r in self.year_rows(year)]}
+
+
+def dumps_table(obj: Dict[str, Any]) -> str:
+    """JSON with one seat/row per line, so a changed seat-year is a one-line diff."""
+    parts = []
+    for k, v in obj.items():
+        if k in ("seats", "rows"):
+            body = ",\n".join(map(json_io.dumps, v))
+            text = f"[\n{body}\n]" if v else "[]"
+        else:
+            text = json_io.dumps(v)
+        parts.append(f"{json_io.dumps(k)}:{text}")
+    return "{" + ",\n".join(parts) + "}\n"
+
+
+def write_if_changed(path: pathlib.Path, text: str) -> bool:
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def write_slices(table: LongTable, out_dir: pathlib.Path) -> int:
+    """Write results/seats.json, one <year>.json per year and index.json; returns files rewritten."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = write_if_changed(out_dir / "seats.json", json_io.dumps(
+        {"format": f"{FORMAT}-seats", "fields": table.seat_fields, "seats": table.seats}))
+    index = {"format": f"{FORMAT}-index", "seats": "seats.json", "diff_year": table.diff_year, "years": {}}
+    for year in table.years:
+        name = f"{year}.json"
+        index["years"][str(year)] = {"path": name, "rows": len(table.year_rows(year))}
+        written += write_if_changed(out_dir / name, json_io.dumps(table.year_slice(year)))
+    written += write_if_changed(out_dir / "index.json", json_io.dumps(index))
+    return written
+
+
+def load_table(path: pathlib.Path) -> LongTable:
+    return LongTable.from_json(json_io.load(path))
+
+
+def convert_file(path: pathlib.Path) -> None:
+    records = json_io.load(path)
+    if not isinstance(records, list):
+        raise ValueError(f"Expected list at top level in {path.name}")
+    table = LongTable.from_wide(records)
+    out_path = path.with_name("results_long.json")
+    write_if_changed(out_path, dumps_table(table.to_json()))
+    n = write_slices(table, path.with_name("results"))
+    print(f"Converted {path.name} -> {out_path.name} ({len(table.seats)} seats, {len(table.rows)} rows; "
+          f"{n} files updated in results/)")
+
+
+def wide_file(path: pathlib.Path) -> None:
+    table = load_table(path)
+    out_path = path.with_name("bihar_election_results_consolidated.json")
+    ids_path = path.with_name("candidate_ids.json")
+    rows = table.to_wide(person_ids=person_ids(json_io.load(ids_path)) if ids_path.exists() else None)
+    write_if_changed(out_path, json_io.dumps(rows, pretty=True))
+    print(f"Derived {out_path.name} from {path.name} ({len(rows)} rows, years {table.years})")
+
+
+def main(args: List[str]) -> None:
+    wide = False
+    if args and args[0] == "--wide":
+        wide = True
+        args = args[1:]
+    if not args:
+        print("Usage: python results_long.py [--wide] <file.json> [file2 ...]")
+        sys.exit(1)
+
+    for arg in args:
+        path = pathlib.Path(arg)
+        if not path.exists():
+            print(f"Skipping {arg}: file not found")
+            continue
+        if wide:
+            wide_file(path)
+        else:
+            convert_file(path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,223 @@
+"""Seat-level comparisons between elections and the current MLAs.
+
+Every side of a comparison is a dict { seat_no -> Outcome } built from the
+shared SeatStore, so two sides join by seat number with a hash lookup rather
+than a nested scan over constituency names. Counts are Counter based.
+Party codes go through the shared alias table (normalize_parties) on both
+sides, so spellings such as "Ind"/"IND" do not count as seat changes.
+
+Usage:
+    python scripts/analytics.py 2015 current
+    python scripts/analytics.py 2010 2020 --json
+    python scripts/analytics.py --all-pairs
+    python scripts/analytics.py --all-pairs --src synthetic/state-01 --profile
+
+--profile records per-stage timings (stage_profile.py).
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from itertools import combinations
+from pathlib import Path
+from typing import NamedTuple
+
+from normalize_parties import normalize_party
+from seat_store import SRC, YEARS, SeatStore
+import stage_profile
+
+
+CURRENT = "current"
+
+
+class Outcome(NamedTuple):
+    no: int
+    constituency: str
+    winner: str
+    party: str
+    alliance: str
+    votes: int | None = None
+    margin: int | None = None
+
+
+def alliance_for(store: SeatStore, party: str, year) -> str:
+    """Alliance of `party` in `year` from parties.json (per-year map, then flat fallbacks)."""
+    return meta_alliance(store.party(party) or {}, year)
+
+
+def meta_alliance(meta: dict, year) -> str:
+    """Alliance in `year` from one parties.json entry."""
+    alliances = meta.get("alliances") or {}
+    return (
+        alliances.get(str(year))
+        or meta.get(f"alliance_{year}")
+        or meta.get("alliance_2020")
+        or meta.get("alliance")
+        or ""
+    )
+
+
+def election_side(store: SeatStore, year: int) -> dict:
+    side = {}
+    for r in store.iter_results(year):
+        party = normalize_party(r.winner.party)
+        side[r.no] = Outcome(
+            r.no, r.name, r.winner.name, party, alliance_for(store, party, year),
+            r.winner.votes_int, r.margin_int,
+        )
+    return side
+
+
+def current_side(store: SeatStore) -> dict:
+    return {
+        m.no: Outcome(m.no, m.constituency, m.name, normalize_party(m.party), m.alliance)
+        for m in store.iter_mlas()
+    }
+
+
+def side(store: SeatStore, key) -> dict:
+    """Outcomes for an election year (int or "2015") or "current"."""
+    if str(key).lower() == CURRENT:
+        return current_side(store)
+    return election_side(store, int(key))
+
+
+def hash_join(left: dict, right: dict):
+    """Inner join on seat number: [(no, left_outcome, right_outcome)] in seat order."""
+    small, large = (left, right) if len(left) <= len(right) else (right, left)
+    nos = sorted(no for no in small if no in large)
+    return [(no, left[no], right[no]) for no in nos]
+
+
+def unmatched(left: dict, right: dict):
+    """Seat numbers present on only one side: (left_only, right_only)."""
+    return sorted(left.keys() - right.keys()), sorted(right.keys() - left.keys())
+
+
+def seat_counts(outcomes: dict, by: str = "party") -> Counter:
+    return Counter(getattr(o, by) for o in outcomes.values())
+
+
+def party_changes(joined):
+    return [(no, a, b) for no, a, b in joined if a.party != b.party]
+
+
+def alliance_changes(joined):
+    return [(no, a, b) for no, a, b in joined if a.alliance != b.alliance]
+
+
+def winner_changes(joined):
+    return [(no, a, b) for no, a, b in joined if a.winner != b.winner]
+
+
+def movements(changes) -> dict:
+    """Group changes as { "A -> B": [(no, a, b), ...] }, largest groups first."""
+    groups = {}
+    for no, a, b in changes:
+        groups.setdefault(f"{a.party} -> {b.party}", []).append((no, a, b))
+    return dict(sorted(groups.items(), key=lambda kv: len(kv[1]), reverse=True))
+
+
+def gains_losses(before: Counter, after: Counter):
+    """([(party, +n)], [(party, n_lost)]) each sorted by size, largest first."""
+    delta = Counter(after)
+    delta.subtract(before)
+    gains = sorted(((p, n) for p, n in delta.items() if n > 0), key=lambda t: t[1], reverse=True)
+    losses = sorted(((p, -n) for p, n in delta.items() if n < 0), key=lambda t: t[1], reverse=True)
+    return gains, losses
+
+
+def compare(store: SeatStore, left_key, right_key, left=None, right=None) -> dict:
+    """Summary of two sides joined by seat number."""
+    left = side(store, left_key) if left is None else left
+    right = side(store, right_key) if right is None else right
+    joined = hash_join(left, right)
+    before, after = seat_counts(left), seat_counts(right)
+    gains, losses = gains_losses(before, after)
+    left_only, right_only = unmatched(left, right)
+    return {
+        "left": str(left_key),
+        "right": str(right_key),
+        "seats_joined": len(joined),
+        "left_only": left_only,
+        "right_only": right_only,
+        "party_counts": {str(left_key): dict(before.most_common()), str(right_key): dict(after.most_common())},
+        "alliance_counts": {
+            str(left_key): dict(seat_counts(left, "alliance").most_common()),
+            str(right_key): dict(seat_counts(right, "alliance").most_common()),
+        },
+        "party_changes": len(party_changes(joined)),
+        "alliance_changes": len(alliance_changes(joined)),
+        "winner_changes": len(winner_changes(joined)),
+        "movements": {k: len(v) for k, v in movements(party_changes(joined)).items()},
+        "gains": dict(gains),
+        "losses": dict(losses),
+    }
+
+
+def all_pairs(store: SeatStore, keys=None) -> list:
+    keys = list(keys) if keys else [*store.years, CURRENT]
+    # Build each side once and reuse it across pairs
+    sides = {k: side(store, k) for k in keys}
+    return [compare(store, a, b, sides[a], sides[b]) for a, b in combinations(keys, 2)]
+
+
+def _print_summary(s: dict) -> None:
+    l, r = s["left"], s["right"]
+    print(f"=== {l} vs {r} ({s['seats_joined']} seats joined) ===")
+    parties = sorted(
+        set(s["party_counts"][l]) | set(s["party_counts"][r]),
+        key=lambda p: (s["party_counts"][r].get(p, 0), s["party_counts"][l].get(p, 0)),
+        reverse=True,
+    )
+    print(f"{'Party':<15} {l:<10} {r:<10} {'Change':<10}")
+    print("-" * 45)
+    for p in parties:
+        a = s["party_counts"][l].get(p, 0)
+        b = s["party_counts"][r].get(p, 0)
+        print(f"{p:<15} {a:<10} {b:<10} {'+' if b > a else ''}{b - a:<10}")
+    print(f"\nSeats that changed party: {s['party_changes']}")
+    print(f"Seats that changed alliance: {s['alliance_changes']}")
+    print(f"Seats with a different winner: {s['winner_changes']}")
+    for movement, n in list(s["movements"].items())[:10]:
+        print(f"  {movement}: {n}")
+    if s["left_only"] or s["right_only"]:
+        print(f"Unmatched seats: {l} only {s['left_only']}, {r} only {s['right_only']}")
+    print()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="analytics.py", description="Compare elections and current MLAs by seat.")
+    parser.add_argument("sides", nargs="*", help=f"two of: election years ({', '.join(map(str, YEARS))}) or 'current'")
+    parser.add_argument("--all-pairs", action="store_true", help="compare every pair of years and current")
+    parser.add_argument("--normalized", action="store_true", help="read *_results.normalized.json")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser.add_argument("--src", default=str(SRC), help="directory holding the input files (default: archive/)")
+    stage_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not args.all_pairs and len(args.sides) != 2:
+        parser.print_usage()
+        return 2
+
+    stage_profile.start("analytics", args.profile, args.cprofile)
+    try:
+        with stage_profile.stage("load") as st:
+            store = SeatStore.load(Path(args.src), normalized=args.normalized)
+            st.records = len(store)
+        with stage_profile.stage("compare"):
+            summaries = all_pairs(store) if args.all_pairs else [compare(store, *args.sides)]
+    finally:
+        stage_profile.finish()
+
+    if args.json:
+        print(json.dumps(summaries if args.all_pairs else summaries[0], ensure_ascii=False, indent=2))
+    else:
+        for s in summaries:
+            _print_summary(s)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Time the data pipeline stage by stage at real and synthetic dataset sizes.
+
+Usage:
+    python scripts/benchmark.py                                  # real,5k,50k,500k
+    python scripts/benchmark.py --scales real,5k --repeat 5
+    python scripts/benchmark.py --save-baseline                  # record a baseline
+    python scripts/benchmark.py --scales real,5k --tolerance 0.3 # compare (exit 1 on regression)
+
+Scales are seat-years (seats x the three election years). "real" is the
+243-seat inputs in --src (default: archive/). Larger scales are generated
+into a temp directory by cloning those seats under new numbers and
+districts. For each scale it runs the real scripts in-process, writing
+into a temp directory, and reads back the stages their --profile traces
+record (stage_profile.py):
+
+- build_consolidated: every stage of a from-scratch build (load, build,
+  write_long, rollups, search_index, candidate_ids, wide_view, serialize,
+  color_tables, seat_shards, ...)
+- json_to_csv and csv_to_json on the consolidated file it wrote
+- constituency_info: --all to NDJSON (load, render, write)
+- analytics: --all-pairs (load, compare)
+
+Each stage reports best-of-N wall and CPU seconds, rows per second and
+peak traced allocation (tracemalloc, measured in a separate run so it does
+not skew the timings). Results go to --out as JSON. If a baseline exists,
+any stage whose CPU time or peak memory grew by more than --tolerance (and
+by more than a small absolute floor) is listed and the exit status is 1.
+Regressions are judged on CPU time because the wall time of the
+file-writing stages (seat_shards, results/ slices) swings with the
+filesystem from run to run.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import analytics
+import build_consolidated
+import constituency_info
+from constituency_info import load_csv_indexed_by_no
+from seat_store import SRC, load_json, parties_path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+import csv_to_json  # noqa: E402
+import json_io  # noqa: E402
+import json_to_csv  # noqa: E402
+import stage_profile  # noqa: E402
+
+
+YEARS = (2010, 2015, 2020)
+DEFAULT_SCALES = "real,5k,50k,500k"
+BENCH_DIR = ROOT / ".build_cache" / "bench"
+# Differences below these floors are treated as noise (scheduler jitter
+# alone moves millisecond-scale stages by well over 2 ms between runs)
+MIN_SECONDS = 0.02
+MIN_PEAK_KB = 256
+
+
+def parse_scale(token: str):
+    token = token.strip().lower()
+    if token == "real":
+        return None
+    mult = 1
+    if token.endswith("k"):
+        token, mult = token[:-1], 1_000
+    elif token.endswith("m"):
+        token, mult = token[:-1], 1_000_000
+    return int(float(token) * mult)
+
+
+def scale_label(seat_years) -> str:
+    return "real" if seat_years is None else f"{seat_years}"
+
+
+def synthesize(src: Path, dst: Path, seat_years: int) -> int:
+    """Clone the seats in `src` into `dst` until there are seat_years/3 seats."""
+    seats = ([] if not (src / "bihar_constituencies.json").exists()
+             else sorted(load_json(src / "bihar_constituencies.json").values(), key=lambda s: int(s["no"])))
+    if not seats:
+        raise SystemExit(f"No bihar_constituencies.json in {src}; pass --src")
+    # Raw and normalized year files alike: the build reads the normalized ones, constituency_info the raw
+    names = [f"{y}{suffix}" for y in YEARS for suffix in ("_results.json", "_results.normalized.json")]
+    results = {name: load_json(src / name) for name in names if (src / name).exists()}
+    mla = load_json(src / "current_mla.json") if (src / "current_mla.json").exists() else {}
+
+    def by_no(obj, key):
+        out = {}
+        for district, rows in obj.items():
+            for r in rows if isinstance(rows, list) else []:
+                try:
+                    out[int(str(r.get(key, "")).strip())] = (district, r)
+                except ValueError:
+                    continue
+        return out
+
+    result_idx = {name: by_no(obj, "#") for name, obj in results.items()}
+    mla_idx = by_no(mla, "No.")
+    electors = load_csv_indexed_by_no(src / "electors_2024.csv")
+
+    n_seats = max(1, -(-seat_years // len(YEARS)))
+    base = {}
+    out_results = {name: {} for name in results}
+    out_mla = {}
+    elect_rows = []
+    for i in range(n_seats):
+        tpl = seats[i % len(seats)]
+        copy_no = i // len(seats)
+        no = i + 1
+        tag = f" {copy_no}" if copy_no else ""
+        base[str(no)] = {**tpl, "no": no, "slug": f"{tpl.get('slug', '')}{'-' + str(copy_no) if copy_no else ''}",
+                         "district": f"{tpl.get('district', '')}{tag}"}
+        t_no = int(tpl["no"])
+        for name, idx in result_idx.items():
+            if t_no in idx:
+                district, r = idx[t_no]
+                out_results[name].setdefault(district + tag, []).append({**r, "#": no})
+        if t_no in mla_idx:
+            district, r = mla_idx[t_no]
+            out_mla.setdefault(district + tag, []).append({**r, "No.": no})
+        if t_no in electors:
+            elect_rows.append({**electors[t_no], "no": str(no)})
+
+    dst.mkdir(parents=True, exist_ok=True)
+
+    def dump(name, obj):
+        (dst / name).write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+
+    dump("bihar_constituencies.json", base)
+    for name, obj in out_results.items():
+        dump(name, obj)
+    dump("current_mla.json", out_mla)
+    if parties_path(src).exists():
+        (dst / "parties.json").write_bytes(parties_path(src).read_bytes())
+    if elect_rows:
+        with (dst / "electors_2024.csv").open("w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(elect_rows[0]))
+            w.writeheader()
+            w.writerows(elect_rows)
+    return n_seats
+
+
+def _run_script(main, argv) -> None:
+    # The scripts report progress on stdout/stderr; only their traces matter here
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        main(argv)
+
+
+def run_scripts(data_dir: Path, work: Path, trace: Path) -> dict:
+    """Run the pipeline scripts once on `data_dir`; {"<script>.<stage>": stage_profile stage dict}.
+
+    Each script runs through its own main() with --profile=`trace`, so the
+    stages are exactly the ones `--profile` reports (build_consolidated's
+    rollups, search_index, candidate_ids, color_tables and seat_shards
+    included); outputs go under `work`, never the repo.
+    """
+    out = work / "out"
+    consolidated = out / "bihar_election_results_consolidated.json"
+    profile = f"--profile={trace}"
+    trace.unlink(missing_ok=True)
+    _run_script(build_consolidated.main, ["--src", str(data_dir), "--out-dir", str(out), profile])
+    _run_script(json_to_csv.main, [str(consolidated), profile])
+    _run_script(csv_to_json.main, [str(consolidated.with_suffix(".csv")), profile])
+    _run_script(constituency_info.main, ["constituency_info.py", "--all", "--src", str(data_dir), "-j", "1",
+                                         "--ndjson", str(work / "seats.ndjson"), profile])
+    _run_script(analytics.main, ["--all-pairs", "--src", str(data_dir), profile])
+    stages = {}
+    for line in trace.read_text(encoding="utf-8").splitlines():
+        run = json.loads(line)
+        for st in run["stages"]:
+            stages[f"{run['script']}.{st['name']}"] = st
+    return stages
+
+
+def run_pipeline(data_dir: Path, repeat: int, budget: float = 5.0):
+    """{stage: {"seconds", "cpu_seconds", "peak_kb"}} with best-of-`repeat` timings."""
+    timings, cpu = {}, {}
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        work = Path(tmp)
+        # Timing runs without allocation tracing, which slows Python down
+        stage_profile.ALLOCATIONS = False
+        try:
+            for attempt in range(repeat):
+                run_dir = work / f"run{attempt}"
+                for name, st in run_scripts(data_dir, run_dir, work / "trace.ndjson").items():
+                    timings[name] = min(st["wall_s"], timings.get(name, st["wall_s"]))
+                    cpu[name] = min(st["cpu_s"], cpu.get(name, st["cpu_s"]))
+                # Big scales: one timing run is enough
+                if sum(timings.values()) * (attempt + 1) > budget:
+                    break
+        finally:
+            stage_profile.ALLOCATIONS = True
+
+        # One traced run for peak allocations
+        peaks = {}
+        for name, st in run_scripts(data_dir, work / "traced", work / "trace.ndjson").items():
+            peaks[name] = st.get("alloc_peak_kb")
+    return {name: {"seconds": round(timings[name], 6), "cpu_seconds": round(cpu[name], 6), "peak_kb": peaks.get(name)}
+            for name in timings}
+
+
+def benchmark(src: Path, scales, repeat: int) -> dict:
+    results = {}
+    for seat_years in scales:
+        label = scale_label(seat_years)
+        if seat_years is None:
+            if not (src / "bihar_constituencies.json").exists():
+                raise SystemExit(f"No bihar_constituencies.json in {src}; pass --src")
+            n_seats = len(load_json(src / "bihar_constituencies.json"))
+            stages = run_pipeline(src, repeat)
+        else:
+            with tempfile.TemporaryDirectory(prefix="bench-data-") as tmp:
+                n_seats = synthesize(src, Path(tmp), seat_years)
+                stages = run_pipeline(Path(tmp), repeat)
+        rows = n_seats * len(YEARS)
+        for m in stages.values():
+            m["rows_per_sec"] = round(rows / m["seconds"]) if m["seconds"] else None
+        results[label] = {"seats": n_seats, "seat_years": rows, "stages": stages}
+        print(f"== {label}: {n_seats} seats ({rows} seat-years)", file=sys.stderr)
+        for name, m in stages.items():
+            # Streaming stages (stage_profile.timed_iter) have no allocation figure of their own
+            peak = "-" if m["peak_kb"] is None else f"{m['peak_kb']:,}"
+            print(f"  {name:<30} {m['seconds'] * 1000:10.1f} ms {m['cpu_seconds'] * 1000:10.1f} ms cpu"
+                  f" {m['rows_per_sec'] or 0:>12,}/s {peak:>10} KB",
+                  file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": json_io.BACKEND,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(current: dict, baseline: dict, tolerance: float) -> list:
+    """[(scale, stage, metric, old, new)] for each regression beyond tolerance."""
+    regressions = []
+    for label, cur in current["results"].items():
+        old = baseline.get("results", {}).get(label)
+        if not old:
+            continue
+        for stage, m in cur["stages"].items():
+            o = old["stages"].get(stage)
+            if not o:
+                continue
+            for metric, floor in (("cpu_seconds", MIN_SECONDS), ("peak_kb", MIN_PEAK_KB)):
+                a, b = o.get(metric), m.get(metric)
+                if a is None or b is None:
+                    continue
+                if b > a * (1 + tolerance) and b - a > floor:
+                    regressions.append((label, stage, metric, a, b))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Benchmark the data pipeline at scaled sizes.")
+    parser.add_argument("--src", default=str(SRC), help="directory with the real input files (default: archive/)")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help=f"comma list of seat-years or 'real' (default: {DEFAULT_SCALES})")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per scale; best is kept (default: 3)")
+    parser.add_argument("--out", default=str(BENCH_DIR / "latest.json"), help="where to write results")
+    parser.add_argument("--baseline", default=str(BENCH_DIR / "baseline.json"), help="baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    scales = [parse_scale(t) for t in args.scales.split(",") if t.strip()]
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = benchmark(Path(args.src), scales, max(1, args.repeat))
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {out}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print("No baseline to compare against (use --save-baseline)")
+        return 0
+
+    regressions = compare_to_baseline(report, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance)
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} against {baseline_path}")
+        return 0
+    print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+    for label, stage, metric, a, b in regressions:
+        print(f"  [{label}] {stage} {metric}: {a} -> {b} ({(b / a - 1) if a else float('inf'):+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""Stable candidate ids across years and seats (entity resolution over names).
+
+Usage:
+    python scripts/build_candidate_ids.py [--long results_long.json] [--out candidate_ids.json]
+    python scripts/build_candidate_ids.py --src synthetic/ [--out FILE]   # full candidate lists, every state
+    python scripts/build_candidate_ids.py --lookup "rashmi verma"         # entities matching a name
+
+scripts/build_consolidated.py writes candidate_ids.json on every build and
+compares current MLAs with the diff-year winner by id, so "Rashmi Varma"
+and "Rashmi Verma" are one person. Output (compact JSON):
+
+    {
+      "format": "candidate-ids-v1",
+      "entities": {
+        "c1f3a09b2d4e7": {"name": "Rashmi Verma", "mentions": ["3/2020/1", "3/mla"], "aliases": ["Rashmi Varma"]},
+        ...
+      }
+    }
+
+A mention is one row of the long table, "<no>/<year>/<rank>", or a seat's
+current MLA, "<no>/mla" (results_long.person_key). With --src every
+contestant of a full candidate list is a mention (rank = position by
+votes, NOTA left out) and keys are prefixed "<state>:". "name" is the most
+used spelling (the latest on a tie) and "aliases" lists the others.
+
+Names are normalized (build_search_index.normalize, bracketed notes and
+titles such as "Dr" or "Shri" dropped, "Md"/"Mohd"/"Mohammed" read as
+"mohammad") and coded with Soundex. Two mentions are compared only when
+they share a block:
+
+    seat      same state and seat, and the same code for the first or the last word
+    district  same state and district, the same code for the whole name run
+              together and for the last word
+    party     same state and party, the same two codes
+
+Blocks with more than MAX_BLOCK mentions (a name too common to tell apart
+without a seat) are skipped. Inside a block two names match when they are
+equal after normalization; when both codes agree and the Jaro-Winkler
+similarity of the run-together names, whose lengths differ by at most two
+letters, is at least FUZZY ("Mishri Lal Yadav" / "Mishrilal Yadav",
+"Santhosh" / "Santosh"); or, in seat blocks only, when every word of the
+shorter name appears in order in the longer one ("Gayatri Devi" /
+"Gayatri Devi Yadav"). Matches are merged with
+union-find, equal names first and then best similarity first, but two
+mentions from the same election are never merged.
+
+Ids are "c" plus 12 hex digits of a hash of the entity's first mention and
+name. When the output file exists, an entity keeps the id most of its
+mentions had there, so ids survive rebuilds, new years and merges (a split
+keeps the id on the part with more of its mentions).
+"""
+
+import argparse
+import gc
+import hashlib
+import re
+import sys
+import time
+from pathlib import Path
+
+from seat_store import ROOT, SeatStore, load_json
+import json_io
+from build_search_index import normalize
+from candidate_store import IS_NOTA, CandidateStore
+from results_long import LongTable, person_ids, person_key
+
+LONG_PATH = ROOT / "results_long.json"
+OUT_PATH = ROOT / "candidate_ids.json"
+FORMAT = "candidate-ids-v1"
+
+FUZZY = 0.9  # Jaro-Winkler floor for spelling variants
+CONTAINED = 0.85  # score of a shorter name contained in a longer one (seat blocks)
+MAX_BLOCK = 64
+
+TITLES = {"dr", "shri", "sri", "smt", "prof", "adv"}
+CANONICAL = {"md": "mohammad", "mohd": "mohammad", "mohammed": "mohammad", "muhammad": "mohammad",
+             "mohamad": "mohammad", "kr": "kumar", "pd": "prasad"}
+KINDS = ("seat", "district", "party")
+_BRACKETS = re.compile(r"\([^)]*\)")
+_CODES = {c: d for letters, d in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6"))
+          for c in letters}
+
+
+def name_words(name: str) -> tuple:
+    words = []
+    for w in normalize(_BRACKETS.sub(" ", str(name or ""))).split():
+        w = CANONICAL.get(w, w)
+        if w not in TITLES:
+            words.append(w)
+    return tuple(words)
+
+
+def soundex(word: str) -> str:
+    """American Soundex of a normalized word ("verma" and "varma" -> "v650")."""
+    if not word:
+        return ""
+    out = [word[0]]
+    last = _CODES.get(word[0])
+    for c in word[1:]:
+        d = _CODES.get(c)
+        if d is None:
+            if c not in "hw":
+                last = None
+            continue
+        if d != last:
+            out.append(d)
+            if len(out) == 4:
+                break
+        last = d
+    return "".join(out).ljust(4, "0")
+
+
+def jaro_winkler(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    la, lb = len(a), len(b)
+    if not la or not lb:
+        return 0.0
+    window = max(0, max(la, lb) // 2 - 1)
+    taken = [False] * lb
+    matched = []
+    for i, c in enumerate(a):
+        for j in range(max(0, i - window), min(lb, i + window + 1)):
+            if not taken[j] and b[j] == c:
+                taken[j] = True
+                matched.append(c)
+                break
+    m = len(matched)
+    if not m:
+        return 0.0
+    transposed = sum(x != y for x, y in zip(matched, (b[j] for j in range(lb) if taken[j]))) / 2
+    jaro = (m / la + m / lb + (m - transposed) / m) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * 0.1 * (1 - jaro)
+
+
+def _same_word(a: str, b: str) -> bool:
+    return a == b or (soundex(a) == soundex(b) and jaro_winkler(a, b) >= FUZZY)
+
+
+def _contains(longer: tuple, shorter: tuple) -> bool:
+    rest = iter(longer)
+    return all(any(_same_word(w, v) for v in rest) for w in shorter)
+
+
+class Resolver:
+    """Candidate mentions, blocked and merged into entities with stable ids."""
+
+    def __init__(self):
+        self.keys = []  # mention key (results_long.person_key, "<state>:" prefixed)
+        self.display = []  # name as published
+        self.name_id = []
+        self.slot = []  # bit of the election (year, or None for the current MLAs); blocks never span states
+        self.seats = {}  # (state, no) -> mentions
+        self.blocks = {"district": {}, "party": {}}  # (state, district | party, code, last word code) -> mentions
+        self.words = []  # per name id
+        self.codes = []  # per name id: (run together, its code, first word code, last word code)
+        self._name_ids = {}
+        self._slots = {}
+        self._wordy = {}  # seats with a name of three words or more (the only ones with containment pairs)
+        self.stats = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _name(self, name: str) -> int | None:
+        nid = self._name_ids.get(name)
+        if nid is None and name not in self._name_ids:
+            words = name_words(name)
+            if words:
+                nid = len(self.words)
+                joined = "".join(words)
+                self.words.append(words)
+                self.codes.append((joined, soundex(joined), soundex(words[0]), soundex(words[-1])))
+            self._name_ids[name] = nid
+        return nid
+
+    def add(self, state: str, no: int, year: int | None, rank: int, name: str, party: str, district: str):
+        """One mention; year None is the seat's current MLA. Nameless mentions are ignored."""
+        nid = self._name(name)
+        if nid is None:
+            return
+        i = len(self.keys)
+        key = person_key(no, year, rank)
+        self.keys.append(f"{state}:{key}" if state else key)
+        self.display.append(name.strip())
+        self.name_id.append(nid)
+        slot = self._slots.get(year)
+        if slot is None:
+            slot = self._slots[year] = 1 << len(self._slots)
+        self.slot.append(slot)
+        _joined, code, _first, last = self.codes[nid]
+        self.seats.setdefault((state, no), []).append(i)
+        if len(self.words[nid]) >= 3:
+            self._wordy[(state, no)] = None
+        # A seat without a district is its own district
+        self.blocks["district"].setdefault((state, district or no, code, last), []).append(i)
+        if party:
+            self.blocks["party"].setdefault((state, party, code, last), []).append(i)
+
+    def add_table(self, table: LongTable, state: str = ""):
+        """Winners and runners-up of every year in a long table, plus the current MLAs."""
+        col = {f: k for k, f in enumerate(table.seat_fields)}
+        district = {s[0]: s[col["district"]] for s in table.seats}
+        for year in table.years:
+            for no, _y, rank, name, party, *_rest in table.year_rows(year):
+                self.add(state, no, year, rank, name, party, district.get(no, ""))
+        for s in table.seats:
+            self.add(state, s[0], None, 0, s[col["current_mla_name"]], s[col["current_mla_party"]], s[col["district"]])
+
+    def add_store(self, store: SeatStore, state: str = ""):
+        """Every candidate of a SeatStore's results (full lists where present), plus the current MLAs."""
+        cs = CandidateStore.from_seat_store(store)
+        offsets, flags, party, names = cs.offsets, cs.flags, cs.party, cs.names
+        for g in range(cs.groups):
+            seat = store.seats[cs.group_seat[g]]
+            year = cs.group_year[g]
+            pos = 0
+            for i in range(offsets[g], offsets[g + 1]):
+                if flags[i] & IS_NOTA:
+                    continue
+                pos += 1
+                self.add(state, seat.no, year, pos, names[i], cs.parties[party[i]], seat.district)
+        for seat, mla in zip(store.seats, store.mlas):
+            if mla is not None:
+                self.add(state, seat.no, None, 0, mla.name, mla.party, seat.district)
+
+    # --- matching -----------------------------------------------------
+
+    def _score(self, a: int, b: int, seat: bool) -> float:
+        """Similarity of two distinct name ids that share a block, or 0.0."""
+        ja, ca, _fa, la = self.codes[a]
+        jb, cb, _fb, lb = self.codes[b]
+        if ja == jb:
+            return 1.0  # same words, split differently ("Ram Prit" / "Ramprit")
+        if ca == cb and la == lb and abs(len(ja) - len(jb)) <= 2:
+            s = jaro_winkler(ja, jb)
+            if s >= FUZZY:
+                return s
+        if seat:
+            wa, wb = self.words[a], self.words[b]
+            if len(wa) != len(wb) and min(len(wa), len(wb)) >= 2:
+                longer, shorter = (wa, wb) if len(wa) > len(wb) else (wb, wa)
+                if _contains(longer, shorter):
+                    return CONTAINED
+        return 0.0
+
+    def _seat_blocks(self):
+        """(mentions by name id, name id pairs) for each seat block worth comparing."""
+        words, codes, name_id = self.words, self.codes, self.name_id
+        for key in self._wordy:
+            by_name = {}
+            for i in self.seats[key]:
+                by_name.setdefault(name_id[i], []).append(i)
+            blocks = {}
+            for nid in by_name:
+                if len(words[nid]) >= 2:
+                    _j, _c, first, last = codes[nid]
+                    blocks.setdefault(first, []).append(nid)
+                    if last != first:
+                        blocks.setdefault(last, []).append(nid)
+            pairs = {}
+            for nids in blocks.values():
+                for x, na in enumerate(nids):
+                    for nb in nids[x + 1:]:
+                        if len(words[na]) != len(words[nb]):
+                            pairs[(na, nb) if na < nb else (nb, na)] = None
+            yield by_name, pairs
+
+    def clusters(self) -> list:
+        """Mention indices per entity, each sorted, in order of first mention."""
+        n = len(self.keys)
+        parent = list(range(n))
+        mask = list(self.slot)
+        name_id = self.name_id
+        refused = 0
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+
+        scores = {}
+        fuzzy = []
+        compared = skipped = 0
+
+        def link(na, nb, by_name, rank, seat):
+            nonlocal compared
+            pair = (na, nb, seat)
+            s = scores.get(pair)
+            if s is None:
+                s = scores[pair] = self._score(na, nb, seat)
+                compared += 1
+            if s:
+                fuzzy.extend((-s, rank, a, b) for a in by_name[na] for b in by_name[nb])
+
+        # Equal names merge straight away, seat by seat and then across the
+        # district and party, each mention joining the first cluster it does
+        # not clash with (two "Sunil Kumar"s in one year stay apart); other
+        # matches are ranked and merged afterwards.
+        for kind, blocks in (("seat", self.seats), ("district", self.blocks["district"]),
+                             ("party", self.blocks["party"])):
+            rank = KINDS.index(kind)
+            for members in blocks.values():
+                if len(members) == 1:
+                    continue
+                if len(members) > MAX_BLOCK and kind != "seat":
+                    skipped += 1
+                    continue
+                by_name = {}
+                for i in members:
+                    by_name.setdefault(name_id[i], []).append(i)
+                for same in by_name.values():
+                    if len(same) == 1:
+                        continue
+                    roots = []
+                    seen = set()
+                    start = {}  # election mask -> first root that might not clash with it (roots only gain elections)
+                    for i in same:
+                        ri = find(i)
+                        if ri in seen:
+                            continue
+                        m = mask[ri]
+                        p = start.get(m, 0)
+                        while p < len(roots) and mask[roots[p]] & m:
+                            p += 1
+                        start[m] = p
+                        if p < len(roots):
+                            parent[ri] = roots[p]
+                            mask[roots[p]] |= m
+                        else:
+                            refused += bool(roots)
+                            roots.append(ri)
+                            seen.add(ri)
+                if kind != "seat" and len(by_name) > 1:
+                    nids = sorted(by_name)
+                    for x, na in enumerate(nids):
+                        for nb in nids[x + 1:]:
+                            link(na, nb, by_name, rank, False)
+        rank = KINDS.index("seat")
+        for by_name, pairs in self._seat_blocks():
+            for na, nb in pairs:
+                link(na, nb, by_name, rank, True)
+        fuzzy.sort()
+        for _s, _rank, a, b in fuzzy:
+            ra, rb = find(a), find(b)
+            if ra == rb:
+                continue
+            if mask[ra] & mask[rb]:
+                refused += 1  # both have a mention in the same election
+                continue
+            parent[rb] = ra
+            mask[ra] |= mask[rb]
+
+        groups = {}
+        for i in range(n):
+            groups.setdefault(find(i), []).append(i)
+        self.stats = {
+            "mentions": n,
+            "names": len(self.words),
+            "blocks": {"seat": len(self._wordy), **{kind: len(b) for kind, b in self.blocks.items()}},
+            "skipped_blocks": skipped,
+            "name_pairs": compared,
+            "fuzzy_links": len(fuzzy),
+            "refused": refused,
+            "entities": len(groups),
+        }
+        return list(groups.values())
+
+    def resolve(self, previous: dict | None = None) -> dict:
+        """candidate-ids-v1 document; ids are kept from `previous` (an earlier document) where possible."""
+        groups = self.clusters()
+        keys, display = self.keys, self.display
+        old = person_ids(previous) if previous else {}
+        votes = []
+        for k, members in enumerate(groups if old else ()):
+            counts = {}
+            for i in members:
+                cid = old.get(keys[i])
+                if cid:
+                    counts[cid] = counts.get(cid, 0) + 1
+            votes.extend((-c, k, cid) for cid, c in counts.items())
+        ids = [None] * len(groups)
+        used = set()
+        for _c, k, cid in sorted(votes):
+            if ids[k] is None and cid not in used:
+                ids[k] = cid
+                used.add(cid)
+
+        entities = {}
+        for k, members in enumerate(groups):
+            first = members[0]
+            cid = ids[k]
+            if cid is None:
+                seed = f"{keys[first]}|{' '.join(self.words[self.name_id[first]])}"
+                while cid is None or cid in used:
+                    cid = "c" + hashlib.blake2b(seed.encode("utf-8"), digest_size=6).hexdigest()
+                    seed += "+"
+                used.add(cid)
+            if len(members) == 1:
+                entities[cid] = {"name": display[first], "mentions": [keys[first]]}
+                continue
+            spellings = {}
+            for i in members:
+                spellings[display[i]] = spellings.get(display[i], 0) + 1
+            # Most used spelling, the latest one on a tie (dicts keep first-seen order)
+            name = max(reversed(spellings), key=spellings.get)
+            entity = {"name": name, "mentions": [keys[i] for i in members]}
+            if len(spellings) > 1:
+                entity["aliases"] = [s for s in spellings if s != name]
+            entities[cid] = entity
+        return {"format": FORMAT, "entities": entities}
+
+
+def build_ids(table: LongTable, previous: dict | None = None) -> dict:
+    resolver = Resolver()
+    resolver.add_table(table)
+    return resolver.resolve(previous)
+
+
+def load_ids(path: Path) -> dict | None:
+    if not Path(path).exists():
+        return None
+    doc = load_json(path)
+    return doc if doc.get("format") == FORMAT else None
+
+
+def dumps_ids(doc: dict) -> str:
+    return json_io.dumps(doc) + "\n"
+
+
+def state_dirs(src: Path) -> list:
+    """[(state label, root)]: `src` itself when it holds the inputs, else each subdirectory that does."""
+    if (src / "bihar_constituencies.json").exists():
+        return [("", src)]
+    return [(d.name, d) for d in sorted(src.iterdir()) if (d / "bihar_constituencies.json").exists()]
+
+
+def lookup(doc: dict, query: str) -> list:
+    """[(id, entity)] whose name or an alias contains every word of `query`."""
+    want = name_words(query)
+    out = []
+    for cid, entity in doc["entities"].items():
+        for name in [entity["name"]] + entity.get("aliases", []):
+            words = name_words(name)
+            if all(any(w.startswith(q) for w in words) for q in want):
+                out.append((cid, entity))
+                break
+    return out
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="build_candidate_ids.py", description="Assign stable candidate ids.")
+    parser.add_argument("--long", default=str(LONG_PATH), help="long results table (default: results_long.json)")
+    parser.add_argument("--src", help="resolve the full candidate lists under this root or dir of state dirs instead")
+    parser.add_argument("--out", help="output path (default: candidate_ids.json; none with --src)")
+    parser.add_argument("--lookup", metavar="NAME", help="print the entities in --out matching a name")
+    args = parser.parse_args(argv)
+    out = Path(args.out) if args.out else None if args.src else OUT_PATH
+
+    if args.lookup is not None:
+        doc = load_ids(out or OUT_PATH)
+        if doc is None:
+            doc = build_ids(LongTable.from_json(load_json(Path(args.long))))
+        for cid, entity in lookup(doc, args.lookup):
+            aliases = f" (also {', '.join(entity['aliases'])})" if entity.get("aliases") else ""
+            print(f"{cid}  {entity['name']}{aliases}: {' '.join(entity['mentions'])}")
+        return 0
+
+    # Millions of small lists and dicts, none of them cyclic: the collector's rescans would cost more than the work
+    gc.disable()
+    resolver = Resolver()
+    t0 = time.perf_counter()
+    if args.src:
+        dirs = state_dirs(Path(args.src))
+        if not dirs:
+            print(f"No bihar_constituencies.json under {args.src}", file=sys.stderr)
+            return 1
+        for label, root in dirs:
+            resolver.add_store(SeatStore.load(root), label if len(dirs) > 1 else "")
+    else:
+        resolver.add_table(LongTable.from_json(load_json(Path(args.long))))
+    t1 = time.perf_counter()
+    doc = resolver.resolve(load_ids(out) if out else None)
+    t2 = time.perf_counter()
+    st = resolver.stats
+    print(f"{st['mentions']:,} mentions ({st['names']:,} distinct names) -> {st['entities']:,} candidates "
+          f"in {t2 - t1:.2f}s (load {t1 - t0:.2f}s); {st['name_pairs']:,} name pairs compared in "
+          f"{sum(st['blocks'].values()):,} blocks, {st['skipped_blocks']:,} over {MAX_BLOCK} skipped, "
+          f"{st['refused']:,} merges refused")
+    if out is None:
+        return 0
+    text = dumps_ids(doc)
+    if out.exists() and out.read_text(encoding="utf-8") == text:
+        print(f"{out.name} unchanged")
+        return 0
+    out.write_text(text, encoding="utf-8")
+    print(f"Wrote {out.name}: {len(doc['entities']):,} candidates ({len(text.encode('utf-8')):,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Precompute the map's per-mode seat colors, alliance palette and legends.
+
+Usage: python scripts/build_color_tables.py [--out color_tables.json]
+
+build_consolidated and live_ingest rebuild the table whenever they write
+the results, so this is only needed after editing parties.json by hand.
+
+Reads parties.json and bihar_election_results_consolidated.json and applies
+the same rules map.html uses at startup (buildAllianceColors,
+resolveAllianceForYear, preComputeColors, getOriginalColorForMode and
+updateLegend), so the page can index into the result instead of recomputing
+it for every seat and mode. Output (compact JSON):
+
+    {
+      "sources": {"bihar_election_results_consolidated.json": "<sha256>",
+                  "parties.json": "<sha256>"},
+      "seats": ["001", "002", ...],
+      "palette": ["#ffb366", ...],
+      "alliances": {"NDA": {"fill": "#4d94db", "stroke": "#0066cc"}, ...},
+      "modes": {
+        "alliance-2020": {"fill": [0, 3, ...], "stroke": [1, 4, ...],
+                          "legend": [["NDA", 125, 0], ...]},
+        ...
+      }
+    }
+
+fill/stroke are palette indexes aligned with "seats"; legend entries are
+[label, seat count, palette index], already sorted and truncated as the page
+shows them. "sources" holds the content digest (publish_assets.content_digest,
+the same sha256 dist/manifest.json records for each file) of the rows and
+parties the table was built from; map.html uses the table only when those
+match the manifest entries it actually loaded the data through.
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from publish_assets import content_digest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_PATH = ROOT / "bihar_election_results_consolidated.json"
+PARTIES_PATH = ROOT / "parties.json"
+OUT_PATH = ROOT / "color_tables.json"
+
+YEARS = ("2025", "2020", "2015", "2010")
+MODES = tuple(f"{kind}-{y}" for y in YEARS for kind in ("alliance", "party"))
+
+MISSING_FILL = "#f3f4f6"
+NA_FILL = "#e5e7eb"
+NA_STROKE = "#999999"
+DEFAULT_STROKE = "#1f77b4"
+SEED_ALLIANCES = (("NDA", "#0066cc"), ("MGB", "#cc3300"), ("OTH", "#8A2BE2"))
+PARTY_LEGEND_SIZE = 6
+
+_HEX6 = re.compile(r"^#?[0-9a-fA-F]{6}$")
+
+
+def _js_round(x: float) -> int:
+    # Math.round rounds halves up; Python's round() is banker's rounding
+    return math.floor(x + 0.5)
+
+
+def pastelize_color(hex_color, mix: float = 0.25) -> str:
+    if not hex_color or not isinstance(hex_color, str):
+        return NA_FILL
+    h = hex_color.replace("#", "").strip()
+    if len(h) != 6 or not all(c in "0123456789abcdefABCDEF" for c in h):
+        return NA_FILL
+    r, g, b = (int(h[i:i + 2], 16) for i in (0, 2, 4))
+    return "#" + "".join(f"{_js_round(c + (255 - c) * mix):02x}" for c in (r, g, b))
+
+
+def is_valid_hex(hex_color) -> bool:
+    return isinstance(hex_color, str) and bool(_HEX6.match(hex_color.strip()))
+
+
+def to_6hex(hex_color: str) -> str:
+    return "#" + hex_color.replace("#", "").strip().lower()
+
+
+def _utf16_units(s: str):
+    # charCodeAt() walks UTF-16 code units, not code points
+    data = s.encode("utf-16-le")
+    return [int.from_bytes(data[i:i + 2], "little") for i in range(0, len(data), 2)]
+
+
+def deterministic_color_for(key: str) -> str:
+    """Port of deterministicColorFor: 32-bit string hash -> HSL(hue, 55%, 52%)."""
+    h = 0
+    for unit in _utf16_units(key):
+        h = ((h << 5) - h + unit) & 0xFFFFFFFF
+    if h & 0x80000000:
+        h -= 1 << 32
+    hue = abs(h) % 360
+    s, l = 0.55, 0.52
+    a = s * min(l, 1 - l)
+
+    def f(n):
+        k = (n + hue / 30) % 12
+        col = l - a * max(min(k - 3, 9 - k, 1), -1)
+        return f"{_js_round(255 * col):02x}"
+
+    return "#" + f(0) + f(8) + f(4)
+
+
+def normalize_alliance_key(a):
+    return None if a is None else str(a).strip().upper()
+
+
+def alliance_colors(parties):
+    """(pastel, original) alliance palettes, first color seen per alliance wins."""
+    pastel = {"NA": NA_FILL}
+    original = {"NA": NA_STROKE}
+
+    def ensure(a, hex_color):
+        key = normalize_alliance_key(a)
+        if not key or key in original:
+            return
+        chosen = to_6hex(hex_color) if is_valid_hex(hex_color) else deterministic_color_for(key)
+        original[key] = chosen
+        pastel[key] = pastelize_color(chosen)
+
+    for p in parties:
+        ac = (p.get("alliance_colour_code") or p.get("alliance_color_code")
+              or p.get("alliance_colour") or p.get("alliance_color") or "")
+        if p.get("alliance") and str(p["alliance"]).strip():
+            ensure(p["alliance"], ac)
+        for a in (p.get("alliances") or {}).values():
+            ensure(a, ac)
+    for key, hex_color in SEED_ALLIANCES:
+        ensure(key, hex_color)
+    return pastel, original
+
+
+def raw_alliance(info, year: str):
+    if not info:
+        return None
+    alliances = info.get("alliances") or {}
+    return (alliances.get(year) or info.get(f"alliance_{year}")
+            or info.get("alliance_2020") or info.get("alliance"))
+
+
+def resolve_alliance(info, year: str) -> str:
+    return normalize_alliance_key(raw_alliance(info, year) or "NA") or "NA"
+
+
+def party_field(year: str) -> str:
+    return "current_mla_party" if year == "2020" else f"y{year}_winner_party"
+
+
+class ColorRules:
+    """The map's fill/stroke/legend rules with the palettes resolved once."""
+
+    def __init__(self, parties):
+        self.parties = {p.get("code"): p for p in parties if isinstance(p, dict)}
+        self.party_fill = {code: pastelize_color(p.get("color")) for code, p in self.parties.items()}
+        self.alliance_fill, self.alliance_stroke = alliance_colors(self.parties.values())
+
+    def _historical_fill(self, party, year):
+        if not party:
+            return MISSING_FILL
+        key = resolve_alliance(self.parties.get(party), year)
+        return NA_FILL if key == "NA" else self.alliance_fill.get(key, MISSING_FILL)
+
+    def _historical_stroke(self, party, year):
+        if not party:
+            return DEFAULT_STROKE
+        key = resolve_alliance(self.parties.get(party), year)
+        return NA_STROKE if key == "NA" else self.alliance_stroke.get(key, DEFAULT_STROKE)
+
+    def fill(self, row, mode):
+        kind, year = mode.split("-")
+        party = row.get(party_field(year))
+        if year == "2020":
+            alliance = self.alliance_fill.get(row.get("current_mla_alliance"))
+            if kind == "alliance":
+                return alliance or MISSING_FILL
+            return self.party_fill.get(party) or alliance or MISSING_FILL
+        if kind == "alliance":
+            return self._historical_fill(party, year)
+        # Historical party modes fill with the party's own color, as preComputeColors does
+        return (self.parties.get(party) or {}).get("color") or self._historical_stroke(party, year)
+
+    def stroke(self, row, mode):
+        kind, year = mode.split("-")
+        party = row.get(party_field(year))
+        if year == "2025":
+            return DEFAULT_STROKE
+        if year == "2020":
+            if kind == "alliance":
+                key = normalize_alliance_key(row.get("current_mla_alliance")) or resolve_alliance(self.parties.get(party), year)
+                return self.alliance_stroke.get(key, DEFAULT_STROKE)
+            return (self.parties.get(party) or {}).get("color") or DEFAULT_STROKE
+        if kind == "alliance":
+            return self._historical_stroke(party, year)
+        return (self.parties.get(party) or {}).get("color") or self._historical_stroke(party, year)
+
+    def legend(self, rows, mode):
+        """[(label, count, color)] in the order updateLegend renders them."""
+        kind, year = mode.split("-")
+        field = party_field(year)
+        if kind == "alliance":
+            counts = Counter()
+            for row in rows:
+                alliance = row.get("current_mla_alliance") if year == "2020" else None
+                if not alliance:
+                    alliance = raw_alliance(self.parties.get(row.get(field)), year) or row.get("current_mla_alliance")
+                counts[alliance or "NA"] += 1
+            return [
+                (a, n, NA_FILL if a == "NA" else self.alliance_fill.get(normalize_alliance_key(a), NA_FILL))
+                for a, n in counts.most_common()
+            ]
+        counts = Counter(row.get(field) for row in rows if row.get(field))
+        return [(p, n, self.party_fill.get(p) or MISSING_FILL) for p, n in counts.most_common(PARTY_LEGEND_SIZE)]
+
+
+def seat_code(row) -> str:
+    try:
+        return f"{int(str(row.get('no') or '0')):03d}"
+    except ValueError:
+        return "000"
+
+
+def build_tables(rows, parties) -> dict:
+    """The color_tables.json document for the consolidated rows and parties.json entries."""
+    rules = ColorRules(parties)
+    palette = {}
+
+    def idx(color):
+        return palette.setdefault(color, len(palette))
+
+    modes = {}
+    for mode in MODES:
+        modes[mode] = {
+            "fill": [idx(rules.fill(r, mode)) for r in rows],
+            "stroke": [idx(rules.stroke(r, mode)) for r in rows],
+            "legend": [[label, n, idx(color)] for label, n, color in rules.legend(rows, mode)],
+        }
+    return {
+        "sources": {RESULTS_PATH.name: content_digest(rows), PARTIES_PATH.name: content_digest(parties)},
+        "seats": [seat_code(r) for r in rows],
+        "palette": list(palette),
+        "alliances": {
+            key: {"fill": rules.alliance_fill[key], "stroke": rules.alliance_stroke[key]}
+            for key in rules.alliance_stroke
+        },
+        "modes": modes,
+    }
+
+
+def dumps_tables(tables: dict) -> str:
+    return json.dumps(tables, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="build_color_tables.py", description="Precompute map color tables.")
+    parser.add_argument("--results", default=str(RESULTS_PATH), help="consolidated results JSON")
+    parser.add_argument("--parties", default=str(PARTIES_PATH), help="parties.json")
+    parser.add_argument("--out", default=str(OUT_PATH), help="output path (default: color_tables.json)")
+    args = parser.parse_args(argv)
+
+    rows = json.loads(Path(args.results).read_bytes().decode("utf-8-sig"))
+    parties = json.loads(Path(args.parties).read_bytes().decode("utf-8-sig"))
+
+    tables = build_tables(rows, parties)
+    text = dumps_tables(tables)
+    out = Path(args.out)
+    if out.exists() and out.read_text(encoding="utf-8") == text:
+        print(f"{out.name} unchanged")
+        return 0
+    out.write_text(text, encoding="utf-8")
+    print(f"Wrote {out.name}: {len(tables['seats'])} seats x {len(MODES)} modes, {len(tables['palette'])} colors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
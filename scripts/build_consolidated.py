@@ -1,53 +1,23 @@
+import hashlib
 import json
+import sys
 from pathlib import Path
 
+from build_candidate_ids import build_ids, dumps_ids, load_ids
+from build_color_tables import PARTIES_PATH, build_tables, dumps_tables
+from build_rollups import build_rollups, dumps_rollups
+from build_search_index import build_index, dumps_index
+from seat_store import ROOT, SRC, SeatStore, load_json
+import json_io
+from results_long import SEAT_FIELDS, LongTable, dumps_table, person_ids, write_slices
+import seat_db
+import stage_profile
 
-ROOT = Path(__file__).resolve().parents[1]
 
+STATE_PATH = ROOT / ".build_cache" / "consolidated_state.json"
 
-def load_json(path: Path):
-    # Use utf-8-sig to handle potential BOM
-    with path.open("r", encoding="utf-8-sig") as f:
-        return json.load(f)
-
-
-def index_year_results(results_obj):
-    """Build { seat_no:int -> rec } from normalized results JSON structure."""
-    by_no = {}
-    if not isinstance(results_obj, dict):
-        return by_no
-    for _district, rows in results_obj.items():
-        if not isinstance(rows, list):
-            continue
-        for rec in rows:
-            try:
-                no = int(str(rec.get("#", "")).strip())
-            except ValueError:
-                continue
-            by_no[no] = rec
-    return by_no
-
-
-def index_current_mla(mla_obj):
-    """Build { seat_no:int -> {Name, Party, Alliance, Remarks} }"""
-    by_no = {}
-    if not isinstance(mla_obj, dict):
-        return by_no
-    for _district, rows in mla_obj.items():
-        if not isinstance(rows, list):
-            continue
-        for row in rows:
-            try:
-                no = int(str(row.get("No.", "")).strip())
-            except ValueError:
-                continue
-            by_no[no] = {
-                "Name": row.get("Name") or "",
-                "Party": row.get("Party") or "",
-                "Alliance": row.get("Alliance") or "",
-                "Remarks": row.get("Remarks") or "",
-            }
-    return by_no
+# Bump when build_record output changes so cached seats are invalidated
+BUILD_VERSION = 2
 
 
 def pick_party(p):
@@ -60,100 +30,250 @@ def pick_party(p):
     }
 
 
-def build_record(no: int, base: dict, r2010: dict | None, r2015: dict | None, r2020: dict | None, mla: dict | None):
-    def year_fields(rec: dict | None, year: int):
-        y = str(year)
-        out = {}
-        if rec:
-            w = pick_party(rec.get("Winner") or {})
-            ru = pick_party(rec.get("Runner up") or {})
-            margin = str(rec.get("Margin") or "")
-            out[f"y{y}_winner_name"] = w["Candidate"]
-            out[f"y{y}_winner_party"] = w["Party"]
-            out[f"y{y}_winner_votes"] = w["Votes"]
-            out[f"y{y}_runner_name"] = ru["Candidate"]
-            out[f"y{y}_runner_party"] = ru["Party"]
-            out[f"y{y}_runner_votes"] = ru["Votes"]
-            out[f"y{y}_margin"] = margin
-        else:
-            # keep keys present but empty
-            out[f"y{y}_winner_name"] = ""
-            out[f"y{y}_winner_party"] = ""
-            out[f"y{y}_winner_votes"] = ""
-            out[f"y{y}_runner_name"] = ""
-            out[f"y{y}_runner_party"] = ""
-            out[f"y{y}_runner_votes"] = ""
-            out[f"y{y}_margin"] = ""
-        return out
-
-    # Base constituency fields
-    rec = {
-        "no": str(no),
-        "constituency_name": base.get("name") or "",
-        "slug": base.get("slug") or "",
-        "district": base.get("district") or "",
-        "reserved": (base.get("reserved") or "") or "",
-        "lok_sabha_no": str(base.get("lok_sabha_no") or ""),
-        "lok_sabha": base.get("lok_sabha") or "",
-    }
+def seat_row(no: int, base: dict, mla: dict | None):
+    """One row of the long table's seat table (results_long.SEAT_FIELDS order)."""
+    mla = mla or {}
+    return [
+        no,
+        base.get("name") or "",
+        base.get("slug") or "",
+        base.get("district") or "",
+        base.get("reserved") or "",
+        str(base.get("lok_sabha_no") or ""),
+        base.get("lok_sabha") or "",
+        mla.get("Name") or "",
+        mla.get("Party") or "",
+        mla.get("Alliance") or "",
+        mla.get("Remarks") or "",
+    ]
 
-    # Year fields
-    rec.update(year_fields(r2010, 2010))
-    rec.update(year_fields(r2015, 2015))
-    rec.update(year_fields(r2020, 2020))
 
-    # Current MLA
-    mla = mla or {}
-    rec["current_mla_name"] = mla.get("Name") or ""
-    rec["current_mla_party"] = mla.get("Party") or ""
-    rec["current_mla_alliance"] = mla.get("Alliance") or ""
-    rec["current_remarks"] = mla.get("Remarks") or ""
+def result_rows(no: int, year: int, rec: dict | None):
+    """(seat, year, rank) rows for one year record; none when the seat has no result."""
+    if not rec:
+        return []
+    w = pick_party(rec.get("Winner") or {})
+    ru = pick_party(rec.get("Runner up") or {})
+    return [
+        [no, year, 1, w["Candidate"], w["Party"], w["Votes"], str(rec.get("Margin") or ""), ""],
+        [no, year, 2, ru["Candidate"], ru["Party"], ru["Votes"], "", ""],
+    ]
+
+
+def build_record(no: int, base: dict, results: dict, mla: dict | None):
+    """Seat row plus long rows for every year in `results` ({year: record or None})."""
+    rows = []
+    for year, rec in sorted(results.items()):
+        rows.extend(result_rows(no, year, rec))
+    return seat_row(no, base, mla), rows
+
+
+def seat_key(no) -> str:
+    """Zero-padded seat id used for shard filenames (matches map.html `ac`)."""
+    return str(int(str(no))).zfill(3)
+
+
+def content_hash(obj) -> str:
+    """Stable sha256 of a JSON-serializable object (key order independent)."""
+    blob = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write text only when the file bytes would differ. Returns True if written."""
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def load_state(path: Path):
+    try:
+        state = load_json(path)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != BUILD_VERSION:
+        return {}
+    return state.get("seats") or {}
+
+
+def save_state(path: Path, seats: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps({"version": BUILD_VERSION, "seats": seats}, ensure_ascii=False, sort_keys=True, indent=1)
+    write_if_changed(path, text)
 
-    # Diffs vs 2020
-    rec["diff_party_vs_2020"] = (
-        "True" if rec.get("current_mla_party") and rec.get("y2020_winner_party") and rec["current_mla_party"] != rec["y2020_winner_party"] else "False"
-    )
-    rec["diff_name_vs_2020"] = (
-        "True" if rec.get("current_mla_name") and rec.get("y2020_winner_name") and rec["current_mla_name"] != rec["y2020_winner_name"] else "False"
-    )
 
-    return rec
+def write_seat_shards(rows, out_dir: Path):
+    """Write one compact JSON file per seat plus a small index.json manifest.
 
+    Pages that render a single seat can fetch `seats/<NNN>.json` instead of
+    the full consolidated file; the index lists seats in the same order
+    (file name is `seat_key(no) + ".json"`). Files whose bytes are unchanged
+    are left untouched. Returns the number of files actually rewritten.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index = []
+    keep = {"index.json"}
+    written = 0
+    for row in rows:
+        key = seat_key(row.get("no", 0))
+        fname = f"{key}.json"
+        keep.add(fname)
+        text = json_io.dumps(row)
+        written += write_if_changed(out_dir / fname, text)
+        index.append({
+            "no": row.get("no", ""),
+            "name": row.get("constituency_name", ""),
+            "slug": row.get("slug", ""),
+            "district": row.get("district", ""),
+        })
+
+    # Drop shards for seats that are no longer present
+    for stale in out_dir.glob("*.json"):
+        if stale.name not in keep:
+            stale.unlink()
+
+    text = json_io.dumps({"count": len(index), "seats": index})
+    written += write_if_changed(out_dir / "index.json", text)
+    return written
+
+
+def load_previous_table(path: Path):
+    """The previously written long table, or None."""
+    try:
+        return LongTable.from_json(load_json(path))
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def option_value(argv, name: str, default: str) -> str:
+    """`name DIR` or `name=DIR` from a hand-parsed argv, else `default`."""
+    value = next((a.split("=", 1)[1] for a in argv if a.startswith(name + "=")), None) or default
+    if name in argv:
+        i = argv.index(name)
+        if i + 1 >= len(argv):
+            raise SystemExit(f"{name} needs a directory")
+        value = argv[i + 1]
+    return value
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    argv, profile, cprofile = stage_profile.pop_arguments(argv)
+    full = "--full" in argv
+    # Pretty (indent=2) by default since the file is reviewed in diffs; --compact for publishing
+    compact = "--compact" in argv
+    # --db PATH: read the inputs from a seat_db.py database instead of the JSON files
+    db = next((a.split("=", 1)[1] for a in argv if a.startswith("--db=")), None)
+    if "--db" in argv:
+        i = argv.index("--db")
+        db = argv[i + 1] if i + 1 < len(argv) else str(seat_db.DB_PATH)
+    # --src DIR: the input files (default: archive/); --out-dir DIR: where the outputs go (default: repo root)
+    src = option_value(argv, "--src", str(SRC))
+    out_dir = Path(option_value(argv, "--out-dir", str(ROOT)))
+    state_path = out_dir / STATE_PATH.relative_to(ROOT)
+    stage_profile.start("build_consolidated", profile, cprofile)
 
-def main():
     # Inputs
-    constituencies = load_json(ROOT / "bihar_constituencies.json")
-    parties = load_json(ROOT / "parties.json")  # not embedded, but kept for potential validation
-    r2010 = index_year_results(load_json(ROOT / "2010_results.normalized.json"))
-    r2015 = index_year_results(load_json(ROOT / "2015_results.normalized.json"))
-    r2020 = index_year_results(load_json(ROOT / "2020_results.normalized.json"))
-    mla_idx = index_current_mla(load_json(ROOT / "current_mla.json"))
-
-    # Build consolidated rows
+    with stage_profile.stage("load") as st:
+        if db:
+            store = seat_db.load_store(Path(db), years=(2010, 2015, 2020), normalized=True)
+        else:
+            store = SeatStore.load(Path(src), years=(2010, 2015, 2020), normalized=True)
+        years = [y for y in store.years if any(store.iter_results(y))]
+        st.records = len(store)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / "bihar_election_results_consolidated.json"
+    long_path = out_dir / "results_long.json"
+
+    # Previous build: reuse seats whose inputs and published rows are unchanged.
+    # Years without an input file (e.g. 2025 filled in by live_ingest) are carried over.
+    with stage_profile.stage("load_previous"):
+        prev = load_previous_table(long_path)
+        prev_state = {} if full or prev is None else load_state(state_path)
+        carried = [y for y in prev.years if y not in years] if prev else []
+
+    seats = []
     rows = []
-    for no_str, base in constituencies.items():
-        try:
-            no = int(str(no_str))
-        except ValueError:
-            continue
-        row = build_record(
-            no=no,
-            base=base or {},
-            r2010=r2010.get(no),
-            r2015=r2015.get(no),
-            r2020=r2020.get(no),
-            mla=mla_idx.get(no),
-        )
-        rows.append(row)
-
-    # Sort by seat number as string for stable output
-    rows.sort(key=lambda r: int(r.get("no", 0)))
-
-    out_path = ROOT / "bihar_election_results_consolidated.json"
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False, indent=2)
-
-    print(f"Wrote {len(rows)} rows to {out_path}")
+    state = {}
+    rebuilt = 0
+    with stage_profile.stage("build") as st:
+        for seat in store:
+            if not (seat.slug or seat.name or seat.district):
+                # Only constituencies listed in bihar_constituencies.json are published
+                continue
+            no = seat.no
+            mla = store.mla(no)
+            inputs = {
+                "base": seat.to_dict(),
+                "results": {y: (r.to_dict() if (r := store.result(y, no)) else None) for y in years},
+                "mla": mla.to_dict() if mla else None,
+            }
+            in_hash = content_hash(inputs)
+            built = None
+            if prev_state.get(str(no), {}).get("in") == in_hash:
+                old = (prev.seat(no), [r for r in prev.seat_rows(no) if r[1] in years])
+                if old[0] is not None and content_hash(old) == prev_state[str(no)].get("out"):
+                    built = (list(old[0].values()), old[1])
+            if built is None:
+                built = build_record(no=no, **inputs)
+                rebuilt += 1
+            seat_values, seat_results = built
+            seats.append(seat_values)
+            rows.extend(seat_results)
+            if prev:
+                for y in carried:
+                    rows.extend(prev.seat_rows(no, y))
+            state[str(no)] = {"in": in_hash, "out": content_hash((dict(zip(SEAT_FIELDS, seat_values)), seat_results))}
+        st.records = len(seats)
+
+    # Current MLAs are compared against the latest election with input results
+    with stage_profile.stage("write_long", records=len(rows)):
+        table = LongTable(years + carried, years[-1] if years else None, SEAT_FIELDS, seats, rows)
+        write_if_changed(long_path, dumps_table(table.to_json()))
+        n = write_slices(table, out_dir / "results")
+    print(f"{long_path.name}: {len(table.seats)} seats, {len(table.rows)} rows; {n} files updated in results/")
+
+    # District / Lok Sabha aggregates and the type-ahead index, for pages that do not need every row
+    with stage_profile.stage("rollups"):
+        write_if_changed(out_dir / "rollups.json", dumps_rollups(build_rollups(table, store.parties)))
+    with stage_profile.stage("search_index"):
+        write_if_changed(out_dir / "search_index.json", dumps_index(build_index(table)))
+
+    # Candidate ids across years and seats; the wide view compares the current MLA by id
+    with stage_profile.stage("candidate_ids"):
+        ids_path = out_dir / "candidate_ids.json"
+        ids = build_ids(table, load_ids(ids_path))
+        write_if_changed(ids_path, dumps_ids(ids))
+
+    # Wide consolidated rows are a view over the long table
+    with stage_profile.stage("wide_view", records=len(table.seats)):
+        wide = table.to_wide(person_ids=person_ids(ids))
+    with stage_profile.stage("serialize", records=len(wide)):
+        text = json_io.dumps(wide, pretty=not compact)
+        changed = write_if_changed(out_path, text)
+    if changed:
+        print(f"Wrote {len(wide)} rows to {out_path} ({rebuilt} rebuilt)")
+    else:
+        print(f"{out_path.name} unchanged ({len(wide)} rows, {rebuilt} rebuilt)")
+
+    # map.html only uses the color table when its source digests match the rows written above
+    with stage_profile.stage("color_tables", records=len(wide)):
+        parties = load_json(PARTIES_PATH) if PARTIES_PATH.exists() else []
+        write_if_changed(out_dir / "color_tables.json", dumps_tables(build_tables(wide, parties)))
+
+    seats_dir = out_dir / "seats"
+    with stage_profile.stage("seat_shards", records=len(wide)):
+        n = write_seat_shards(wide, seats_dir)
+    print(f"Updated {n} files in {seats_dir}")
+
+    save_state(state_path, state)
+    stage_profile.finish({"rebuilt": rebuilt})
 
 
 if __name__ == "__main__":
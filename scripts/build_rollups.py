@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Precompute per-district and per-Lok Sabha aggregates of each election.
+
+Usage: python scripts/build_rollups.py [--long results_long.json] [--out rollups.json]
+
+scripts/build_consolidated.py writes rollups.json on every build (and
+live_ingest.py refreshes it when present); this script rebuilds it from an
+existing long table. Pages that show totals above seat level read these few
+KB instead of fetching every row and reducing it in the browser. Output
+(compact JSON):
+
+    {
+      "format": "rollups-v1",
+      "years": [2010, 2015, 2020, 2025],
+      "state": {"seats": [1, ..., 243], "years": {"2020": {...}, ...}},
+      "districts": [{"name": "Paschim Champaran", "seats": [1, 2, ...], "years": {...}}, ...],
+      "lok_sabha": [{"no": 1, "name": "Valmiki Nagar", "seats": [1, 2, ...], "years": {...}}, ...]
+    }
+
+with one aggregate per group and year:
+
+    {"seats": 9,                                  # seats with a winning party that year
+     "party": {"BJP": 4, "JD(U)": 3, ...},         # seats won, most first
+     "alliance": {"NDA": 7, "MGB": 2},             # winner's alliance that year (parties.json)
+     "winner_votes": 612345, "runner_votes": 498765,
+     "margin_median": 11824, "margin_min": 371}
+
+Districts are listed in order of their first seat and Lok Sabha segments
+by number. Years in which a group has no result are left out of its
+"years". During counting (live_ingest) rank 1 is the current leader, so
+the latest year's figures are provisional until every seat is declared.
+"""
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+from analytics import meta_alliance
+from seat_store import ROOT, load_json, sanitize_int
+import json_io
+from results_long import LongTable
+
+LONG_PATH = ROOT / "results_long.json"
+PARTIES_PATH = ROOT / "parties.json"
+OUT_PATH = ROOT / "rollups.json"
+FORMAT = "rollups-v1"
+
+
+def _ranked(counts: dict) -> dict:
+    return dict(sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])))
+
+
+def _median(values: list):
+    m = statistics.median(values)
+    return int(m) if m == int(m) else m
+
+
+def year_outcomes(table: LongTable, year: int, parties: dict) -> dict:
+    """seat no -> (party, alliance, winner votes, runner votes, margin) for seats won that year."""
+    out = {}
+    runner_votes = {}
+    for no, _y, rank, _name, party, votes, margin, _status in table.year_rows(year):
+        if rank == 1 and party:
+            out[no] = [party, meta_alliance(parties.get(party) or {}, year) or "NA",
+                       sanitize_int(votes), None, sanitize_int(margin)]
+        elif rank == 2:
+            runner_votes[no] = sanitize_int(votes)
+    for no, rec in out.items():
+        rec[3] = runner_votes.get(no)
+    return out
+
+
+def rollup(seat_nos, outcomes: dict) -> dict | None:
+    """Aggregate of one group of seats for one year, or None if none has a result."""
+    won = [outcomes[no] for no in seat_nos if no in outcomes]
+    if not won:
+        return None
+    party, alliance = {}, {}
+    for p, a, *_ in won:
+        party[p] = party.get(p, 0) + 1
+        alliance[a] = alliance.get(a, 0) + 1
+    margins = [m for *_, m in won if m is not None]
+    return {
+        "seats": len(won),
+        "party": _ranked(party),
+        "alliance": _ranked(alliance),
+        "winner_votes": sum(v for _p, _a, v, _r, _m in won if v),
+        "runner_votes": sum(r for _p, _a, _v, r, _m in won if r),
+        "margin_median": _median(margins) if margins else None,
+        "margin_min": min(margins) if margins else None,
+    }
+
+
+def _years_of(seat_nos, by_year: dict) -> dict:
+    out = {}
+    for year, outcomes in by_year.items():
+        r = rollup(seat_nos, outcomes)
+        if r is not None:
+            out[str(year)] = r
+    return out
+
+
+def build_rollups(table: LongTable, parties) -> dict:
+    """District, Lok Sabha and state rollups of `table`; `parties` is parties.json (list or code map)."""
+    if isinstance(parties, list):
+        parties = {p.get("code"): p for p in parties if isinstance(p, dict)}
+    col = {f: k for k, f in enumerate(table.seat_fields)}
+    by_year = {year: year_outcomes(table, year, parties) for year in table.years}
+
+    districts, lok_sabha = {}, {}
+    for s in table.seats:
+        no = s[0]
+        if s[col["district"]]:
+            districts.setdefault(s[col["district"]], []).append(no)
+        ls_no = sanitize_int(s[col["lok_sabha_no"]])
+        if ls_no is not None:
+            entry = lok_sabha.setdefault(ls_no, {"no": ls_no, "name": s[col["lok_sabha"]], "seats": []})
+            entry["seats"].append(no)
+
+    all_nos = [s[0] for s in table.seats]
+    return {
+        "format": FORMAT,
+        "years": list(table.years),
+        "state": {"seats": all_nos, "years": _years_of(all_nos, by_year)},
+        "districts": [
+            {"name": name, "seats": nos, "years": _years_of(nos, by_year)} for name, nos in districts.items()
+        ],
+        "lok_sabha": [
+            {**lok_sabha[ls_no], "years": _years_of(lok_sabha[ls_no]["seats"], by_year)}
+            for ls_no in sorted(lok_sabha)
+        ],
+    }
+
+
+def dumps_rollups(rollups: dict) -> str:
+    return json_io.dumps(rollups) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="build_rollups.py", description="Precompute district and Lok Sabha rollups.")
+    parser.add_argument("--long", default=str(LONG_PATH), help="long results table (default: results_long.json)")
+    parser.add_argument("--parties", default=str(PARTIES_PATH), help="parties.json")
+    parser.add_argument("--out", default=str(OUT_PATH), help="output path (default: rollups.json)")
+    args = parser.parse_args(argv)
+
+    table = LongTable.from_json(load_json(Path(args.long)))
+    rollups = build_rollups(table, load_json(Path(args.parties)))
+    text = dumps_rollups(rollups)
+    out = Path(args.out)
+    if out.exists() and out.read_text(encoding="utf-8") == text:
+        print(f"{out.name} unchanged")
+        return 0
+    out.write_text(text, encoding="utf-8")
+    print(f"Wrote {out.name}: {len(rollups['districts'])} districts, {len(rollups['lok_sabha'])} Lok Sabha seats, "
+          f"{len(rollups['years'])} years ({len(text.encode('utf-8')):,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Prefix/trigram search index over seats, districts and candidate names.
+
+Usage:
+    python scripts/build_search_index.py [--long results_long.json] [--out search_index.json]
+    python scripts/build_search_index.py --lookup "valmiki"      # try a query
+
+scripts/build_consolidated.py writes search_index.json on every build;
+map.html uses it for type-ahead and constituency_info.py to resolve seat
+names. Output (compact JSON):
+
+    {
+      "format": "search-v1",
+      "terms": [["Valmiki Nagar", "c", [1]], ["Paschim Champaran", "d", [1, 2, ...]],
+                ["Rajesh Singh", "p", [1, 203]], ...],
+      "tokens": [["agiaon", [57]], ...],          # sorted: prefix lookups are a binary search
+      "trigrams": {" va": [0, 412], ...}         # for substring / misspelling fallback
+    }
+
+A term is one searchable string with the seats it points to (postings).
+Kinds: "c" constituency name, "s" slug (only when it adds words, e.g.
+"ramnagar-sc"), "d" district, "p" person (winner / runner-up in any year,
+current MLA). tokens and trigrams map to term ids (positions in "terms").
+
+Text is normalized the same way in Python and JavaScript: NFKD with
+combining marks dropped, lower case, runs of anything but [a-z0-9]
+collapsed to one space. A query of digits is a seat number. Otherwise a
+term matches when every query word is a prefix of some word of the
+term; when nothing matches, terms sharing at least half of the query's
+trigrams are returned instead. Results rank by exact match, then
+whole-string prefix, then word prefix, then trigram overlap; within that
+constituencies before slugs, districts and people, and shorter terms
+first.
+"""
+
+import argparse
+import bisect
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+from seat_store import ROOT, load_json
+import json_io
+from results_long import LongTable
+
+LONG_PATH = ROOT / "results_long.json"
+OUT_PATH = ROOT / "search_index.json"
+FORMAT = "search-v1"
+
+KINDS = ("c", "s", "d", "p")
+KIND_RANK = {k: i for i, k in enumerate(KINDS)}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped.lower()).strip()
+
+
+def trigrams(norm: str) -> set:
+    padded = f" {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_index(table: LongTable) -> dict:
+    col = {f: k for k, f in enumerate(table.seat_fields)}
+    terms = {}  # (kind, normalized) -> [display text, kind, {seat nos}]
+
+    def add(kind, text, no):
+        norm = normalize(text)
+        if not norm:
+            return
+        entry = terms.setdefault((kind, norm), [text.strip(), kind, {}])
+        entry[2][no] = None
+
+    for s in table.seats:
+        no, name = s[0], s[col["constituency_name"]]
+        add("c", name, no)
+        slug = s[col["slug"]]
+        if normalize(slug) != normalize(name):
+            add("s", slug, no)
+        add("d", s[col["district"]], no)
+        add("p", s[col["current_mla_name"]], no)
+    for year in table.years:
+        for no, _y, _rank, name, *_rest in table.year_rows(year):
+            add("p", name, no)
+
+    ordered = sorted(terms.values(), key=lambda t: (KIND_RANK[t[1]], normalize(t[0]), t[0]))
+    out_terms = [[text, kind, sorted(nos)] for text, kind, nos in ordered]
+    tokens, grams = {}, {}
+    for tid, (text, _kind, _nos) in enumerate(out_terms):
+        norm = normalize(text)
+        for tok in dict.fromkeys(norm.split()):
+            tokens.setdefault(tok, []).append(tid)
+        for g in sorted(trigrams(norm)):
+            grams.setdefault(g, []).append(tid)
+    return {
+        "format": FORMAT,
+        "terms": out_terms,
+        "tokens": [[tok, tokens[tok]] for tok in sorted(tokens)],
+        "trigrams": {g: grams[g] for g in sorted(grams)},
+    }
+
+
+class SearchIndex:
+    """Lookups over a search_index.json document."""
+
+    def __init__(self, doc: dict):
+        if doc.get("format") != FORMAT:
+            raise ValueError(f"not a {FORMAT} search index")
+        self.terms = doc["terms"]
+        self.norms = [normalize(t[0]) for t in self.terms]
+        self.token_keys = [t[0] for t in doc["tokens"]]
+        self.token_postings = [t[1] for t in doc["tokens"]]
+        self.trigrams = doc["trigrams"]
+        self.by_seat = {nos[0]: tid for tid, (_text, kind, nos) in enumerate(self.terms) if kind == "c"}
+
+    @classmethod
+    def load(cls, path: Path = OUT_PATH, long_path: Path = LONG_PATH) -> "SearchIndex":
+        """The built index, or one built on the fly from the long table if it is missing."""
+        if Path(path).exists():
+            return cls(load_json(path))
+        return cls(build_index(LongTable.from_json(load_json(long_path))))
+
+    def _prefix(self, word: str) -> set:
+        lo = bisect.bisect_left(self.token_keys, word)
+        hi = bisect.bisect_left(self.token_keys, word + "\x7f")
+        out = set()
+        for postings in self.token_postings[lo:hi]:
+            out.update(postings)
+        return out
+
+    def search(self, query: str, limit: int | None = 20, kinds=None) -> list:
+        """[(text, kind, seat nos)] best first."""
+        q = normalize(query)
+        if not q:
+            return []
+        if q.isdigit():
+            tid = self.by_seat.get(int(q))
+            return [] if tid is None else [tuple(self.terms[tid])]
+        hits = None
+        for word in q.split():
+            ids = self._prefix(word)
+            hits = ids if hits is None else hits & ids
+            if not hits:
+                break
+        scored = []
+        if hits:
+            for tid in hits:
+                norm = self.norms[tid]
+                cls = 0 if norm == q else 1 if norm.startswith(q) else 2
+                scored.append((cls, 0, tid))
+        elif len(q) >= 3:
+            grams = trigrams(q)
+            shared = {}
+            for g in grams:
+                for tid in self.trigrams.get(g, ()):
+                    shared[tid] = shared.get(tid, 0) + 1
+            need = max(1, (len(grams) + 1) // 2)
+            scored = [(3, -n, tid) for tid, n in shared.items() if n >= need]
+        out = []
+        for _cls, _n, tid in sorted(
+                scored, key=lambda s: (s[0], s[1], KIND_RANK[self.terms[s[2]][1]], len(self.norms[s[2]]), self.norms[s[2]])):
+            text, kind, nos = self.terms[tid]
+            if kinds and kind not in kinds:
+                continue
+            out.append((text, kind, nos))
+            if limit and len(out) >= limit:
+                break
+        return out
+
+    def resolve(self, query: str) -> list:
+        """Seat numbers for a name: exact matches of the best kind (all their seats), else the top hit."""
+        hits = self.search(query, limit=None)
+        if not hits:
+            return []
+        q = normalize(query)
+        exact = [h for h in hits if normalize(h[0]) == q]
+        best = [h for h in exact if h[1] == exact[0][1]] if exact else hits[:1]
+        nos = {}
+        for _text, _kind, seat_nos in best:
+            nos.update(dict.fromkeys(seat_nos))
+        return sorted(nos)
+
+
+def dumps_index(doc: dict) -> str:
+    return json_io.dumps(doc) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="build_search_index.py", description="Build the seat/name search index.")
+    parser.add_argument("--long", default=str(LONG_PATH), help="long results table (default: results_long.json)")
+    parser.add_argument("--out", default=str(OUT_PATH), help="output path (default: search_index.json)")
+    parser.add_argument("--lookup", metavar="QUERY", help="search the index at --out instead of building it")
+    args = parser.parse_args(argv)
+
+    if args.lookup is not None:
+        index = SearchIndex.load(Path(args.out), Path(args.long))
+        for text, kind, nos in index.search(args.lookup):
+            print(f"{kind}  {text}  -> {', '.join(map(str, nos))}")
+        return 0
+
+    doc = build_index(LongTable.from_json(load_json(Path(args.long))))
+    text = dumps_index(doc)
+    out = Path(args.out)
+    if out.exists() and out.read_text(encoding="utf-8") == text:
+        print(f"{out.name} unchanged")
+        return 0
+    out.write_text(text, encoding="utf-8")
+    print(f"Wrote {out.name}: {len(doc['terms'])} terms, {len(doc['tokens'])} words, "
+          f"{len(doc['trigrams'])} trigrams ({len(text.encode('utf-8')):,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
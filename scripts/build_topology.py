@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Convert the AC GeoJSON into quantized, multi-resolution TopoJSON.
+
+Usage: python scripts/build_topology.py [bihar_ac_all.geojson] [--out topo]
+           [--quantization 100000] [--levels 0,0.0005,0.002]
+
+Writes into the output directory:
+
+- bihar_ac.z<i>.topo.json   one TopoJSON topology per simplification level
+                             (object name "ac", geometry id = 3-digit AC no.)
+- bihar_ac.meta.json        per-AC centroid [lon, lat] and bbox
+                             [minLon, minLat, maxLon, maxLat], plus the list
+                             of levels with their tolerance and file name
+
+Shared borders are stored once as arcs, so neighbouring constituencies stay
+gap-free at every level: each arc is simplified (Douglas-Peucker, tolerance
+in degrees) once and reused by both polygons. Coordinates are quantized to
+an integer grid and delta-encoded as in the TopoJSON spec.
+"""
+
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_INPUT = ROOT / "bihar_ac_all.geojson"
+DEFAULT_LEVELS = (0.0, 0.0005, 0.002)
+OBJECT_NAME = "ac"
+
+
+def load_json(path: Path):
+    # Use utf-8-sig to handle potential BOM
+    with path.open("r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+
+def feature_key(props: dict) -> str:
+    """Same key map.html derives in featureKey(): zero-padded AC number."""
+    n = props.get("AC_NO", props.get("ac_no", props.get("Ac_No")))
+    try:
+        return str(int(float(n))).zfill(3)
+    except (TypeError, ValueError):
+        return str(n or "")
+
+
+def polygons_of(geometry: dict):
+    """Yield polygons (lists of rings) for Polygon / MultiPolygon geometries."""
+    if not geometry:
+        return
+    gtype = geometry.get("type")
+    coords = geometry.get("coordinates") or []
+    if gtype == "Polygon":
+        yield coords
+    elif gtype == "MultiPolygon":
+        yield from coords
+
+
+# --- geometry metadata -----------------------------------------------------
+
+def ring_area_centroid(ring):
+    """Signed area and area-weighted centroid sums of a ring (shoelace)."""
+    a = cx = cy = 0.0
+    for i in range(len(ring) - 1):
+        x0, y0 = ring[i][0], ring[i][1]
+        x1, y1 = ring[i + 1][0], ring[i + 1][1]
+        cross = x0 * y1 - x1 * y0
+        a += cross
+        cx += (x0 + x1) * cross
+        cy += (y0 + y1) * cross
+    return a / 2.0, cx, cy
+
+
+def centroid_and_bbox(geometry: dict):
+    area = sx = sy = 0.0
+    minx = miny = math.inf
+    maxx = maxy = -math.inf
+    first = None
+    for poly in polygons_of(geometry):
+        for i, ring in enumerate(poly):
+            if not ring:
+                continue
+            for pt in ring:
+                x, y = pt[0], pt[1]
+                minx, miny, maxx, maxy = min(minx, x), min(miny, y), max(maxx, x), max(maxy, y)
+                if first is None:
+                    first = (x, y)
+            a, cx, cy = ring_area_centroid(ring)
+            # Outer ring adds area, holes subtract, regardless of winding order
+            sign = 1.0 if i == 0 else -1.0
+            if a < 0:
+                a, cx, cy = -a, -cx, -cy
+            area += sign * a
+            sx += sign * cx
+            sy += sign * cy
+    if first is None:
+        return None, None
+    if area == 0:
+        centroid = [first[0], first[1]]
+    else:
+        centroid = [sx / (6.0 * area), sy / (6.0 * area)]
+    return centroid, [minx, miny, maxx, maxy]
+
+
+# --- topology ------------------------------------------------------------
+
+class Quantizer:
+    def __init__(self, bbox, n: int):
+        minx, miny, maxx, maxy = bbox
+        self.n = n
+        self.kx = (maxx - minx) / (n - 1) if maxx > minx else 1.0
+        self.ky = (maxy - miny) / (n - 1) if maxy > miny else 1.0
+        self.x0, self.y0 = minx, miny
+
+    def __call__(self, pt):
+        return (round((pt[0] - self.x0) / self.kx), round((pt[1] - self.y0) / self.ky))
+
+    @property
+    def transform(self):
+        return {"scale": [self.kx, self.ky], "translate": [self.x0, self.y0]}
+
+
+def _quantize_ring(ring, q):
+    out = []
+    for pt in ring:
+        p = q(pt)
+        if not out or out[-1] != p:
+            out.append(p)
+    if out and out[0] != out[-1]:
+        out.append(out[0])
+    return out
+
+
+def _junctions(rings):
+    """Points where rings diverge: the same point with different neighbours."""
+    seen = {}
+    junctions = set()
+    for ring in rings:
+        n = len(ring) - 1
+        for i in range(n):
+            pt = ring[i]
+            prev, nxt = ring[i - 1], ring[i + 1]
+            pair = (prev, nxt) if prev <= nxt else (nxt, prev)
+            old = seen.get(pt)
+            if old is None:
+                seen[pt] = pair
+            elif old != pair:
+                junctions.add(pt)
+    return junctions
+
+
+def _canonical_closed(points):
+    """Rotate a closed point loop (without the closing duplicate) to start at its minimum."""
+    i = points.index(min(points))
+    body = points[i:] + points[:i]
+    return body + [body[0]]
+
+
+class ArcIndex:
+    def __init__(self):
+        self.arcs = []
+        self._index = {}
+
+    def add(self, points) -> int:
+        key = tuple(points)
+        idx = self._index.get(key)
+        if idx is not None:
+            return idx
+        rev = self._index.get(tuple(reversed(points)))
+        if rev is not None:
+            return ~rev
+        idx = len(self.arcs)
+        self.arcs.append(list(points))
+        self._index[key] = idx
+        return idx
+
+
+def _ring_to_arcs(ring, junctions, arcs: ArcIndex):
+    body = ring[:-1]
+    cuts = [i for i, pt in enumerate(body) if pt in junctions]
+    if not cuts:
+        # Whole ring is one arc; canonical rotation lets identical rings share it
+        return [arcs.add(_canonical_closed(body))]
+    start = cuts[0]
+    rotated = body[start:] + body[:start] + [body[start]]
+    cut_set = {i - start if i >= start else i - start + len(body) for i in cuts}
+    out = []
+    seg = [rotated[0]]
+    for i in range(1, len(rotated)):
+        seg.append(rotated[i])
+        if i in cut_set or i == len(rotated) - 1:
+            out.append(arcs.add(seg))
+            seg = [rotated[i]]
+    return out
+
+
+def build_topology_arcs(features, quantizer):
+    """Quantize all rings, cut them at junctions and return (arcs, per-feature arc refs)."""
+    qfeatures = []
+    all_rings = []
+    for feat in features:
+        polys = []
+        for poly in polygons_of(feat.get("geometry")):
+            rings = [r for r in (_quantize_ring(ring, quantizer) for ring in poly) if len(r) >= 4]
+            if rings:
+                polys.append(rings)
+                all_rings.extend(rings)
+        qfeatures.append(polys)
+
+    junctions = _junctions(all_rings)
+    arcs = ArcIndex()
+    refs = []
+    for polys in qfeatures:
+        refs.append([[_ring_to_arcs(ring, junctions, arcs) for ring in rings] for rings in polys])
+    return arcs.arcs, refs
+
+
+# --- simplification ------------------------------------------------------
+
+def _seg_dist2(p, a, b):
+    ax, ay = a
+    dx, dy = b[0] - ax, b[1] - ay
+    if dx == 0 and dy == 0:
+        return (p[0] - ax) ** 2 + (p[1] - ay) ** 2
+    t = ((p[0] - ax) * dx + (p[1] - ay) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return (p[0] - ax - t * dx) ** 2 + (p[1] - ay - t * dy) ** 2
+
+
+def douglas_peucker(points, tol2: float):
+    """Iterative Douglas-Peucker on quantized points; tol2 is squared tolerance."""
+    n = len(points)
+    if n <= 2 or tol2 <= 0:
+        return list(points)
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        a, b = points[i], points[j]
+        best, best_d = -1, tol2
+        for k in range(i + 1, j):
+            d = _seg_dist2(points[k], a, b)
+            if d > best_d:
+                best, best_d = k, d
+        if best >= 0:
+            keep[best] = True
+            stack.append((i, best))
+            stack.append((best, j))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def simplify_arcs(arcs, refs, tol2: float):
+    simplified = [douglas_peucker(a, tol2) for a in arcs]
+    # Closed single-arc rings need at least 4 points to stay polygons
+    for i, a in enumerate(simplified):
+        if a[0] == a[-1] and len(a) < 4:
+            src = arcs[i]
+            n = len(src) - 1
+            simplified[i] = [src[0], src[n // 3], src[(2 * n) // 3], src[-1]] if n >= 3 else list(src)
+    # Rings collapsed by multi-arc simplification get their arcs restored
+    for polys in refs:
+        for rings in polys:
+            for ring in rings:
+                pts = set()
+                for r in ring:
+                    pts.update(simplified[r if r >= 0 else ~r])
+                if len(pts) < 3:
+                    for r in ring:
+                        k = r if r >= 0 else ~r
+                        simplified[k] = list(arcs[k])
+    return simplified
+
+
+def delta_encode(points):
+    out = []
+    px = py = 0
+    for x, y in points:
+        out.append([x - px, y - py])
+        px, py = x, y
+    return out
+
+
+def topology_for_level(features, keys, arcs, refs, quantizer, tol_deg: float):
+    tol_q = tol_deg / max(quantizer.kx, quantizer.ky) if tol_deg > 0 else 0.0
+    simplified = simplify_arcs(arcs, refs, tol_q * tol_q)
+
+    geometries = []
+    for feat, key, polys in zip(features, keys, refs):
+        props = dict(feat.get("properties") or {})
+        if not polys:
+            geometries.append({"type": None, "id": key, "properties": props})
+        elif len(polys) == 1:
+            geometries.append({"type": "Polygon", "id": key, "properties": props, "arcs": polys[0]})
+        else:
+            geometries.append({"type": "MultiPolygon", "id": key, "properties": props, "arcs": polys})
+
+    return {
+        "type": "Topology",
+        "transform": quantizer.transform,
+        "objects": {OBJECT_NAME: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": [delta_encode(a) for a in simplified],
+    }
+
+
+def build(geojson: dict, quantization: int = 100000, levels=DEFAULT_LEVELS):
+    features = [f for f in (geojson.get("features") or []) if isinstance(f, dict)]
+    keys = [feature_key(f.get("properties") or {}) for f in features]
+
+    meta = {}
+    minx = miny = math.inf
+    maxx = maxy = -math.inf
+    for feat, key in zip(features, keys):
+        centroid, bbox = centroid_and_bbox(feat.get("geometry") or {})
+        if bbox is None:
+            continue
+        meta[key] = {"c": [round(v, 6) for v in centroid], "b": [round(v, 6) for v in bbox]}
+        minx, miny = min(minx, bbox[0]), min(miny, bbox[1])
+        maxx, maxy = max(maxx, bbox[2]), max(maxy, bbox[3])
+    if not meta:
+        raise ValueError("No polygon features found")
+
+    quantizer = Quantizer((minx, miny, maxx, maxy), quantization)
+    arcs, refs = build_topology_arcs(features, quantizer)
+    topologies = [topology_for_level(features, keys, arcs, refs, quantizer, tol) for tol in levels]
+    return topologies, meta
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="build_topology.py", description="GeoJSON -> multi-resolution TopoJSON.")
+    parser.add_argument("input", nargs="?", default=str(DEFAULT_INPUT))
+    parser.add_argument("--out", default=str(ROOT / "topo"), help="output directory (default: topo/)")
+    parser.add_argument("--quantization", type=int, default=100000, help="grid size per axis (default: 1e5)")
+    parser.add_argument(
+        "--levels",
+        default=",".join(str(v) for v in DEFAULT_LEVELS),
+        help="comma-separated simplification tolerances in degrees, finest first",
+    )
+    args = parser.parse_args(argv)
+
+    src = Path(args.input)
+    if not src.exists():
+        print(f"Input not found: {src}")
+        return 1
+    levels = [float(v) for v in args.levels.split(",") if v.strip()]
+    topologies, meta = build(load_json(src), args.quantization, levels)
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    level_info = []
+    for i, (tol, topo) in enumerate(zip(levels, topologies)):
+        name = f"bihar_ac.z{i}.topo.json"
+        text = json.dumps(topo, ensure_ascii=False, separators=(",", ":"))
+        (out_dir / name).write_text(text, encoding="utf-8")
+        points = sum(len(a) for a in topo["arcs"])
+        level_info.append({"level": i, "tolerance": tol, "file": name, "bytes": len(text.encode("utf-8"))})
+        print(f"Level {i} (tolerance {tol}): {len(topo['arcs'])} arcs, {points} points -> {name}")
+
+    meta_doc = {"object": OBJECT_NAME, "levels": level_info, "features": meta}
+    (out_dir / "bihar_ac.meta.json").write_text(
+        json.dumps(meta_doc, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+    )
+    print(f"Wrote metadata for {len(meta)} constituencies to {out_dir / 'bihar_ac.meta.json'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
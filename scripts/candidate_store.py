@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""Candidate-level results as typed column arrays, with shares, ranks and margins.
+
+Usage:
+    python scripts/candidate_store.py                      # summary per year
+    python scripts/candidate_store.py --root synthetic/state-01 --years 2010,2020
+    python scripts/candidate_store.py --seat 57            # one seat's field
+    python scripts/candidate_store.py --out candidates.columnar.json
+
+Built from the same year-results ingestion as everything else (SeatStore).
+A seat-year contributes its full `Candidates` list when the year file has
+one, otherwise just the winner and runner-up. Candidates are stored
+column-wise in `array` buffers, one slot per candidate:
+
+    seat (index into store.seats)   year   party (id into .parties)   votes
+    share (% of valid votes)   rank (1 = winner)   margin   flags
+
+grouped by seat-year: group g owns rows offsets[g]:offsets[g + 1], groups
+are ordered by seat and then year (seat_groups[s]:seat_groups[s + 1] are a
+seat's groups), and rows inside a group are sorted by votes, highest first.
+Names are the one non-numeric column (a plain list).
+
+compute() fills share/rank/margin/flags group by group, working on each
+seat-year's slice of the arrays. Valid votes per seat-year (`totals`) are
+the sum of the field when it is complete, otherwise derived from the
+winner's published "%"; without either, share and deposit flags stay
+unknown (share -1, no FORFEIT flag).
+margin is votes minus the runner-up's for the winner and minus the winner's
+(so <= 0) for everyone else. A candidate forfeits the deposit below one
+sixth of the valid votes; NOTA (party "NOTA") is never ranked and never
+forfeits.
+
+The Bihar year files in archive/ carry only the winner and runner-up for
+each seat, so on the real data every seat-year is partial ("complete": 0
+in the summary). The full-field path (Candidates lists, NOTA, deposits
+from summed totals) is exercised only by data from
+`generate_dataset.py --full-field`.
+"""
+
+import argparse
+import json
+import sys
+from array import array
+from itertools import groupby
+from pathlib import Path
+
+from seat_store import SRC, YEARS, SeatStore, sanitize_int
+
+
+NOTA = "NOTA"
+
+# flags bits
+WINNER = 1
+IS_NOTA = 2
+FORFEIT = 4
+COMPLETE = 8  # the seat-year's full field is known
+
+
+def _pct(val):
+    try:
+        return float(str(val).strip().rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+
+
+class CandidateStore:
+    """Column arrays for every candidate in a SeatStore's year results."""
+
+    def __init__(self):
+        self.seat_nos = []  # store seat number per seat index
+        self.parties = []  # party code per id
+        self.party_ids = {}
+        self.names = []
+        self.seat = array("I")
+        self.year = array("H")
+        self.party = array("H")
+        self.votes = array("I")
+        self.share = array("d")
+        self.rank = array("H")
+        self.margin = array("i")
+        self.flags = array("B")
+        self.offsets = array("I", [0])  # per group, len = groups + 1
+        self.group_seat = array("I")
+        self.group_year = array("H")
+        self.totals = array("I")  # valid votes per group (0 = unknown)
+        self.seat_groups = array("I", [0])  # per seat, len = seats + 1
+
+    def __len__(self):
+        return len(self.votes)
+
+    @property
+    def groups(self):
+        return len(self.group_seat)
+
+    def _party_id(self, code: str) -> int:
+        pid = self.party_ids.get(code)
+        if pid is None:
+            pid = self.party_ids[code] = len(self.parties)
+            self.parties.append(code)
+        return pid
+
+    @classmethod
+    def from_seat_store(cls, store: SeatStore, years=None):
+        cs = cls()
+        years = sorted(years or store.years)
+        for s_idx, seat in enumerate(store.seats):
+            cs.seat_nos.append(seat.no)
+            for year in years:
+                arr = store.results.get(year)
+                res = arr[s_idx] if arr else None
+                if res is None:
+                    continue
+                complete = res.candidates is not None
+                field = res.candidates if complete else [c for c in (res.winner, res.runner_up) if c.name or c.party]
+                rows = []
+                for c in field:
+                    v = sanitize_int(c.votes)
+                    rows.append((v if v is not None and v >= 0 else 0, c.name, c.party))
+                if not rows:
+                    continue
+                rows.sort(key=lambda r: -r[0])
+                total = 0  # complete fields are summed in compute()
+                if not complete:
+                    pct = _pct(res.winner.pct)
+                    w_votes = sanitize_int(res.winner.votes)
+                    if pct and w_votes:
+                        total = round(w_votes * 100 / pct)
+                pid = cs._party_id
+                for v, name, party in rows:
+                    cs.names.append(name)
+                    cs.seat.append(s_idx)
+                    cs.year.append(year)
+                    cs.party.append(pid(party))
+                    cs.votes.append(v)
+                cs.flags.extend([COMPLETE if complete else 0] * len(rows))
+                cs.group_seat.append(s_idx)
+                cs.group_year.append(year)
+                cs.totals.append(total)
+                cs.offsets.append(len(cs.votes))
+            cs.seat_groups.append(len(cs.group_seat))
+        cs.compute()
+        return cs
+
+    def compute(self):
+        """Fill share, rank, margin and flags for every row, one seat-year slice at a time."""
+        n = len(self.votes)
+        votes, flags, party, offsets, totals = self.votes, self.flags, self.party, self.offsets, self.totals
+        share = array("d", [-1.0]) * n
+        rank = array("H", bytes(2 * n))
+        margin = array("i", bytes(4 * n))
+        nota_id = self.party_ids.get(NOTA, -1)
+        for g in range(len(self.group_seat)):
+            start, stop = offsets[g], offsets[g + 1]
+            complete = flags[start] & COMPLETE
+            vs = votes[start:stop]
+            if complete:
+                totals[g] = sum(vs)
+            total = totals[g]
+            flags[start:stop] = array("B", [complete]) * (stop - start)
+            if total:
+                share[start:stop] = array("d", map((100.0 / total).__mul__, vs))
+            # Highest votes first; NOTA is never ranked and never forfeits
+            order = sorted(range(start, stop), key=votes.__getitem__, reverse=True)
+            nota = [i for i in order if party[i] == nota_id] if nota_id in party[start:stop] else []
+            ranked = [i for i in order if party[i] != nota_id] if nota else order
+            for i in nota:
+                flags[i] |= IS_NOTA
+            if not ranked:
+                continue
+            first = ranked[0]
+            lead = votes[first]
+            # Everyone but the winner trails the lead; ties share a rank
+            margin[start:stop] = array("i", map(lead.__rsub__, vs))
+            margin[first] = lead - (votes[ranked[1]] if len(ranked) > 1 else 0)
+            for i in nota:
+                margin[i] = 0
+            if len(set(vs)) == len(vs):
+                for r, i in enumerate(ranked, 1):
+                    rank[i] = r
+            else:
+                for r, (_, same) in enumerate(groupby(ranked, key=votes.__getitem__), 1):
+                    for i in same:
+                        rank[i] = r
+            flags[first] |= WINNER
+            if total:
+                # Forfeits are a tail of the ranked field
+                for i in reversed(ranked):
+                    if votes[i] * 6 >= total:
+                        break
+                    flags[i] |= FORFEIT
+        self.share, self.rank, self.margin = share, rank, margin
+
+    # --- access -------------------------------------------------------
+
+    def row(self, i: int) -> dict:
+        return {
+            "seat": self.seat_nos[self.seat[i]],
+            "year": self.year[i],
+            "name": self.names[i],
+            "party": self.parties[self.party[i]],
+            "votes": self.votes[i],
+            "share": round(self.share[i], 2) if self.share[i] >= 0 else None,
+            "rank": self.rank[i] or None,
+            "margin": self.margin[i] if self.rank[i] else None,
+            "nota": bool(self.flags[i] & IS_NOTA),
+            "forfeit": bool(self.flags[i] & FORFEIT),
+        }
+
+    def seat_rows(self, s_idx: int, year: int | None = None):
+        """Row dicts for one seat (by index into store.seats), optionally one year."""
+        out = []
+        for g in range(self.seat_groups[s_idx], self.seat_groups[s_idx + 1]):
+            if year is None or self.group_year[g] == year:
+                out.extend(self.row(i) for i in range(self.offsets[g], self.offsets[g + 1]))
+        return out
+
+    def summary(self) -> dict:
+        by_year = {}
+        for g in range(len(self.group_seat)):
+            y = by_year.setdefault(self.group_year[g], {"seats": 0, "candidates": 0, "complete": 0, "nota": 0, "forfeit": 0})
+            y["seats"] += 1
+            start, stop = self.offsets[g], self.offsets[g + 1]
+            y["candidates"] += stop - start
+            y["complete"] += bool(self.flags[start] & COMPLETE)
+            for i in range(start, stop):
+                y["nota"] += bool(self.flags[i] & IS_NOTA)
+                y["forfeit"] += bool(self.flags[i] & FORFEIT)
+        return {str(k): by_year[k] for k in sorted(by_year)}
+
+    def to_columnar(self) -> dict:
+        """JSON-ready columns (same spirit as json_to_columnar: ids into `parties`)."""
+        return {
+            "format": "candidates-columnar-v1",
+            "count": len(self),
+            "seats": self.seat_nos,
+            "parties": self.parties,
+            "offsets": list(self.offsets),
+            "columns": {
+                "seat": list(self.seat),
+                "year": list(self.year),
+                "party": list(self.party),
+                "votes": list(self.votes),
+                "name": self.names,
+                "share": [round(x, 2) if x >= 0 else None for x in self.share],
+                "rank": list(self.rank),
+                "margin": list(self.margin),
+                "flags": list(self.flags),
+            },
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="candidate_store.py", description="Candidate-level columnar results.")
+    parser.add_argument("--root", default=str(SRC), help="directory holding the year results (default: archive/)")
+    parser.add_argument("--years", default=",".join(map(str, YEARS)), help="comma-separated years")
+    parser.add_argument("--normalized", action="store_true", help="read *_results.normalized.json")
+    parser.add_argument("--seat", type=int, help="print one seat's candidates")
+    parser.add_argument("--out", help="write the columns as JSON")
+    args = parser.parse_args(argv)
+
+    years = [int(y) for y in args.years.split(",") if y.strip()]
+    store = SeatStore.load(Path(args.root), years=years, normalized=args.normalized)
+    cs = CandidateStore.from_seat_store(store, years)
+
+    if args.seat is not None:
+        idx = store.index_of(args.seat)
+        if idx is None:
+            print(f"Seat {args.seat} not found", file=sys.stderr)
+            return 1
+        print(json.dumps(cs.seat_rows(idx), ensure_ascii=False, indent=2))
+        return 0
+    if args.out:
+        Path(args.out).write_text(json.dumps(cs.to_columnar(), ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        print(f"Wrote {len(cs)} candidates in {cs.groups} seat-years to {args.out}")
+    print(json.dumps(cs.summary(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
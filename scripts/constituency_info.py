@@ -1,16 +1,37 @@
 #!/usr/bin/env python3
+"""Print a seat detail document (current MLA + 2010/2015/2020 results).
+
+Usage:
+    python scripts/constituency_info.py 57              # one seat, pretty JSON
+    python scripts/constituency_info.py "valmiki nagar"  # seat, district or candidate name
+    python scripts/constituency_info.py 1-10 57,60      # several seats, NDJSON on stdout
+    python scripts/constituency_info.py --all --out-dir out/seats   # one <NNN>.json per seat
+    python scripts/constituency_info.py --all --ndjson seats.ndjson -j 4
+    python scripts/constituency_info.py --db bihar.db 57    # from scripts/seat_db.py
+    python scripts/constituency_info.py --all --src synthetic/state-01   # other inputs (default: archive/)
+
+Batch runs load the inputs once and fan seat assembly out over a process
+pool (-j, default: CPU count; -j 1 runs inline). --profile records
+per-stage timings (stage_profile.py).
+"""
+import argparse
+import os
 import sys
-import json
 import csv
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from build_search_index import SearchIndex
+from normalize_parties import normalize_party
+from seat_store import SRC, SeatStore, sanitize_int
+import seat_db
 
-ROOT = Path(__file__).resolve().parent.parent
 
+ROOT = Path(__file__).resolve().parent.parent
 
-def load_json(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+sys.path.insert(0, str(ROOT))
+import json_io  # noqa: E402
+import stage_profile  # noqa: E402
 
 
 def load_csv_indexed_by_no(path: Path):
@@ -28,21 +49,6 @@ def load_csv_indexed_by_no(path: Path):
     return idx
 
 
-def sanitize_int(val):
-    if val is None:
-        return None
-    s = str(val).strip().replace(",", "")
-    if s == "" or s == "None":
-        return None
-    try:
-        return int(s)
-    except ValueError:
-        try:
-            return int(float(s))
-        except Exception:
-            return None
-
-
 def sanitize_float(val):
     if val is None:
         return None
@@ -55,172 +61,48 @@ def sanitize_float(val):
         return None
 
 
-def normalize_party(code: str) -> str:
-    if not code:
-        return code
-    mapping = {
-        "JDU": "JD(U)",
-        "JD(U)": "JD(U)",
-        "CPM": "CPI(M)",
-        "HAM": "HAM(S)",
-        "Ind": "IND",
-        "IND": "IND",
-        "JD(U) ": "JD(U)",
-    }
-    return mapping.get(code, code)
-
-
-def find_result_for_no(results_by_district: dict, seat_no: int):
-    # results_by_district is a dict of district -> [records]
-    key = str(seat_no)
-    for district, arr in results_by_district.items():
-        for rec in arr:
-            if str(rec.get("#")) == key:
-                return rec
-    return None
-
-
-def main(argv):
-    if len(argv) >= 2:
-        try:
-            seat_no = int(argv[1])
-        except ValueError:
-            print("Usage: python scripts/constituency_info.py <constituency_no>")
-            return 2
-    else:
-        try:
-            seat_no = int(input("Enter constituency number (1-243): ").strip())
-        except Exception:
-            print("Invalid number")
-            return 2
-
-    # Load base data
-    const_path = ROOT / "bihar_constituencies.json"
-    parties_path = ROOT / "parties.json"
-    mla_json = ROOT / "current_mla.json"
-    electors_csv = ROOT / "electors_2024.csv"
-    r2020_path = ROOT / "2020_results.json"
-    r2015_path = ROOT / "2015_results.json"
-    r2010_path = ROOT / "2010_results.json"
-
-    constituencies = load_json(const_path) if const_path.exists() else {}
-    parties = load_json(parties_path) if parties_path.exists() else []
-    parties_idx = {p.get("code"): p for p in parties}
-
-    # Build MLA index from district-keyed JSON { District: [{"No.", "Name", "Party", "Alliance", "Remarks"}, ...] }
-    mla_idx = {}
-    if mla_json.exists():
-        mla_data = load_json(mla_json)
-        if isinstance(mla_data, dict):
-            for district, rows in mla_data.items():
-                if not isinstance(rows, list):
-                    continue
-                for row in rows:
-                    try:
-                        no = int(str(row.get("No.", "").strip()))
-                    except Exception:
-                        continue
-                    mla_idx[no] = {
-                        "mla": row.get("Name"),
-                        "party": row.get("Party"),
-                        "alliance": row.get("Alliance"),
-                        "note": (row.get("Remarks") or None),
-                    }
-    elect_idx = load_csv_indexed_by_no(electors_csv)
-
-    # Results files keyed by district
-    results_2020 = load_json(r2020_path) if r2020_path.exists() else {}
-    results_2015 = load_json(r2015_path) if r2015_path.exists() else {}
-    results_2010 = load_json(r2010_path) if r2010_path.exists() else {}
-
-    base = constituencies.get(str(seat_no)) or {}
+def seat_document(store: SeatStore, elect_idx: dict, seat_no: int) -> dict:
+    seat = store.get(seat_no)
+    base = seat.to_dict() if seat else {}
 
     def enrich_party_meta(code):
         code_norm = normalize_party(code) if code else None
-        meta = parties_idx.get(code_norm) or parties_idx.get(code)
+        meta = store.party(code_norm) or store.party(code)
         return code_norm, (meta or None)
 
     # Current MLA
-    mla_row = mla_idx.get(seat_no) or {}
-    mla_name = mla_row.get("mla") or None
-    mla_party_raw = (mla_row.get("party") or "").strip() or None
+    mla_row = store.mla(seat_no)
+    mla_name = (mla_row.name if mla_row else None) or None
+    mla_party_raw = (mla_row.party.strip() if mla_row else "") or None
     mla_party, mla_party_meta = enrich_party_meta(mla_party_raw)
-    mla_alliance = (mla_row.get("alliance") or "").strip() or None
-    mla_note = mla_row.get("note") or None
+    mla_alliance = (mla_row.alliance.strip() if mla_row else "") or None
+    mla_note = (mla_row.remarks if mla_row else None) or None
 
     # Electors
     e_row = elect_idx.get(seat_no) or {}
     electors = sanitize_int(e_row.get("electors_2024"))
     shifted = sanitize_int(e_row.get("shifted_2024"))
 
-    # Results 2020
-    r2020 = find_result_for_no(results_2020, seat_no) if results_2020 else None
-    winner_2020 = runner_2020 = None
-    margin_2020 = None
-    if r2020:
-        w = r2020.get("Winner", {})
-        ru = r2020.get("Runner up", {})
-        w_party_norm, w_meta = enrich_party_meta(w.get("Party"))
-        ru_party_norm, ru_meta = enrich_party_meta(ru.get("Party"))
-        winner_2020 = {
-            "name": w.get("Candidate"),
-            "party": w_party_norm,
-            "party_name": (w_meta or {}).get("name") if w_meta else None,
-            "votes": sanitize_int(w.get("Votes")),
-        }
-        runner_2020 = {
-            "name": ru.get("Candidate"),
-            "party": ru_party_norm,
-            "party_name": (ru_meta or {}).get("name") if ru_meta else None,
-            "votes": sanitize_int(ru.get("Votes")),
-        }
-        margin_2020 = sanitize_int(r2020.get("Margin"))
-    # Results 2015
-    r2015 = find_result_for_no(results_2015, seat_no) if results_2015 else None
-    winner_2015 = runner_2015 = None
-    margin_2015 = None
-    if r2015:
-        w = r2015.get("Winner", {})
-        ru = r2015.get("Runner up", {})
-        w_party_norm, w_meta = enrich_party_meta(w.get("Party"))
-        ru_party_norm, ru_meta = enrich_party_meta(ru.get("Party"))
-        winner_2015 = {
-            "name": w.get("Candidate"),
-            "party": w_party_norm,
-            "party_name": (w_meta or {}).get("name") if w_meta else None,
-            "votes": sanitize_int(w.get("Votes")),
-        }
-        runner_2015 = {
-            "name": ru.get("Candidate"),
-            "party": ru_party_norm,
-            "party_name": (ru_meta or {}).get("name") if ru_meta else None,
-            "votes": sanitize_int(ru.get("Votes")),
-        }
-        margin_2015 = sanitize_int(r2015.get("Margin"))
-    # Results 2010
-    r2010 = find_result_for_no(results_2010, seat_no) if results_2010 else None
-    winner_2010 = runner_2010 = None
-    margin_2010 = None
-    if r2010:
-        w = r2010.get("Winner", {})
-        ru = r2010.get("Runner up", {})
-        w_party_norm, w_meta = enrich_party_meta(w.get("Party"))
-        ru_party_norm, ru_meta = enrich_party_meta(ru.get("Party"))
-        winner_2010 = {
-            "name": w.get("Candidate"),
-            "party": w_party_norm,
-            "party_name": (w_meta or {}).get("name") if w_meta else None,
-            "votes": sanitize_int(w.get("Votes")),
+    def candidate_block(c):
+        party_norm, meta = enrich_party_meta(c.party or None)
+        return {
+            "name": c.name or None,
+            "party": party_norm,
+            "party_name": (meta or {}).get("name") if meta else None,
+            "votes": c.votes_int,
         }
-        runner_2010 = {
-            "name": ru.get("Candidate"),
-            "party": ru_party_norm,
-            "party_name": (ru_meta or {}).get("name") if ru_meta else None,
-            "votes": sanitize_int(ru.get("Votes")),
+
+    def year_block(year):
+        res = store.result(year, seat_no)
+        if not res:
+            return None
+        return {
+            "winner": candidate_block(res.winner),
+            "runner_up": candidate_block(res.runner_up),
+            "margin_votes": res.margin_int,
         }
-        margin_2010 = sanitize_int(r2010.get("Margin"))
 
-    out = {
+    return {
         "no": seat_no,
         "name": base.get("name"),
         "slug": base.get("slug"),
@@ -233,26 +115,173 @@ def main(argv):
             "alliance": mla_alliance,
             "note": mla_note,
         },
-        "results_2020": {
-            "winner": winner_2020,
-            "runner_up": runner_2020,
-            "margin_votes": margin_2020,
-        } if r2020 else None,
-        "results_2015": {
-            "winner": winner_2015,
-            "runner_up": runner_2015,
-            "margin_votes": margin_2015,
-        } if r2015 else None,
-        "results_2010": {
-            "winner": winner_2010,
-            "runner_up": runner_2010,
-            "margin_votes": margin_2010,
-        } if r2010 else None,
+        "results_2020": year_block(2020),
+        "results_2015": year_block(2015),
+        "results_2010": year_block(2010),
     }
 
-    print(json.dumps(out, ensure_ascii=False, indent=2))
+
+def load_inputs(db=None, seat_nos=None, src: Path = SRC):
+    """Store and electors index; with `db` (seat_db.py) only `seat_nos` are loaded."""
+    if db:
+        store = seat_db.load_store(Path(db), years=(2010, 2015, 2020), seats=seat_nos)
+    else:
+        store = SeatStore.load(src, years=(2010, 2015, 2020))
+    electors = src / "electors_2024.csv"
+    elect_idx = load_csv_indexed_by_no(electors if electors.exists() else ROOT / "electors_2024.csv")
+    return store, elect_idx
+
+
+def parse_seat_spec(tokens, resolve=None):
+    """Expand tokens like "57", "1-10" and "3,5,7-9" into seat numbers (deduplicated, ordered).
+
+    Other tokens (seat, slug, district or candidate names) go through
+    `resolve(name) -> [seat numbers]` when given.
+    """
+    out = {}
+    for tok in tokens:
+        for part in str(tok).split(","):
+            part = part.strip()
+            if not part:
+                continue
+            lo, sep, hi = part.partition("-")
+            if part.isdigit():
+                out[int(part)] = None
+            elif sep and lo.strip().isdigit() and hi.strip().isdigit():
+                for n in range(int(lo), int(hi) + 1):
+                    out[n] = None
+            elif resolve is not None:
+                nos = resolve(part)
+                if not nos:
+                    raise ValueError(f"no seat matches {part!r}")
+                out.update(dict.fromkeys(nos))
+            else:
+                raise ValueError(f"not a seat number: {part!r}")
+    return list(out)
+
+
+# Loaded on the first name lookup
+_SEARCH = None
+
+
+def resolve_name(name):
+    """Seat numbers for a name via the search index (search_index.json)."""
+    global _SEARCH
+    if _SEARCH is None:
+        _SEARCH = SearchIndex.load()
+    return _SEARCH.resolve(name)
+
+
+# Worker state: set once per process by the pool initializer
+_WORKER_INPUTS = None
+
+
+def _init_worker(store, elect_idx, pretty):
+    global _WORKER_INPUTS
+    _WORKER_INPUTS = (store, elect_idx, pretty)
+
+
+def _render_seat(seat_no):
+    store, elect_idx, pretty = _WORKER_INPUTS
+    doc = seat_document(store, elect_idx, seat_no)
+    return seat_no, json_io.dumps(doc, pretty=pretty)
+
+
+def render_seats(store, elect_idx, seat_nos, jobs=None, pretty=False):
+    """Yield (seat_no, json_text) in input order."""
+    jobs = jobs or os.cpu_count() or 1
+    initargs = (store, elect_idx, pretty)
+    if jobs <= 1 or len(seat_nos) < 2:
+        _init_worker(*initargs)
+        for no in seat_nos:
+            yield _render_seat(no)
+        return
+    chunksize = max(1, len(seat_nos) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        yield from pool.map(_render_seat, seat_nos, chunksize=chunksize)
+
+
+def run_batch(seat_nos, out_dir=None, ndjson=None, jobs=None, db=None, src: Path = SRC):
+    with stage_profile.stage("load"):
+        store, elect_idx = load_inputs(db, seat_nos, src)
+    if seat_nos is None:
+        seat_nos = sorted(s.no for s in store)
+
+    out_file = None
+    if out_dir:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+    elif ndjson and ndjson != "-":
+        out_file = open(ndjson, "w", encoding="utf-8")
+    stream = out_file or sys.stdout
+
+    count = 0
+    # "render" is document assembly + dumps alone; "write" the whole batch loop
+    rendered = stage_profile.timed_iter("render", render_seats(store, elect_idx, seat_nos, jobs, pretty=bool(out_dir)))
+    try:
+        with stage_profile.stage("write") as st:
+            for no, text in rendered:
+                if out_dir:
+                    (out_dir / f"{no:03d}.json").write_text(text + "\n", encoding="utf-8")
+                else:
+                    stream.write(text + "\n")
+                count += 1
+            st.records = count
+    finally:
+        if out_file:
+            out_file.close()
+
+    if out_dir or out_file:
+        print(f"Wrote {count} seat documents to {out_dir or ndjson}", file=sys.stderr)
     return 0
 
 
+def main(argv):
+    parser = argparse.ArgumentParser(prog="constituency_info.py", description="Seat detail documents as JSON.")
+    parser.add_argument("seats", nargs="*", help="seat numbers, ranges (1-10), lists (3,5,7) or names")
+    parser.add_argument("--all", action="store_true", help="every seat in bihar_constituencies.json")
+    parser.add_argument("--out-dir", help="write one <NNN>.json per seat into this directory")
+    parser.add_argument("--ndjson", help="write NDJSON to this file ('-' for stdout, the batch default)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--db", help="read the inputs from a seat_db.py database (indexed per-seat loads)")
+    parser.add_argument("--src", default=str(SRC), help="directory holding the input files (default: archive/)")
+    stage_profile.add_arguments(parser)
+    args = parser.parse_args(argv[1:])
+    stage_profile.start("constituency_info", args.profile, args.cprofile)
+    try:
+        return _run(args)
+    finally:
+        stage_profile.finish()
+
+
+def _run(args):
+    try:
+        seat_nos = None if args.all else parse_seat_spec(args.seats, resolve_name)
+    except ValueError as exc:
+        print(f"{exc}\nUsage: python scripts/constituency_info.py <constituency_no | name>")
+        return 2
+
+    # Single seat: keep the original pretty-printed stdout output
+    if not args.all and not args.out_dir and not args.ndjson and len(args.seats) <= 1:
+        if seat_nos:
+            seat_no = seat_nos[0]
+            if len(seat_nos) > 1:
+                return run_batch(seat_nos, jobs=args.jobs, db=args.db, src=Path(args.src))
+        else:
+            try:
+                seat_no = int(input("Enter constituency number (1-243): ").strip())
+            except Exception:
+                print("Invalid number")
+                return 2
+        with stage_profile.stage("load"):
+            store, elect_idx = load_inputs(args.db, [seat_no], Path(args.src))
+        with stage_profile.stage("render", records=1):
+            text = json_io.dumps(seat_document(store, elect_idx, seat_no), pretty=True)
+        print(text)
+        return 0
+
+    return run_batch(seat_nos, out_dir=args.out_dir, ndjson=args.ndjson, jobs=args.jobs, db=args.db, src=Path(args.src))
+
+
 if __name__ == "__main__":
     sys.exit(main(sys.argv))
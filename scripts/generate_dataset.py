@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Generate synthetic multi-state election data in the shapes this repo reads.
+
+Usage:
+    python scripts/generate_dataset.py --out synthetic/ --states 4 --seats 500
+    python scripts/generate_dataset.py --out big/ --states 20 --seats 20000 --years 2010,2015,2020 -j 8
+    python scripts/generate_dataset.py --out s/ --seats 243 --candidates 12 --seed 7 --pretty
+
+Writes one directory per state, each usable as a `root` for SeatStore and
+the scripts (same file names as the real Bihar inputs):
+
+- <year>_results.json        district-keyed {"#", "Name", "Winner", "Runner up", "Margin"};
+                              years >= 2020 use "74,906"-style votes and "%" like the real files
+- current_mla.json           district-keyed {"No.", "Constituency", "Name", "Party", "Alliance", "Remarks"}
+- bihar_constituencies.json  {"1": {"no", "name", "slug", "district", "reserved", "lok_sabha_no", "lok_sabha"}}
+- parties.json               [{"code", "name", "color", "alliances": {"<year>": ...}}]
+- bihar_election_results_consolidated.json / .csv
+                              wide rows: base fields, y<year>_* per year, current_mla_*,
+                              diff_*_vs_<last year>
+
+plus a combined parties.json at the top. Each seat-year has --candidates
+contestants with vote shares proportional to u**2 (u uniform); only the top
+two are materialised, drawn directly as the two largest of k uniforms
+(u1 = U**(1/k), u2 = u1 * U**(1/(k-1))) with the other k-2 counted at
+their expected share, so the cost per seat-year does not grow with
+--candidates. --full-field instead draws every contestant plus NOTA and
+adds them as a "Candidates" list to each year record (see
+candidate_store.py); this is slower and scales with --candidates. Output
+depends only on the parameters and --seed (states are generated in
+parallel with -j, each from its own derived seed). Files are compact JSON unless --pretty.
+"""
+
+import argparse
+import bisect
+import csv
+import itertools
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+NATIONAL = [
+    ("BJP", "Bharatiya Janata Party", "#ff9933", "NDA"),
+    ("INC", "Indian National Congress", "#19aaed", "MGB"),
+    ("BSP", "Bahujan Samaj Party", "#22409a", "OTH"),
+    ("CPI", "Communist Party of India", "#cc0000", "MGB"),
+    ("CPI(M)", "Communist Party of India (Marxist)", "#cc3333", "MGB"),
+    ("IND", "Independent", "#999999", "NA"),
+]
+ALLIANCES = ("NDA", "MGB", "OTH")
+COLORS = ("#006600", "#990000", "#0066cc", "#ff6699", "#9966cc", "#ff9966", "#009933", "#003366", "#cc6600", "#66cccc")
+
+SYL = ("ba", "ka", "ra", "ma", "na", "pa", "sa", "ta", "ga", "ha", "bi", "ki", "ri", "mi", "ni", "pu", "su",
+       "tu", "gu", "hu", "dha", "bha", "sha", "cha", "la", "va", "ja", "de", "ve", "go")
+TAILS = ("pur", "ganj", "nagar", "abad", "garh", "pura", "ur", "ra", "li", "wa", "har", "gaon")
+FIRST = ("Ram", "Shyam", "Sita", "Anil", "Sunil", "Rekha", "Manoj", "Pooja", "Rajesh", "Nitin", "Kiran", "Asha",
+         "Vijay", "Meena", "Ravi", "Suman", "Arun", "Neha", "Deepak", "Kavita", "Sanjay", "Usha", "Alok", "Rita")
+LAST = ("Kumar", "Singh", "Yadav", "Prasad", "Paswan", "Jha", "Mishra", "Sharma", "Devi", "Ahmad", "Mandal",
+        "Rai", "Sahni", "Gupta", "Thakur", "Manjhi", "Chaudhary", "Ansari", "Verma", "Pandey")
+
+
+def place_name(rng: random.Random, used: dict) -> str:
+    name = (rng.choice(SYL) + rng.choice(SYL) + rng.choice(TAILS)).capitalize()
+    # The syllable space is ~10k names; past that, number the repeats
+    n = used.get(name, 0)
+    used[name] = n + 1
+    return f"{name} {n + 1}" if n else name
+
+
+def slugify(s: str) -> str:
+    return "-".join("".join(c if c.isalnum() else " " for c in s.lower()).split())
+
+
+def state_parties(state_idx: int, n_regional: int, years, rng: random.Random):
+    """National parties plus `n_regional` regional ones whose alliance may switch between years."""
+    out = []
+    for code, name, color, alliance in NATIONAL:
+        out.append({"code": code, "name": name, "color": color, "alliances": {str(y): alliance for y in years}})
+    for i in range(n_regional):
+        code = f"R{state_idx + 1:02d}{chr(65 + i)}" if i < 26 else f"R{state_idx + 1:02d}{i}"
+        alliance = rng.choice(ALLIANCES)
+        alliances = {}
+        for y in years:
+            if rng.random() < 0.25:
+                alliance = rng.choice(ALLIANCES)
+            alliances[str(y)] = alliance
+        out.append({"code": code, "name": f"Regional Party {code}", "color": COLORS[(state_idx + i) % len(COLORS)],
+                    "alliances": alliances})
+    return out
+
+
+def fmt_votes(n: int, year: int) -> str:
+    return f"{n:,}" if year >= 2020 else str(n)
+
+
+def generate_state(args):
+    """Write one state's files; returns (state_dir, seats, seat_years)."""
+    state_idx, out_dir, seats, years, candidates, seed, pretty, full_field = args
+    rng = random.Random(seed * 1_000_003 + state_idx)
+    rand = rng.random
+    indent = 2 if pretty else None
+    seps = None if pretty else (",", ":")
+
+    state_dir = Path(out_dir) / f"state-{state_idx + 1:02d}"
+    state_dir.mkdir(parents=True, exist_ok=True)
+
+    parties = state_parties(state_idx, 4 + state_idx % 5, years, rng)
+    codes = [p["code"] for p in parties]
+    alliance_of = {(p["code"], y): p["alliances"][str(y)] for p in parties for y in years}
+    # Skewed party strength: a few large parties, a long tail
+    weights = [1.0 / (i + 1) ** 0.8 for i in range(len(codes))]
+    rng.shuffle(weights)
+    cum = list(itertools.accumulate(weights))
+    cum_total = cum[-1]
+
+    def draw_party():
+        return codes[bisect.bisect(cum, rand() * cum_total)]
+
+    # Constituencies, districts (~6 seats each) and Lok Sabha seats (~6 assembly seats each)
+    used = {}
+    district_names = [place_name(rng, used) for _ in range(max(1, seats // 6))]
+    base = {}
+    for no in range(1, seats + 1):
+        name = place_name(rng, used)
+        r = rand()
+        ls_no = (no - 1) // 6 + 1
+        base[str(no)] = {
+            "no": no,
+            "name": name,
+            "slug": slugify(name),
+            "district": district_names[min(len(district_names) - 1, (no - 1) * len(district_names) // seats)],
+            "reserved": "SC" if r < 0.15 else "ST" if r < 0.165 else None,
+            "lok_sabha_no": ls_no,
+            "lok_sabha": base[str((ls_no - 1) * 6 + 1)]["name"] if (ls_no - 1) * 6 + 1 < no else name,
+        }
+
+    def person():
+        return f"{FIRST[int(rand() * len(FIRST))]} {LAST[int(rand() * len(LAST))]}"
+
+    k = max(2, candidates)
+
+    def full_record(no, name, turnout, y):
+        # Every candidate plus NOTA; shares proportional to u**2 as above
+        field = [(rand() ** 2, person(), draw_party()) for _ in range(k)]
+        field.append((0.02 * rand(), "None of the Above", "NOTA"))
+        scale = turnout / sum(p for p, _n, _c in field)
+        field = sorted(((int(p * scale), n, c) for p, n, c in field), reverse=True)
+        ranked = [f for f in field if f[2] != "NOTA"]
+        (vw, nw, pw), (vr, nr, pr) = ranked[0], ranked[1]
+        rec = {
+            "#": str(no),
+            "Name": name,
+            "Winner": {"Candidate": nw, "Party": pw, "Votes": fmt_votes(vw, y)},
+            "Runner up": {"Candidate": nr, "Party": pr, "Votes": fmt_votes(vr, y)},
+            "Margin": fmt_votes(vw - vr, y),
+            "Candidates": [{"Candidate": n, "Party": c, "Votes": fmt_votes(v, y)} for v, n, c in field],
+        }
+        if y >= 2020:
+            rec["Winner"]["%"] = f"{100 * vw / turnout:.2f}"
+            rec["Runner up"]["%"] = f"{100 * vr / turnout:.2f}"
+        return rec
+
+    results = {}
+    flat = {}
+    inv_k, inv_k1 = 1 / k, 1 / (k - 1)
+    for y in years:
+        by_district = {}
+        rows = []
+        for no in range(1, seats + 1):
+            seat = base[str(no)]
+            turnout = 60_000 + int(rand() * 140_000)
+            if full_field:
+                rec = full_record(no, seat["name"], turnout, y)
+                by_district.setdefault(f"{seat['district']} District", []).append(rec)
+                rows.append(rec)
+                continue
+            # Two largest of k uniforms, then the expected pull of the rest (E[u**2 | u < u2] = u2**2 / 3)
+            u1 = rand() ** inv_k
+            u2 = u1 * rand() ** inv_k1
+            p1, p2 = u1 * u1, u2 * u2
+            scale = turnout / (p1 + p2 + (k - 2) * p2 / 3)
+            vw, vr = int(p1 * scale), int(p2 * scale)
+            pw = draw_party()
+            pr = draw_party()
+            while pr == pw:
+                pr = draw_party()
+            rec = {
+                "#": str(no),
+                "Name": seat["name"],
+                "Winner": {"Candidate": person(), "Party": pw, "Votes": fmt_votes(vw, y)},
+                "Runner up": {"Candidate": person(), "Party": pr, "Votes": fmt_votes(vr, y)},
+                "Margin": fmt_votes(vw - vr, y),
+            }
+            if y >= 2020:
+                rec["Winner"]["%"] = f"{100 * vw / turnout:.2f}"
+                rec["Runner up"]["%"] = f"{100 * vr / turnout:.2f}"
+            by_district.setdefault(f"{seat['district']} District", []).append(rec)
+            rows.append(rec)
+        results[y] = by_district
+        flat[y] = rows
+
+    last = years[-1]
+    mla = {}
+    for no in range(1, seats + 1):
+        seat = base[str(no)]
+        won = flat[last][no - 1]["Winner"]
+        name, party, remarks = won["Candidate"], won["Party"], ""
+        if rand() < 0.03:
+            name, party, remarks = person(), draw_party(), "By-election"
+        mla.setdefault(seat["district"], []).append({
+            "No.": str(no), "Constituency": seat["name"], "Name": name, "Party": party,
+            "Alliance": alliance_of[(party, last)], "Remarks": remarks,
+        })
+
+    def dump(name, obj):
+        (state_dir / name).write_text(json.dumps(obj, ensure_ascii=False, indent=indent, separators=seps), encoding="utf-8")
+
+    dump("bihar_constituencies.json", base)
+    for y in years:
+        dump(f"{y}_results.json", results[y])
+    dump("current_mla.json", mla)
+    dump("parties.json", parties)
+
+    # Consolidated wide rows (same column order as results_long.wide_fields)
+    mla_by_no = {int(m["No."]): m for ms in mla.values() for m in ms}
+    consolidated = []
+    for no in range(1, seats + 1):
+        seat = base[str(no)]
+        row = {
+            "no": str(no), "constituency_name": seat["name"], "slug": seat["slug"], "district": seat["district"],
+            "reserved": seat["reserved"] or "", "lok_sabha_no": str(seat["lok_sabha_no"]), "lok_sabha": seat["lok_sabha"],
+        }
+        for y in years:
+            rec = flat[y][no - 1]
+            w, ru = rec["Winner"], rec["Runner up"]
+            row[f"y{y}_winner_name"] = w["Candidate"]
+            row[f"y{y}_winner_party"] = w["Party"]
+            row[f"y{y}_winner_votes"] = w["Votes"]
+            row[f"y{y}_runner_name"] = ru["Candidate"]
+            row[f"y{y}_runner_party"] = ru["Party"]
+            row[f"y{y}_runner_votes"] = ru["Votes"]
+            row[f"y{y}_margin"] = rec["Margin"]
+        m = mla_by_no[no]
+        row["current_mla_name"] = m["Name"]
+        row["current_mla_party"] = m["Party"]
+        row["current_mla_alliance"] = m["Alliance"]
+        row["current_remarks"] = m["Remarks"]
+        row[f"diff_party_vs_{last}"] = str(m["Party"] != row[f"y{last}_winner_party"])
+        row[f"diff_name_vs_{last}"] = str(m["Name"] != row[f"y{last}_winner_name"])
+        consolidated.append(row)
+
+    (state_dir / "bihar_election_results_consolidated.json").write_text(
+        json.dumps(consolidated, ensure_ascii=False, indent=2 if pretty else None, separators=seps), encoding="utf-8")
+    with (state_dir / "bihar_election_results_consolidated.csv").open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(consolidated[0]) if consolidated else [])
+        writer.writerows(map(dict.values, consolidated))
+    return str(state_dir), seats, seats * len(years), parties
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="generate_dataset.py", description="Generate synthetic election datasets.")
+    parser.add_argument("--out", required=True, help="output directory (one sub-directory per state)")
+    parser.add_argument("--states", type=int, default=1)
+    parser.add_argument("--seats", type=int, default=243, help="seats per state (default: 243)")
+    parser.add_argument("--years", default="2010,2015,2020", help="comma-separated election years")
+    parser.add_argument("--candidates", type=int, default=10, help="candidates per seat-year (default: 10)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--full-field", action="store_true",
+                        help="also write every candidate (plus NOTA) as a \"Candidates\" list per record")
+    parser.add_argument("--pretty", action="store_true", help="indent JSON (slower, larger)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    years = sorted({int(y) for y in args.years.split(",") if y.strip()})
+    if not years or args.seats < 1 or args.states < 1:
+        parser.error("need at least one year, seat and state")
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.perf_counter()
+    jobs = [(i, str(out_dir), args.seats, years, args.candidates, args.seed, args.pretty, args.full_field)
+            for i in range(args.states)]
+    if args.jobs == 1 or args.states == 1:
+        done = list(map(generate_state, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            done = list(pool.map(generate_state, jobs))
+
+    # Combined party list (national parties once, then every state's regional ones)
+    combined = {}
+    for _dir, _seats, _rows, parties in done:
+        for p in parties:
+            combined.setdefault(p["code"], p)
+    (out_dir / "parties.json").write_text(json.dumps(list(combined.values()), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    seat_years = sum(rows for _d, _s, rows, _p in done)
+    elapsed = time.perf_counter() - t0
+    print(f"Generated {args.states} state(s), {sum(s for _d, s, _r, _p in done)} seats, "
+          f"{seat_years} seat-years in {elapsed:.1f}s -> {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
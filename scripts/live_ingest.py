@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""Apply counting-day updates to the y2025_* fields and republish as they arrive.
+
+Usage:
+    python scripts/live_ingest.py --drop incoming/            # watch a directory
+    python scripts/live_ingest.py --listen 127.0.0.1:9099     # NDJSON over TCP
+    python scripts/live_ingest.py --drop incoming/ --deltas   # also write dist/deltas
+
+Updates are JSON objects, one per line (a dropped file may hold many):
+
+    {"no": 57, "status": "leading", "round": 12,
+     "leader":   {"name": "A", "party": "BJP", "votes": 41230},
+     "trailing": {"name": "B", "party": "RJD", "votes": 39876}}
+
+`leader` fills y2025_winner_*, `trailing` y2025_runner_*, and y2025_margin
+is recomputed from the two vote counts; `status` ("leading"/"won") goes to
+y2025_status. Any side or field left out keeps its current value. Party
+codes go through the shared alias table (normalize_parties). An update
+whose `round` is older than the last one applied to that seat is ignored,
+so out-of-order delivery cannot roll a seat back.
+
+The consolidated rows stay in memory. Changed rows are flushed at most
+every --interval seconds: the consolidated JSON is replaced atomically
+(temp file + rename), only the changed seats/NNN.json shards are rewritten,
+results_long.json, the results/ year slices, rollups.json and
+color_tables.json are refreshed when present (older years' slices keep
+their bytes), and with --deltas a new
+snapshot/patch is published (see publish_deltas).
+Files in the drop directory are moved to <drop>/processed/ once applied.
+
+scripts/simulate_counting.py generates a synthetic feed for load testing.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from build_color_tables import build_tables, dumps_tables
+from build_consolidated import seat_key
+from build_rollups import build_rollups, dumps_rollups
+from normalize_parties import normalize_party
+import publish_deltas
+import json_io
+from results_long import LongTable, dumps_table, wide_order, write_slices
+
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_PATH = ROOT / "bihar_election_results_consolidated.json"
+SEATS_DIR = ROOT / "seats"
+LONG_PATH = ROOT / "results_long.json"
+SLICES_DIR = ROOT / "results"
+ROLLUPS_PATH = ROOT / "rollups.json"
+PARTIES_PATH = ROOT / "parties.json"
+COLOR_TABLES_PATH = ROOT / "color_tables.json"
+
+SIDES = (("leader", "winner"), ("trailing", "runner"))
+STATUSES = {"leading", "won"}
+
+
+def fmt_votes(n: int) -> str:
+    return f"{n:,}"
+
+
+def parse_votes(val):
+    s = str(val if val is not None else "").replace(",", "").strip()
+    try:
+        return int(s)
+    except ValueError:
+        return None
+
+
+def atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class LiveResults:
+    """In-memory consolidated rows with per-seat update bookkeeping."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.by_no = {}
+        for row in rows:
+            try:
+                self.by_no[int(str(row.get("no", "")))] = row
+            except ValueError:
+                continue
+        self.rounds = {}
+        self.dirty = set()
+        self.applied = 0
+        self.ignored = 0
+
+    @classmethod
+    def load(cls, path: Path):
+        return cls(publish_deltas.load_rows(path))
+
+    def apply(self, update: dict) -> bool:
+        """Apply one update; returns True if the row changed."""
+        try:
+            no = int(str(update.get("no", "")).strip())
+        except ValueError:
+            no = None
+        row = self.by_no.get(no)
+        if row is None:
+            self.ignored += 1
+            return False
+        rnd = update.get("round")
+        if isinstance(rnd, int):
+            if rnd < self.rounds.get(no, -1):
+                self.ignored += 1
+                return False
+            self.rounds[no] = rnd
+
+        before = dict(row)
+        for src, dst in SIDES:
+            side = update.get(src)
+            if not isinstance(side, dict):
+                continue
+            if side.get("name") is not None:
+                row[f"y2025_{dst}_name"] = str(side["name"]).strip()
+            if side.get("party") is not None:
+                row[f"y2025_{dst}_party"] = normalize_party(str(side["party"]))
+            votes = parse_votes(side.get("votes"))
+            if votes is not None:
+                row[f"y2025_{dst}_votes"] = fmt_votes(votes)
+        status = update.get("status")
+        if status in STATUSES:
+            row["y2025_status"] = status
+
+        w = parse_votes(row.get("y2025_winner_votes"))
+        r = parse_votes(row.get("y2025_runner_votes"))
+        if w is not None and r is not None:
+            row["y2025_margin"] = fmt_votes(abs(w - r))
+
+        self.applied += 1
+        if row == before:
+            return False
+        self.dirty.add(no)
+        return True
+
+    def canonicalize(self):
+        """Lay every row out as build_consolidated writes it (LongTable.to_wide).
+
+        apply() appends new keys such as y2025_status at the end of the one
+        row it touched; the build puts them in wide_order and gives every
+        other row the key as "". Matching that keeps the next build from
+        rewriting unchanged rows. Reshaped rows are marked dirty.
+        """
+        keys = {}
+        for row in self.rows:
+            keys.update(dict.fromkeys(row))
+        order = wide_order(keys)
+        for no, row in self.by_no.items():
+            if list(row) != order:
+                fields = {k: row.get(k, "") for k in order}
+                row.clear()
+                row.update(fields)
+                self.dirty.add(no)
+
+
+class Publisher:
+    def __init__(self, results_path: Path = RESULTS_PATH, seats_dir: Path = SEATS_DIR,
+                 deltas_dir: Path | None = None, keep: int = 10,
+                 long_path: Path = LONG_PATH, slices_dir: Path = SLICES_DIR,
+                 rollups_path: Path = ROLLUPS_PATH, color_tables_path: Path = COLOR_TABLES_PATH):
+        self.results_path = results_path
+        self.seats_dir = seats_dir
+        self.deltas_dir = deltas_dir
+        self.keep = keep
+        self.long_path = long_path
+        self.slices_dir = slices_dir
+        self.rollups_path = rollups_path
+        self.color_tables_path = color_tables_path
+        self._parties = None
+
+    def parties(self) -> list:
+        if self._parties is None:
+            self._parties = json_io.load(PARTIES_PATH) if PARTIES_PATH.exists() else []
+        return self._parties
+
+    def publish(self, live: LiveResults) -> int:
+        """Flush dirty seats; returns how many were published."""
+        if not live.dirty:
+            return 0
+        live.canonicalize()
+        changed = sorted(live.dirty)
+        live.dirty.clear()
+        if self.seats_dir.is_dir():
+            for no in changed:
+                row = live.by_no[no]
+                atomic_write(self.seats_dir / f"{seat_key(no)}.json",
+                             json_io.dumps(row))
+        atomic_write(self.results_path, json_io.dumps(live.rows, pretty=True))
+        if self.color_tables_path.exists():
+            # The table records digests of the rows it was built from, so keep it in step
+            atomic_write(self.color_tables_path, dumps_tables(build_tables(live.rows, self.parties())))
+        if self.long_path.exists() or self.slices_dir.is_dir() or self.rollups_path.exists():
+            # Keep the canonical long table in step; only the live year's slice actually changes
+            table = LongTable.from_wide(live.rows)
+            if self.long_path.exists():
+                atomic_write(self.long_path, dumps_table(table.to_json()))
+            if self.slices_dir.is_dir():
+                write_slices(table, self.slices_dir)
+            if self.rollups_path.exists():
+                atomic_write(self.rollups_path, dumps_rollups(build_rollups(table, self.parties())))
+        if self.deltas_dir is not None:
+            publish_deltas.publish(live.rows, self.deltas_dir, keep=self.keep)
+        return len(changed)
+
+
+def parse_lines(text: str):
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            print(f"Skipping malformed update: {line[:80]}", file=sys.stderr)
+            continue
+        for item in obj if isinstance(obj, list) else [obj]:
+            if isinstance(item, dict):
+                yield item
+
+
+async def watch_drop(drop: Path, queue: asyncio.Queue, poll: float):
+    """Feed updates from files appearing in `drop` (oldest first)."""
+    processed = drop / "processed"
+    processed.mkdir(parents=True, exist_ok=True)
+    while True:
+        files = sorted(
+            (p for p in drop.iterdir() if p.is_file() and p.suffix in (".json", ".ndjson", ".jsonl")),
+            key=lambda p: (p.stat().st_mtime_ns, p.name),
+        )
+        for p in files:
+            received = time.perf_counter()
+            for update in parse_lines(p.read_text(encoding="utf-8-sig")):
+                await queue.put((received, update))
+            os.replace(p, processed / p.name)
+        await asyncio.sleep(poll)
+
+
+async def listen(host: str, port: int, queue: asyncio.Queue):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                received = time.perf_counter()
+                for update in parse_lines(line.decode("utf-8")):
+                    await queue.put((received, update))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def ingest(live: LiveResults, publisher: Publisher, sources, interval: float):
+    queue = asyncio.Queue()
+    tasks = [asyncio.create_task(make(queue)) for make in sources]
+    pending = []  # receive times of updates not yet published
+    latencies = []
+    last_flush = time.perf_counter()
+    try:
+        while True:
+            # Wait at most until the next flush is due, so a quiet feed still publishes pending updates
+            timeout = max(0.0, last_flush + interval - time.perf_counter()) if pending else interval
+            try:
+                received, update = await asyncio.wait_for(queue.get(), timeout=timeout)
+                if live.apply(update):
+                    pending.append(received)
+                # Drain whatever else is queued before flushing
+                while not queue.empty():
+                    received, update = queue.get_nowait()
+                    if live.apply(update):
+                        pending.append(received)
+            except asyncio.TimeoutError:
+                pass
+            if pending and time.perf_counter() - last_flush >= interval:
+                n = publisher.publish(live)
+                last_flush = now = time.perf_counter()
+                latencies.extend(now - t for t in pending)
+                worst = max(now - t for t in pending)
+                print(f"Published {n} seat(s) from {len(pending)} update(s); max latency {worst * 1000:.0f} ms")
+                pending.clear()
+    finally:
+        for t in tasks:
+            t.cancel()
+        if latencies:
+            latencies.sort()
+            p95 = latencies[int(0.95 * (len(latencies) - 1))]
+            print(f"{live.applied} applied, {live.ignored} ignored; "
+                  f"latency p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="live_ingest.py", description="Ingest live y2025 updates and republish.")
+    parser.add_argument("--drop", help="directory to watch for *.json/*.ndjson update files")
+    parser.add_argument("--listen", metavar="HOST:PORT", help="accept NDJSON updates over TCP")
+    parser.add_argument("--results", default=str(RESULTS_PATH), help="consolidated JSON to update in place")
+    parser.add_argument("--seats-dir", default=str(SEATS_DIR), help="seat shard directory (skipped if missing)")
+    parser.add_argument("--deltas", nargs="?", const=str(publish_deltas.OUT_DIR), metavar="DIR",
+                        help="also publish snapshots/deltas (default dir: dist/deltas)")
+    parser.add_argument("--interval", type=float, default=0.25, help="max seconds between flushes (default: 0.25)")
+    parser.add_argument("--poll", type=float, default=0.05, help="drop directory poll interval")
+    args = parser.parse_args(argv)
+
+    if not (args.drop or args.listen):
+        parser.error("give --drop DIR and/or --listen HOST:PORT")
+
+    live = LiveResults.load(Path(args.results))
+    publisher = Publisher(Path(args.results), Path(args.seats_dir), Path(args.deltas) if args.deltas else None)
+    sources = []
+    if args.drop:
+        drop = Path(args.drop)
+        drop.mkdir(parents=True, exist_ok=True)
+        sources.append(lambda q: watch_drop(drop, q, args.poll))
+    if args.listen:
+        host, _, port = args.listen.rpartition(":")
+        sources.append(lambda q: listen(host or "127.0.0.1", int(port), q))
+
+    print(f"Ingesting into {len(live.by_no)} seats (flush every {args.interval}s)", file=sys.stderr)
+    try:
+        asyncio.run(ingest(live, publisher, sources, args.interval))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,11 @@
-import json
 from pathlib import Path
 
+from seat_store import load_json
+import json_io
+
 def main():
     path = Path('bihar_election_results_consolidated.json')
-    data = json.loads(path.read_text(encoding='utf-8-sig'))
+    data = load_json(path)
     changed = 0
     for row in data:
         for key in ("y2025_winner_name", "y2025_runner_name"):
@@ -11,7 +13,7 @@ def main():
             if val is None or (isinstance(val, str) and val.strip() == ""):
                 row[key] = "Dummy"
                 changed += 1
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    json_io.write(path, data, pretty=True)
     print(f"updated_2025_name_fields: {changed}")
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
-import json
 from pathlib import Path
 
+from seat_store import load_json
+import json_io
+
 def main():
     path = Path('bihar_election_results_consolidated.json')
-    data = json.loads(path.read_text(encoding='utf-8-sig'))
+    data = load_json(path)
     changed = 0
     for row in data:
         wv = row.get('y2025_winner_votes')
@@ -14,7 +16,7 @@ def main():
         if rv is None or (isinstance(rv, str) and rv.strip() == ""):
             row['y2025_runner_votes'] = "0"
             changed += 1
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    json_io.write(path, data, pretty=True)
     print(f"updated_2025_vote_fields: {changed}")
 
 if __name__ == "__main__":
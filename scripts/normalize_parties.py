@@ -1,94 +1,202 @@
+"""Normalize party labels in the year result files from one alias table.
+
+Usage:
+    python scripts/normalize_parties.py                    # every *_results.json in archive/
+    python scripts/normalize_parties.py 2025_results.json  # specific files
+    python scripts/normalize_parties.py --strict -j 4      # exit 1 if any code is unknown
+
+`party_aliases.json` maps each canonical code to its spellings seen in the
+sources ({"JD(U)": ["JDU", ...]}). Labels are matched after trimming and
+collapsing whitespace, case-insensitively; codes already listed in
+parties.json map to themselves, so "Ind" and "IND " both become "IND".
+The Winner and Runner up sides and every entry of a seat's full
+"Candidates" list are normalized.
+
+Each `<name>.json` is read once and written once to `<name>.normalized.json`
+(files run in parallel). The report lists the codes before and after and
+any code left that parties.json does not define; add the spelling to
+party_aliases.json (or the party to parties.csv) rather than patching the
+normalized output. --profile records per-stage timings (stage_profile.py).
+"""
+
+import argparse
 import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 
-# Canonical normalization map
-NORMALIZE = {
-    # JD(U)
-    "JDU": "JD(U)",
-    # Independent
-    "Ind": "IND",
-    # CPI(M)
-    "CPM": "CPI(M)",
-    # CPI(ML) → normalize to CPI(M) per request
-    "CPI(ML)": "CPI(M)",
-    "CPI (ML)": "CPI(M)",
-    "CPI(ML)L": "CPI(M)",
-    # HAM(S)
-    "HAM": "HAM(S)",
-}
-
-
-def normalize_party(label: str) -> str:
-    if label is None:
-        return label
-    return NORMALIZE.get(label, label)
-
-
-def normalize_file(path: Path) -> Path:
-    data = json.loads(path.read_text(encoding="utf-8"))
-    # Iterate districts -> list of seats
-    for district, seats in data.items():
-        if not isinstance(seats, list):
-            continue
-        for seat in seats:
-            w = seat.get("Winner", {})
-            r = seat.get("Runner up", {})
-            if isinstance(w, dict) and "Party" in w:
-                w["Party"] = normalize_party(w["Party"])
-            if isinstance(r, dict) and "Party" in r:
-                r["Party"] = normalize_party(r["Party"])
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "archive"  # same as seat_store.SRC
+ALIASES_PATH = ROOT / "party_aliases.json"
+PARTIES_PATH = ROOT / "parties.json"
+SIDES = ("Winner", "Runner up")
 
-    out_path = path.with_name(path.stem + ".normalized.json")
-    out_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    return out_path
-
-
-def collect_parties(path: Path):
-    data = json.loads(path.read_text(encoding="utf-8"))
-    s = set()
-    for district, seats in data.items():
-        if not isinstance(seats, list):
-            continue
-        for seat in seats:
-            w = seat.get("Winner", {})
-            r = seat.get("Runner up", {})
-            if isinstance(w, dict):
-                p = w.get("Party")
-                if p:
-                    s.add(p)
-            if isinstance(r, dict):
-                p = r.get("Party")
-                if p:
-                    s.add(p)
-    return sorted(s)
-
-
-def load_known_codes(parties_json: Path):
+sys.path.insert(0, str(ROOT))
+import json_io  # noqa: E402
+import stage_profile  # noqa: E402
+
+
+def _key(label: str) -> str:
+    return " ".join(label.split()).casefold()
+
+
+def _read_json(path: Path, default):
     try:
-        arr = json.loads(parties_json.read_text(encoding="utf-8"))
-        return {item.get("code") for item in arr if isinstance(item, dict)}
-    except Exception:
-        return set()
-
-
-def main():
-    root = Path(__file__).resolve().parent.parent
-    result_files = [root / f for f in ("2010_results.json", "2015_results.json", "2020_results.json")]
-    known_codes = load_known_codes(root / "parties.json")
-
-    for f in result_files:
-        before = collect_parties(f)
-        out = normalize_file(f)
-        after = collect_parties(out)
-        unknown_after = sorted(set(after) - set(known_codes)) if known_codes else []
-        print(f"=== {f.name} ===")
+        with path.open("r", encoding="utf-8-sig") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def load_known_codes(parties_json: Path = PARTIES_PATH) -> set:
+    arr = _read_json(parties_json, [])
+    return {item.get("code") for item in arr if isinstance(item, dict) and item.get("code")}
+
+
+def build_lookup(aliases: dict, known_codes=()) -> dict:
+    """{ match key -> canonical code } from the alias table plus known codes."""
+    lookup = {}
+
+    def add(label, canonical):
+        k = _key(label)
+        if lookup.get(k, canonical) != canonical:
+            raise ValueError(f"Alias {label!r} maps to both {lookup[k]!r} and {canonical!r}")
+        lookup[k] = canonical
+
+    for code in known_codes:
+        add(code, code)
+    for canonical, spellings in aliases.items():
+        add(canonical, canonical)
+        for label in spellings:
+            add(label, canonical)
+    return lookup
+
+
+class PartyNormalizer:
+    def __init__(self, aliases: dict | None = None, known_codes=None):
+        if aliases is None:
+            aliases = _read_json(ALIASES_PATH, {})
+        if known_codes is None:
+            known_codes = load_known_codes()
+        self.known_codes = set(known_codes)
+        self.lookup = build_lookup(aliases, self.known_codes)
+
+    def __call__(self, label):
+        if not label:
+            return label
+        return self.lookup.get(_key(label), label.strip())
+
+
+_default = None
+
+
+def normalize_party(label):
+    """Canonical code for `label` using party_aliases.json and parties.json."""
+    global _default
+    if _default is None:
+        _default = PartyNormalizer()
+    return _default(label)
+
+
+def party_entries(seat):
+    """The dicts of `seat` that carry a "Party": the two sides, then each of its Candidates."""
+    if not isinstance(seat, dict):
+        return
+    for side in SIDES:
+        yield seat.get(side)
+    candidates = seat.get("Candidates")
+    if isinstance(candidates, list):
+        yield from candidates
+
+
+def normalize_file(path: Path, normalizer: PartyNormalizer):
+    """Rewrite `path` to <stem>.normalized.json; returns (out_path, before, after, changed)."""
+    with stage_profile.stage("parse"):
+        data = _read_json(path, None)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path.name}: expected a district-keyed object")
+    before, after = set(), set()
+    changed = 0
+    with stage_profile.stage("normalize") as st:
+        for seats in data.values():
+            if not isinstance(seats, list):
+                continue
+            st.records = (st.records or 0) + len(seats)
+            for seat in seats:
+                for obj in party_entries(seat):
+                    if not isinstance(obj, dict) or not obj.get("Party"):
+                        continue
+                    label = obj["Party"]
+                    code = normalizer(label)
+                    before.add(label)
+                    after.add(code)
+                    if code != label:
+                        obj["Party"] = code
+                        changed += 1
+
+    out_path = path.with_name(path.stem + ".normalized.json")
+    with stage_profile.stage("serialize"):
+        json_io.write(out_path, data, pretty=True)
+    return out_path, sorted(before), sorted(after), changed
+
+
+def _normalize_worker(args):
+    path, aliases, known_codes = args
+    return normalize_file(path, PartyNormalizer(aliases, known_codes))
+
+
+def default_inputs(root: Path = SRC):
+    return sorted(p for p in root.glob("*_results.json"))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="normalize_parties.py", description="Normalize party codes in year result files.")
+    parser.add_argument("files", nargs="*", help="district-keyed result files (default: *_results.json in archive/)")
+    parser.add_argument("--aliases", default=str(ALIASES_PATH), help="alias table (default: party_aliases.json)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--strict", action="store_true", help="exit 1 if any code is missing from parties.json")
+    stage_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    files = [Path(f) for f in args.files] or default_inputs()
+    if not files:
+        print("No *_results.json files found", file=sys.stderr)
+        return 1
+    stage_profile.start("normalize_parties", args.profile, args.cprofile)
+    with stage_profile.stage("load_aliases"):
+        aliases = _read_json(Path(args.aliases), {})
+        known_codes = load_known_codes()
+        # Validate the table once up front rather than in every worker
+        build_lookup(aliases, known_codes)
+
+    jobs = [(f, aliases, known_codes) for f in files]
+    # Per-file stages (parse/normalize/serialize) are only traced in-process (-j 1)
+    with stage_profile.stage("files", records=len(files)):
+        if args.jobs == 1 or len(files) == 1:
+            results = list(map(_normalize_worker, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                results = list(pool.map(_normalize_worker, jobs))
+
+    unknown = set()
+    for f, (out, before, after, changed) in zip(files, results):
+        print(f"=== {f.name} -> {out.name} ({changed} labels rewritten) ===")
         print("Before:", ", ".join(before))
         print("After: ", ", ".join(after))
         if known_codes:
-            print("Not in parties.json:", ", ".join(unknown_after) if unknown_after else "(all mapped)")
+            missing = sorted(set(after) - known_codes)
+            unknown.update(missing)
+            print("Not in parties.json:", ", ".join(missing) if missing else "(all mapped)")
         print()
 
+    stage_profile.finish()
+    if unknown:
+        print(f"Unmapped codes: {', '.join(sorted(unknown))}", file=sys.stderr)
+        if args.strict:
+            return 1
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
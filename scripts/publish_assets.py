@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Publish minified, precompressed, content-hashed copies of the site data.
+
+Usage: python scripts/publish_assets.py [--out dist] [--prune] [file ...]
+
+For each input (default: parties.json, bihar_election_results_consolidated.json,
+bihar_ac_all.geojson, color_tables.json) this writes into the output directory:
+
+- <stem>.<hash>.<ext>       minified JSON (hash = first 10 hex of its sha256)
+- <stem>.<hash>.<ext>.gz    gzip -9 variant
+- <stem>.<hash>.<ext>.br    brotli variant (only if the `brotli` package is installed)
+
+plus `manifest.json` mapping each logical name to its hashed file:
+
+    {"version": "…", "files": {"parties.json": {"path": "parties.1a2b3c4d5e.json", ...}}}
+
+Hashed files never change, so they can be served with
+`Cache-Control: public, max-age=31536000, immutable`; only manifest.json
+needs a short TTL. Files already present are not rewritten, and the script
+lists which ones are new (i.e. need uploading). --prune deletes hashed files
+that the new manifest no longer references.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+try:
+    import brotli  # optional
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import json_io  # noqa: E402
+
+DEFAULT_ASSETS = (
+    "parties.json",
+    "bihar_election_results_consolidated.json",
+    "bihar_ac_all.geojson",
+    "color_tables.json",
+)
+HASH_LEN = 10
+
+
+def minify(path: Path) -> bytes:
+    return json_io.dumps_bytes(json_io.load(path))
+
+
+def content_digest(obj) -> str:
+    """sha256 of `obj` minified, i.e. the manifest "sha256" of a file holding it."""
+    return hashlib.sha256(json_io.dumps_bytes(obj)).hexdigest()
+
+
+def hashed_name(name: str, digest: str) -> str:
+    p = Path(name)
+    return f"{p.stem}.{digest[:HASH_LEN]}{p.suffix}"
+
+
+def _write_new(path: Path, make_bytes, new_files: list) -> None:
+    # Content-addressed: an existing file already holds these bytes
+    if path.exists():
+        return
+    path.write_bytes(make_bytes())
+    new_files.append(path.name)
+
+
+def publish(names, out_dir: Path, src_dir: Path = ROOT):
+    """Write hashed variants for `names` and return (manifest, new_file_names)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = {}
+    new_files = []
+    for name in names:
+        src = src_dir / name
+        if not src.exists():
+            print(f"Skipping {name}: file not found", file=sys.stderr)
+            continue
+        body = minify(src)
+        digest = hashlib.sha256(body).hexdigest()
+        target = hashed_name(name, digest)
+        entry = {"path": target, "sha256": digest, "bytes": len(body)}
+
+        _write_new(out_dir / target, lambda: body, new_files)
+
+        gz = out_dir / (target + ".gz")
+        _write_new(gz, lambda: gzip.compress(body, compresslevel=9, mtime=0), new_files)
+        entry["gzip"] = gz.stat().st_size
+
+        if brotli is not None:
+            br = out_dir / (target + ".br")
+            _write_new(br, lambda: brotli.compress(body, quality=11), new_files)
+            entry["br"] = br.stat().st_size
+
+        files[name] = entry
+
+    version = hashlib.sha256(
+        json.dumps({k: v["sha256"] for k, v in files.items()}, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:HASH_LEN]
+    manifest = {"version": version, "files": files}
+    manifest_text = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    manifest_path = out_dir / "manifest.json"
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != manifest_text:
+        manifest_path.write_text(manifest_text, encoding="utf-8")
+        new_files.append(manifest_path.name)
+    return manifest, new_files
+
+
+def prune(out_dir: Path, manifest: dict) -> list:
+    """Delete hashed artifacts not referenced by `manifest`; returns removed names."""
+    keep = set()
+    for entry in manifest["files"].values():
+        keep.update({entry["path"], entry["path"] + ".gz", entry["path"] + ".br"})
+    pattern = re.compile(rf"\.[0-9a-f]{{{HASH_LEN}}}\.[a-z]+(\.gz|\.br)?$")
+    removed = []
+    for p in out_dir.iterdir():
+        if p.is_file() and pattern.search(p.name) and p.name not in keep:
+            p.unlink()
+            removed.append(p.name)
+    return removed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="publish_assets.py", description="Write hashed, precompressed data assets.")
+    parser.add_argument("files", nargs="*", help="inputs relative to the repo root (default: site data files)")
+    parser.add_argument("--out", default=str(ROOT / "dist"), help="output directory (default: dist/)")
+    parser.add_argument("--prune", action="store_true", help="remove hashed files no longer in the manifest")
+    args = parser.parse_args(argv)
+
+    out_dir = Path(args.out)
+    manifest, new_files = publish(args.files or DEFAULT_ASSETS, out_dir)
+    for name, entry in manifest["files"].items():
+        sizes = f"{entry['bytes']} B, gzip {entry['gzip']} B" + (f", br {entry['br']} B" if "br" in entry else "")
+        print(f"{name} -> {entry['path']} ({sizes})")
+    if brotli is None:
+        print("brotli not installed; skipped .br variants", file=sys.stderr)
+    print(f"Manifest version {manifest['version']}; {len(new_files)} new file(s) to upload")
+    for name in new_files:
+        print(f"  {name}")
+    if args.prune:
+        for name in prune(out_dir, manifest):
+            print(f"Pruned {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Publish versioned snapshots of the consolidated results plus JSON-patch deltas.
+
+Usage: python scripts/publish_deltas.py [--src bihar_election_results_consolidated.json]
+                                        [--out dist/deltas] [--keep 10]
+
+Each run that finds new content bumps the version M and writes into the
+output directory:
+
+- snapshot.<M>.json    the full consolidated rows (compact)
+- delta.<N>-<M>.json   an RFC 6902 patch from every retained version N to M:
+                       {"from": N, "to": M, "ops": [{"op": "replace",
+                        "path": "/56/y2025_winner_votes", "value": "74906"}, ...]}
+- latest.json          the version pointer (tiny, short TTL):
+                       {"version": M, "sha256": "...", "rows": 243,
+                        "snapshot": "snapshot.M.json",
+                        "deltas": {"N": "delta.N-M.json", ...}}
+
+A client holding version N polls latest.json; if N == version it is done,
+if deltas has N it fetches that one patch and applies it, otherwise it
+loads the snapshot. Ops address rows by array index, so deltas are only
+written when N and M have the same seats in the same order (the normal
+case: field updates on counting day); otherwise clients fall back to the
+snapshot. Snapshots and deltas older than the last --keep versions are
+removed. Running again with unchanged input writes nothing.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import json_io  # noqa: E402
+
+SRC_PATH = ROOT / "bihar_election_results_consolidated.json"
+OUT_DIR = ROOT / "dist" / "deltas"
+POINTER = "latest.json"
+
+_SNAPSHOT = re.compile(r"^snapshot\.(\d+)\.json$")
+_DELTA = re.compile(r"^delta\.(\d+)-(\d+)\.json$")
+
+
+def _compact(obj) -> str:
+    return json_io.dumps(obj)
+
+
+def _escape(token: str) -> str:
+    # RFC 6901 pointer escaping
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def seat_order(rows) -> list:
+    return [str(r.get("no", "")) for r in rows]
+
+
+def diff_rows(old, new):
+    """RFC 6902 ops turning `old` into `new`, or None if the seat lists differ."""
+    if seat_order(old) != seat_order(new):
+        return None
+    ops = []
+    for i, (a, b) in enumerate(zip(old, new)):
+        if a == b:
+            continue
+        # Iterate the dicts, not a key set, so the same rows always give the same patch bytes
+        for key in a:
+            if key not in b:
+                ops.append({"op": "remove", "path": f"/{i}/{_escape(key)}"})
+        for key, value in b.items():
+            if key not in a:
+                ops.append({"op": "add", "path": f"/{i}/{_escape(key)}", "value": value})
+            elif a[key] != value:
+                ops.append({"op": "replace", "path": f"/{i}/{_escape(key)}", "value": value})
+    return ops
+
+
+def apply_patch(rows, ops):
+    """Apply the row/field ops produced by diff_rows (in place); returns rows."""
+    for op in ops:
+        index, key = op["path"].lstrip("/").split("/", 1)
+        row = rows[int(index)]
+        key = _unescape(key)
+        if op["op"] == "remove":
+            del row[key]
+        elif op["op"] in ("add", "replace"):
+            row[key] = op["value"]
+        else:
+            raise ValueError(f"Unsupported op: {op['op']}")
+    return rows
+
+
+def load_rows(path: Path):
+    rows = json_io.load(path)
+    if not isinstance(rows, list):
+        raise ValueError(f"{path.name}: expected a JSON array of rows")
+    return rows
+
+
+def load_pointer(out_dir: Path):
+    try:
+        return json.loads((out_dir / POINTER).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def retained_versions(out_dir: Path) -> list:
+    out = []
+    for p in out_dir.glob("snapshot.*.json"):
+        m = _SNAPSHOT.match(p.name)
+        if m:
+            out.append(int(m.group(1)))
+    return sorted(out)
+
+
+def publish(rows, out_dir: Path, keep: int = 10):
+    """Write snapshot/deltas/pointer for `rows`; returns (pointer, written_names)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    body = _compact(rows)
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    pointer = load_pointer(out_dir)
+    if pointer and pointer.get("sha256") == digest:
+        return pointer, []
+
+    version = (pointer or {}).get("version", 0) + 1
+    written = []
+    snapshot_name = f"snapshot.{version}.json"
+    (out_dir / snapshot_name).write_text(body, encoding="utf-8")
+    written.append(snapshot_name)
+
+    previous = [v for v in retained_versions(out_dir) if v < version][-keep:] if keep > 0 else []
+    deltas = {}
+    for n in previous:
+        ops = diff_rows(load_rows(out_dir / f"snapshot.{n}.json"), rows)
+        if ops is None:
+            continue
+        name = f"delta.{n}-{version}.json"
+        (out_dir / name).write_text(_compact({"from": n, "to": version, "ops": ops}), encoding="utf-8")
+        deltas[str(n)] = name
+        written.append(name)
+
+    pointer = {
+        "version": version,
+        "sha256": digest,
+        "rows": len(rows),
+        "snapshot": snapshot_name,
+        "deltas": deltas,
+    }
+    # Pointer last, so a client never sees a version whose files are not there yet
+    tmp = out_dir / (POINTER + ".tmp")
+    tmp.write_text(json.dumps(pointer, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(out_dir / POINTER)
+    written.append(POINTER)
+
+    prune(out_dir, keep_versions=set(previous) | {version}, target=version)
+    return pointer, written
+
+
+def prune(out_dir: Path, keep_versions: set, target: int) -> list:
+    """Drop snapshots outside keep_versions and deltas not ending at target."""
+    removed = []
+    for p in out_dir.iterdir():
+        m = _SNAPSHOT.match(p.name)
+        if m and int(m.group(1)) not in keep_versions:
+            p.unlink()
+            removed.append(p.name)
+            continue
+        m = _DELTA.match(p.name)
+        if m and int(m.group(2)) != target:
+            p.unlink()
+            removed.append(p.name)
+    return removed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="publish_deltas.py", description="Publish consolidated snapshots with JSON-patch deltas.")
+    parser.add_argument("--src", default=str(SRC_PATH), help="consolidated results JSON")
+    parser.add_argument("--out", default=str(OUT_DIR), help="output directory (default: dist/deltas)")
+    parser.add_argument("--keep", type=int, default=10, help="previous versions to keep deltas from (default: 10)")
+    args = parser.parse_args(argv)
+
+    out_dir = Path(args.out)
+    rows = load_rows(Path(args.src))
+    pointer, written = publish(rows, out_dir, keep=args.keep)
+    if not written:
+        print(f"Unchanged; latest is version {pointer['version']}")
+        return 0
+    snapshot_bytes = (out_dir / pointer["snapshot"]).stat().st_size
+    print(f"Published version {pointer['version']} ({pointer['rows']} rows, snapshot {snapshot_bytes} B)")
+    for n, name in sorted(pointer["deltas"].items(), key=lambda kv: int(kv[0])):
+        print(f"  {n} -> {pointer['version']}: {name} ({(out_dir / name).stat().st_size} B)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""SQLite copy of the seat-level inputs, and SeatStores loaded from it.
+
+Usage:
+    python scripts/seat_db.py import --src archive           # -> bihar.db
+    python scripts/seat_db.py query "SELECT party_norm, COUNT(*) FROM candidates
+                                     WHERE year = 2020 AND role = 'W' GROUP BY 1 ORDER BY 2 DESC"
+    python scripts/seat_db.py export --out rebuilt/ [--csv]  # inputs back as JSON (and parties.csv)
+
+    python scripts/build_consolidated.py --db bihar.db
+    python scripts/constituency_info.py --db bihar.db 57
+
+`import` reads the same files as SeatStore.load (the year results, raw and
+*.normalized.json, bihar_constituencies.json, current_mla.json,
+parties.json) once and writes one indexed database:
+
+    seats(no PK, name, slug, district, reserved, lok_sabha_no, lok_sabha)
+    elections(year, seat_no, name, district, margin, margin_votes, full_field)   PK (year, seat_no)
+    candidates(year, seat_no, role, pos, name, party, party_norm, votes, votes_int, pct)
+        role 'W' winner / 'R' runner-up / 'F' one entry of the full field; PK (year, seat_no, role, pos)
+    parties(code PK, pos, name, color, extra)      party_alliances(code, year, alliance)
+    mlas(seat_no PK, constituency, district, name, party, alliance, remarks)
+    meta(key PK, value)                             source file hashes, years, import time
+
+Values keep their published form (votes "66,860", margins, "%") next to
+integer columns for querying. `party` is the label as published and
+`party_norm` the one from the year's .normalized.json (normalize_party()
+when that file is missing). Indexes cover slug, district, Lok Sabha seat,
+party per year and candidate name.
+
+load_store() rebuilds a SeatStore through primary-key lookups, so the
+pipeline scripts run unchanged on top of it; passing `seats` loads just
+those seats (constant-time per seat, e.g. constituency_info for one
+seat). Stores from the database list seats in seat-number order.
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from normalize_parties import normalize_party
+from seat_store import ROOT, SRC, YEARS, SeatStore, parties_path, sanitize_int
+import json_io
+import json_to_csv
+
+
+DB_PATH = ROOT / "bihar.db"
+SCHEMA_VERSION = 1
+
+# Columns without a declared type keep whatever JSON gave them (str, int, float or NULL)
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE seats (
+    no INTEGER PRIMARY KEY, name TEXT, slug TEXT, district TEXT,
+    reserved, lok_sabha_no, lok_sabha TEXT
+);
+CREATE INDEX seats_slug ON seats (slug);
+CREATE INDEX seats_district ON seats (district COLLATE NOCASE);
+CREATE INDEX seats_lok_sabha ON seats (lok_sabha_no);
+CREATE TABLE elections (
+    year INTEGER, seat_no INTEGER, name TEXT, district TEXT,
+    margin TEXT, margin_votes INTEGER, full_field INTEGER,
+    PRIMARY KEY (year, seat_no)
+) WITHOUT ROWID;
+CREATE TABLE candidates (
+    year INTEGER, seat_no INTEGER, role TEXT, pos INTEGER,
+    name TEXT, party TEXT, party_norm TEXT, votes TEXT, votes_int INTEGER, pct,
+    PRIMARY KEY (year, seat_no, role, pos)
+) WITHOUT ROWID;
+CREATE INDEX candidates_party ON candidates (party_norm, year, role);
+CREATE INDEX candidates_name ON candidates (name);
+CREATE TABLE parties (code TEXT PRIMARY KEY, pos INTEGER, name TEXT, color TEXT, extra TEXT);
+CREATE TABLE party_alliances (
+    code TEXT, year INTEGER, alliance TEXT,
+    PRIMARY KEY (code, year)
+) WITHOUT ROWID;
+CREATE INDEX party_alliances_year ON party_alliances (year, alliance);
+CREATE TABLE mlas (
+    seat_no INTEGER PRIMARY KEY, constituency TEXT, district TEXT,
+    name TEXT, party TEXT, alliance TEXT, remarks TEXT
+);
+"""
+
+PARTY_KEYS = ("code", "name", "color", "alliances")
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _candidate_rows(year, no, role, cands, norm_cands):
+    for pos, c in enumerate(cands):
+        norm = norm_cands[pos].party if norm_cands and pos < len(norm_cands) else normalize_party(c.party)
+        yield (year, no, role, pos, c.name, c.party, norm, c.votes, sanitize_int(c.votes), c.pct)
+
+
+def import_stores(conn: sqlite3.Connection, raw: SeatStore, norm: SeatStore | None = None) -> dict:
+    """Write `raw` (party labels as published) into an empty database; returns row counts.
+
+    `norm` is the same inputs loaded with normalized=True; its year results
+    supply `party_norm`.
+    """
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO seats VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(s.no, s.name, s.slug, s.district, s.reserved, s.lok_sabha_no, s.lok_sabha) for s in raw],
+    )
+    elections, candidates = [], []
+    for year in raw.years:
+        for res in raw.iter_results(year):
+            n = norm.result(year, res.no) if norm else None
+            elections.append((year, res.no, res.name, res.district, res.margin, res.margin_int,
+                              int(res.candidates is not None)))
+            candidates.extend(_candidate_rows(year, res.no, "W", [res.winner], n and [n.winner]))
+            candidates.extend(_candidate_rows(year, res.no, "R", [res.runner_up], n and [n.runner_up]))
+            if res.candidates is not None:
+                candidates.extend(_candidate_rows(year, res.no, "F", res.candidates, n and n.candidates))
+    conn.executemany("INSERT INTO elections VALUES (?, ?, ?, ?, ?, ?, ?)", elections)
+    conn.executemany("INSERT INTO candidates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", candidates)
+
+    alliances = []
+    for pos, (code, p) in enumerate(raw.parties.items()):
+        extra = {k: v for k, v in p.items() if k not in PARTY_KEYS}
+        conn.execute(
+            "INSERT INTO parties VALUES (?, ?, ?, ?, ?)",
+            (code, pos, p.get("name"), p.get("color"), json.dumps(extra, ensure_ascii=False) if extra else None),
+        )
+        for year, alliance in (p.get("alliances") or {}).items():
+            alliances.append((code, int(year), alliance))
+    conn.executemany("INSERT INTO party_alliances VALUES (?, ?, ?)", alliances)
+
+    conn.executemany(
+        "INSERT INTO mlas VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(m.no, m.constituency, m.district, m.name, m.party, m.alliance, m.remarks) for m in raw.iter_mlas()],
+    )
+    return {
+        "seats": len(raw),
+        "elections": len(elections),
+        "candidates": len(candidates),
+        "parties": len(raw.parties),
+        "party_alliances": len(alliances),
+        "mlas": sum(1 for _ in raw.iter_mlas()),
+    }
+
+
+def build(db_path: Path, src: Path = SRC, years=YEARS) -> dict:
+    """(Re)create `db_path` from the input files under `src`; returns row counts."""
+    raw = SeatStore.load(src, years=years)
+    norm = SeatStore.load(src, years=years, normalized=True)
+    sources = [p for p in sorted(src.glob("*.json")) if p.name.endswith(("_results.json", "_results.normalized.json"))
+               or p.name in ("bihar_constituencies.json", "current_mla.json")]
+    if parties_path(src).exists():
+        sources.append(parties_path(src))
+
+    # Build next to the target and swap in, so readers never see a half-written file
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp)
+    try:
+        with conn:
+            counts = import_stores(conn, raw, norm)
+            meta = {
+                "schema_version": str(SCHEMA_VERSION),
+                "years": json.dumps(raw.years),
+                "imported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "sources": json.dumps({p.name: _sha256(p) for p in sources}),
+            }
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    tmp.replace(db_path)
+    return counts
+
+
+def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    """Read-only connection to an imported database."""
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"{db_path} not found; run `python scripts/seat_db.py import` first")
+    return sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True)
+
+
+def _in_clause(col: str, values) -> tuple:
+    if values is None:
+        return "", ()
+    values = list(values)
+    return f" AND {col} IN ({','.join('?' * len(values))})", tuple(values)
+
+
+def _candidate(row) -> dict:
+    name, party, votes, pct = row
+    out = {"Candidate": name, "Party": party, "Votes": votes}
+    if pct is not None:
+        out["%"] = pct
+    return out
+
+
+def load_store(db_path: Path = DB_PATH, years=None, normalized: bool = False, seats=None) -> SeatStore:
+    """SeatStore from the database; `seats` (numbers) restricts it to those seats."""
+    conn = connect(db_path)
+    try:
+        return _load_store(conn, years, normalized, seats)
+    finally:
+        conn.close()
+
+
+def _load_store(conn, years, normalized, seats) -> SeatStore:
+    store = SeatStore()
+    seat_filter, seat_args = _in_clause("no", seats)
+    rows = conn.execute(
+        "SELECT no, name, slug, district, reserved, lok_sabha_no, lok_sabha FROM seats WHERE 1=1"
+        + seat_filter + " ORDER BY no", seat_args)
+    store.add_constituencies({
+        str(r[0]): dict(zip(("no", "name", "slug", "district", "reserved", "lok_sabha_no", "lok_sabha"), r))
+        for r in rows
+    })
+
+    available = json.loads(conn.execute("SELECT value FROM meta WHERE key = 'years'").fetchone()[0])
+    party_col = "party_norm" if normalized else "party"
+    for year in [y for y in (years or available) if y in available]:
+        seat_filter, seat_args = _in_clause("seat_no", seats)
+        cands = {}
+        for no, role, name, party, votes, pct in conn.execute(
+                f"SELECT seat_no, role, name, {party_col}, votes, pct FROM candidates WHERE year = ?"
+                + seat_filter + " ORDER BY seat_no, role, pos", (year,) + seat_args):
+            cands.setdefault((no, role), []).append(_candidate((name, party, votes, pct)))
+        by_district = {}
+        for no, name, district, margin, full_field in conn.execute(
+                "SELECT seat_no, name, district, margin, full_field FROM elections WHERE year = ?"
+                + seat_filter + " ORDER BY seat_no", (year,) + seat_args):
+            rec = {
+                "#": str(no),
+                "Name": name,
+                "Winner": (cands.get((no, "W")) or [{}])[0],
+                "Runner up": (cands.get((no, "R")) or [{}])[0],
+                "Margin": margin,
+            }
+            if full_field:
+                rec["Candidates"] = cands.get((no, "F"), [])
+            by_district.setdefault(district, []).append(rec)
+        store.add_year_results(year, by_district)
+
+    seat_filter, seat_args = _in_clause("seat_no", seats)
+    mlas = {}
+    for no, constituency, district, name, party, alliance, remarks in conn.execute(
+            "SELECT seat_no, constituency, district, name, party, alliance, remarks FROM mlas WHERE 1=1"
+            + seat_filter + " ORDER BY seat_no", seat_args):
+        mlas.setdefault(district, []).append({
+            "No.": str(no), "Constituency": constituency, "Name": name,
+            "Party": party, "Alliance": alliance, "Remarks": remarks,
+        })
+    store.add_current_mla(mlas)
+    store.add_parties(load_parties(conn))
+    return store
+
+
+def load_parties(conn) -> list:
+    """parties.json entries (same key order) from the parties tables."""
+    alliances = {}
+    for code, year, alliance in conn.execute("SELECT code, year, alliance FROM party_alliances ORDER BY code, year"):
+        alliances.setdefault(code, {})[str(year)] = alliance
+    out = []
+    for code, name, color, extra in conn.execute("SELECT code, name, color, extra FROM parties ORDER BY pos"):
+        p = {"code": code, "name": name, "color": color}
+        if code in alliances:
+            p["alliances"] = alliances[code]
+        if extra:
+            p.update(json.loads(extra))
+        out.append(p)
+    return out
+
+
+def export(db_path: Path, out_dir: Path, csv_too: bool = False) -> list:
+    """Write the input files back out of the database; returns the paths written."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+
+    def write(name, obj):
+        path = out_dir / name
+        json_io.write(path, obj, pretty=True, newline=True)
+        written.append(path)
+
+    raw = load_store(db_path)
+    norm = load_store(db_path, normalized=True)
+    write("bihar_constituencies.json", {str(s.no): s.to_dict() for s in raw if s.slug or s.name or s.district})
+    for year in raw.years:
+        for store, suffix in ((raw, "_results.json"), (norm, "_results.normalized.json")):
+            by_district = {}
+            for res in store.iter_results(year):
+                by_district.setdefault(res.district, []).append(res.to_dict())
+            write(f"{year}{suffix}", by_district)
+    mlas = {}
+    for m in raw.iter_mlas():
+        mlas.setdefault(m.district, []).append(m.to_dict())
+    write("current_mla.json", mlas)
+    parties = list(raw.parties.values())
+    write("parties.json", parties)
+    if csv_too:
+        json_to_csv.write_csv(parties, out_dir / "parties.csv")
+        written.append(out_dir / "parties.csv")
+    return written
+
+
+def run_query(db_path: Path, sql: str, params=()) -> int:
+    conn = connect(db_path)
+    try:
+        cur = conn.execute(sql, params)
+        cols = [d[0] for d in cur.description or ()]
+        if cols:
+            print("\t".join(cols))
+        for row in cur:
+            print("\t".join("" if v is None else str(v) for v in row))
+    finally:
+        conn.close()
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="seat_db.py", description="SQLite store of the seat-level inputs.")
+    parser.add_argument("--db", default=str(DB_PATH), help=f"database path (default: {DB_PATH.name})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_import = sub.add_parser("import", help="(re)build the database from the JSON inputs")
+    p_import.add_argument("--src", default=str(SRC), help="directory holding the inputs (default: archive/)")
+    p_import.add_argument("--years", default=",".join(map(str, YEARS)), help="comma-separated years")
+    p_query = sub.add_parser("query", help="run one SQL statement and print tab-separated rows")
+    p_query.add_argument("sql")
+    p_query.add_argument("params", nargs="*", help="values for ? placeholders")
+    p_export = sub.add_parser("export", help="write the inputs back out as JSON")
+    p_export.add_argument("--out", required=True, help="output directory")
+    p_export.add_argument("--csv", action="store_true", help="also write parties.csv")
+    args = parser.parse_args(argv)
+    db_path = Path(args.db)
+
+    try:
+        if args.cmd == "import":
+            years = [int(y) for y in args.years.split(",") if y.strip()]
+            counts = build(db_path, Path(args.src), years)
+            print(f"Wrote {db_path}: " + ", ".join(f"{v} {k}" for k, v in counts.items()))
+            return 0
+        if args.cmd == "query":
+            return run_query(db_path, args.sql, args.params)
+        for path in export(db_path, Path(args.out), args.csv):
+            print(f"Wrote {path}")
+        return 0
+    except (FileNotFoundError, sqlite3.Error) as exc:
+        print(f"{parser.prog}: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Filter and count seats with bitmap indexes over the consolidated results.
+
+Usage:
+    python scripts/seat_query.py reserved=SC ls=3 alliance:2015=NDA 'alliance:2020!=NDA'
+    python scripts/seat_query.py party:2020=BJP,JD(U) --by district
+    python scripts/seat_query.py --src synthetic/ alliance:2020=NDA --by state --json
+    python scripts/seat_query.py --by party:2015              # value counts over all seats
+
+Each seat gets one bit; every (dimension, value) pair is a bitmap (a
+Python int) of the seats that have it:
+
+    state            source directory (several states under --src)
+    district, reserved (SC / ST / GEN), ls (Lok Sabha number)
+    party:<year>     winning party          runner:<year>   runner-up party
+    alliance:<year>  winner's alliance (parties.json, same fallbacks as analytics.py)
+    party:current, alliance:current   the current MLA
+
+A filter is a list of terms that must all hold. `dim=a,b` is the OR of the
+value bitmaps, `dim!=a,b` is its complement within the seats where the
+dimension is known (for per-year dimensions: seats with a result that
+year), so `alliance:2020!=NDA` does not match seats without a 2020 result.
+Values match case-insensitively.
+
+The input is bihar_election_results_consolidated.json (or results_long.json)
+plus the parties.json next to it; a directory of per-state outputs (e.g.
+from generate_dataset.py) is read as one index with a `state` dimension.
+The built index and its unfiltered per-value counts are cached in
+.build_cache/seat_query/, keyed by the inputs' size and mtime, so later
+runs skip parsing; group-by counts over a filter are popcounts of
+`filter & bitmap` and are memoized per run. Timings go to stderr.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from analytics import meta_alliance
+from seat_store import ROOT, load_json
+import json_io
+from results_long import LongTable
+
+CACHE_DIR = ROOT / ".build_cache" / "seat_query"
+CONSOLIDATED = "bihar_election_results_consolidated.json"
+CACHE_VERSION = 1
+
+ALIASES = {"lok_sabha_no": "ls", "lok_sabha": "ls"}
+_TERM = re.compile(r"^([A-Za-z_]+(?::\w+)?)\s*(!=|=)\s*(.*)$")
+
+
+class QueryError(ValueError):
+    pass
+
+
+def find_sources(src: Path) -> list:
+    """[(label, table_path, parties_path)] under `src` (a file, a state dir, or a dir of state dirs)."""
+    if src.is_file():
+        return [(src.parent.name, src, src.parent / "parties.json")]
+    if (src / CONSOLIDATED).exists():
+        return [(src.name, src / CONSOLIDATED, src / "parties.json")]
+    out = []
+    for d in sorted(p for p in src.iterdir() if p.is_dir()):
+        if (d / CONSOLIDATED).exists():
+            parties = d / "parties.json" if (d / "parties.json").exists() else src / "parties.json"
+            out.append((d.name, d / CONSOLIDATED, parties))
+    return out
+
+
+def load_table(path: Path) -> LongTable:
+    obj = load_json(path)
+    if isinstance(obj, dict) and obj.get("format"):
+        return LongTable.from_json(obj)
+    return LongTable.from_wide(obj)
+
+
+def _to_bitmap(indices: list) -> int:
+    buf = bytearray((indices[-1] >> 3) + 1)
+    for i in indices:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _iter_bits(mask: int):
+    data = mask.to_bytes((mask.bit_length() + 7) >> 3, "little")
+    for byte_no, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield (byte_no << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+class SeatIndex:
+    """Per-seat labels plus one bitmap per (dimension, value)."""
+
+    def __init__(self, seats: list, bitmaps: dict, universes: dict, counts: dict | None = None):
+        self.seats = seats  # [state, no, name, district] per bit
+        self.bitmaps = bitmaps  # dim -> value -> int
+        self.universes = universes  # dim -> seats where dim is known
+        self.counts = counts if counts is not None else {
+            dim: {v: bm.bit_count() for v, bm in values.items()} for dim, values in bitmaps.items()
+        }
+        self._folded = {dim: {v.casefold(): v for v in values} for dim, values in bitmaps.items()}
+        self._groups = {}
+
+    def __len__(self):
+        return len(self.seats)
+
+    @property
+    def all(self) -> int:
+        return (1 << len(self.seats)) - 1
+
+    # --- construction -------------------------------------------------
+
+    @classmethod
+    def build(cls, sources: list) -> "SeatIndex":
+        seats = []
+        postings = {}  # dim -> value -> [seat index]
+        known = {}  # dim -> [seat index]
+
+        def add(dim, value, i):
+            if value:
+                postings.setdefault(dim, {}).setdefault(value, []).append(i)
+
+        for label, table_path, parties_path in sources:
+            table = load_table(table_path)
+            parties = {p.get("code"): p for p in (load_json(parties_path) if parties_path.exists() else [])
+                       if isinstance(p, dict)}
+            col = {f: k for k, f in enumerate(table.seat_fields)}
+            slot = {}
+            for s in table.seats:
+                i = len(seats)
+                slot[s[0]] = i
+                seats.append([label, s[0], s[col["constituency_name"]], s[col["district"]]])
+                add("state", label, i)
+                add("district", s[col["district"]], i)
+                add("reserved", s[col["reserved"]] or "GEN", i)
+                add("ls", str(s[col["lok_sabha_no"]]), i)
+                add("party:current", s[col["current_mla_party"]], i)
+                add("alliance:current", s[col["current_mla_alliance"]], i)
+                if s[col["current_mla_party"]]:
+                    known.setdefault("current", []).append(i)
+            for year in table.years:
+                for no, _y, rank, _name, party, *_rest in table.year_rows(year):
+                    i = slot.get(no)
+                    if i is None or not party:
+                        continue
+                    if rank == 1:
+                        add(f"party:{year}", party, i)
+                        add(f"alliance:{year}", meta_alliance(parties.get(party) or {}, year), i)
+                        known.setdefault(str(year), []).append(i)
+                    elif rank == 2:
+                        add(f"runner:{year}", party, i)
+
+        bitmaps = {dim: {v: _to_bitmap(idx) for v, idx in sorted(values.items())}
+                   for dim, values in postings.items()}
+        full = (1 << len(seats)) - 1
+        universes = {}
+        for dim in bitmaps:
+            scope = dim.split(":", 1)[1] if ":" in dim else None
+            if scope is None:
+                universes[dim] = full
+            else:
+                universes[dim] = _to_bitmap(known[scope]) if known.get(scope) else 0
+        return cls(seats, bitmaps, universes)
+
+    # --- cache --------------------------------------------------------
+
+    def to_json(self) -> dict:
+        def enc(bm):
+            # Sparse bitmaps (most districts, small parties) as seat indices,
+            # dense ones as "<byte offset>:<hex>" without the leading zero bytes
+            n = bm.bit_count()
+            off = ((bm & -bm).bit_length() - 1) >> 3 if bm else 0
+            if n * 24 < bm.bit_length() - (off << 3):
+                return list(_iter_bits(bm))
+            return f"{off}:{bm >> (off << 3):x}"
+
+        return {
+            "version": CACHE_VERSION,
+            "seats": self.seats,
+            "bitmaps": {dim: {v: enc(bm) for v, bm in values.items()} for dim, values in self.bitmaps.items()},
+            "universes": {dim: enc(bm) for dim, bm in self.universes.items()},
+            "counts": self.counts,
+        }
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "SeatIndex":
+        if obj.get("version") != CACHE_VERSION:
+            raise ValueError("stale seat_query cache")
+
+        def dec(val):
+            if isinstance(val, list):
+                return _to_bitmap(val) if val else 0
+            off, hexdigits = val.split(":", 1)
+            return int(hexdigits, 16) << (int(off) << 3)
+
+        bitmaps = {dim: {v: dec(p) for v, p in values.items()} for dim, values in obj["bitmaps"].items()}
+        return cls(obj["seats"], bitmaps, {d: dec(p) for d, p in obj["universes"].items()}, obj["counts"])
+
+    # --- queries ------------------------------------------------------
+
+    def dims(self) -> list:
+        return list(self.bitmaps)
+
+    def _dim(self, dim: str) -> str:
+        dim = ALIASES.get(dim, dim)
+        if dim not in self.bitmaps:
+            raise QueryError(f"unknown dimension {dim!r} (have: {', '.join(self.dims())})")
+        return dim
+
+    def bitmap(self, dim: str, value: str) -> int:
+        dim = self._dim(dim)
+        key = self._folded[dim].get(value.strip().casefold())
+        return self.bitmaps[dim][key] if key is not None else 0
+
+    def term(self, text: str) -> int:
+        """Bitmap for one `dim=a,b` / `dim!=a,b` term."""
+        m = _TERM.match(text.strip())
+        if not m:
+            raise QueryError(f"bad term {text!r}; expected dim=value[,value] or dim!=value")
+        dim, op, values = self._dim(m.group(1)), m.group(2), m.group(3)
+        hit = 0
+        for v in values.split(","):
+            hit |= self.bitmap(dim, v)
+        return self.universes[dim] & ~hit if op == "!=" else hit
+
+    def select(self, terms) -> int:
+        mask = self.all
+        for t in terms:
+            mask &= self.term(t)
+        return mask
+
+    def group_by(self, dim: str, mask: int | None = None) -> dict:
+        """{value: seats} over `mask` (all seats: the cached counts), largest first."""
+        dim = self._dim(dim)
+        if mask is None or mask == self.all:
+            counts = self.counts[dim]
+        else:
+            key = (dim, mask)
+            counts = self._groups.get(key)
+            if counts is None:
+                counts = self._groups[key] = {v: (mask & bm).bit_count() for v, bm in self.bitmaps[dim].items()}
+        return dict(sorted(((v, n) for v, n in counts.items() if n), key=lambda kv: (-kv[1], kv[0])))
+
+    def members(self, mask: int) -> list:
+        return [self.seats[i] for i in _iter_bits(mask)]
+
+
+def _cache_key(sources: list) -> str:
+    h = hashlib.sha1()
+    for label, *paths in sources:
+        for p in paths:
+            st = p.stat() if p.exists() else None
+            h.update(f"{label}|{p.resolve()}|{st and st.st_size}|{st and st.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def open_index(src: Path, use_cache: bool = True) -> SeatIndex:
+    sources = find_sources(src)
+    if not sources:
+        raise FileNotFoundError(f"no {CONSOLIDATED} under {src}")
+    path = CACHE_DIR / f"{_cache_key(sources)}.json"
+    if use_cache and path.exists():
+        try:
+            return SeatIndex.from_json(json_io.load(path))
+        except (ValueError, KeyError):
+            pass
+    index = SeatIndex.build(sources)
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        json_io.write(path, index.to_json())
+    return index
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="seat_query.py", description="Bitmap-indexed seat filters and counts.")
+    parser.add_argument("terms", nargs="*", help="filters: dim=value[,value] or dim!=value[,value]")
+    parser.add_argument("--src", default=str(ROOT), help="consolidated JSON, a state dir, or a dir of state dirs")
+    parser.add_argument("--by", help="count matching seats per value of this dimension")
+    parser.add_argument("--count", action="store_true", help="print only the number of matching seats")
+    parser.add_argument("--limit", type=int, default=None, help="list at most this many seats")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild the index instead of using the cache")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        index = open_index(Path(args.src), use_cache=not args.no_cache)
+    except FileNotFoundError as exc:
+        print(f"{parser.prog}: {exc}", file=sys.stderr)
+        return 1
+    t1 = time.perf_counter()
+    try:
+        mask = index.select(args.terms)
+        groups = index.group_by(args.by, mask) if args.by else None
+    except QueryError as exc:
+        print(f"{parser.prog}: {exc}", file=sys.stderr)
+        return 2
+    matched = mask.bit_count()
+    t2 = time.perf_counter()
+
+    if groups is not None:
+        if args.json:
+            print(json.dumps({"matched": matched, "by": args.by, "counts": groups}, ensure_ascii=False, indent=2))
+        else:
+            for value, n in groups.items():
+                print(f"{n:>8}  {value}")
+    elif args.count:
+        print(json.dumps({"matched": matched}) if args.json else matched)
+    else:
+        rows = index.members(mask)[:args.limit]
+        if args.json:
+            keys = ("state", "no", "name", "district")
+            print(json.dumps({"matched": matched, "seats": [dict(zip(keys, r)) for r in rows]},
+                             ensure_ascii=False, indent=2))
+        else:
+            multi = len(index.counts.get("state", {})) > 1
+            for state, no, name, district in rows:
+                print("\t".join(([state] if multi else []) + [str(no), name, district]))
+    print(f"{matched} of {len(index)} seats; index {1000 * (t1 - t0):.1f} ms, query {1000 * (t2 - t1):.2f} ms",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
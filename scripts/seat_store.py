@@ -0,0 +1,351 @@
+"""Shared, indexed loader for the seat-level inputs used by the scripts.
+
+Parses the year results (district-keyed `<year>_results[.normalized].json`),
+`current_mla.json`, `bihar_constituencies.json` and `parties.json` once into
+a compact seat table:
+
+- `store.seats` is a list of `Seat` (in seat-number order when
+  bihar_constituencies.json is present); per-year results
+  and current MLAs live in lists aligned with it, so memory per seat is one
+  slot per year rather than a dict per record.
+- Lookups by seat number, slug and district are O(1) dict hits.
+- A year record may carry the full field as `"Candidates": [{Candidate,
+  Party, Votes, "%"?}, ...]` (NOTA included); it is kept on
+  `Result.candidates` (None otherwise). See candidate_store.py.
+
+Usage:
+    from seat_store import SeatStore
+    store = SeatStore.load()                 # raw year files in archive/
+    store = SeatStore.load(normalized=True)  # *.normalized.json
+    store = SeatStore.load(Path("synthetic/state-01"))
+    store.result(2020, 1).winner.party
+"""
+
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "archive"  # the seat-level inputs; outputs are written to ROOT
+YEARS = (2010, 2015, 2020)
+
+# Shared root-level modules (json_io, results_long, stage_profile)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+import json_io  # noqa: E402
+
+
+def load_json(path: Path):
+    # json_io skips a potential BOM and parses with orjson when installed
+    return json_io.load(path)
+
+
+def parties_path(root: Path) -> Path:
+    """parties.json next to the inputs, else one level up (the repo root for archive/, a dataset root for its states)."""
+    path = root / "parties.json"
+    return path if path.exists() else root.parent / "parties.json"
+
+
+def parse_no(val):
+    try:
+        return int(str(val).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def sanitize_int(val):
+    if val is None:
+        return None
+    s = str(val).strip().replace(",", "")
+    if s == "" or s == "None":
+        return None
+    try:
+        return int(s)
+    except ValueError:
+        try:
+            return int(float(s))
+        except Exception:
+            return None
+
+
+def _s(val) -> str:
+    return "" if val is None else str(val)
+
+
+class Seat:
+    __slots__ = ("no", "name", "slug", "district", "reserved", "lok_sabha_no", "lok_sabha")
+
+    def __init__(self, no, name="", slug="", district="", reserved=None, lok_sabha_no=None, lok_sabha=""):
+        self.no = no
+        self.name = name
+        self.slug = slug
+        self.district = district
+        self.reserved = reserved
+        self.lok_sabha_no = lok_sabha_no
+        self.lok_sabha = lok_sabha
+
+    def to_dict(self):
+        """Same shape as an entry of bihar_constituencies.json."""
+        return {
+            "no": self.no,
+            "name": self.name,
+            "slug": self.slug,
+            "district": self.district,
+            "reserved": self.reserved,
+            "lok_sabha_no": self.lok_sabha_no,
+            "lok_sabha": self.lok_sabha,
+        }
+
+
+class Candidate:
+    __slots__ = ("name", "party", "votes", "pct")
+
+    def __init__(self, name="", party="", votes="", pct=None):
+        self.name = name
+        self.party = party
+        self.votes = votes  # as published, e.g. "66,860"
+        self.pct = pct
+
+    @classmethod
+    def from_json(cls, obj):
+        if not isinstance(obj, dict):
+            return cls()
+        return cls(_s(obj.get("Candidate")), _s(obj.get("Party")), _s(obj.get("Votes")), obj.get("%"))
+
+    @property
+    def votes_int(self):
+        return sanitize_int(self.votes)
+
+    def to_dict(self):
+        out = {"Candidate": self.name, "Party": self.party, "Votes": self.votes}
+        if self.pct is not None:
+            out["%"] = self.pct
+        return out
+
+
+class Result:
+    __slots__ = ("no", "name", "district", "winner", "runner_up", "margin", "candidates")
+
+    def __init__(self, no, name, district, winner, runner_up, margin, candidates=None):
+        self.no = no
+        self.name = name
+        self.district = district  # district key as used in the year file
+        self.winner = winner
+        self.runner_up = runner_up
+        self.margin = margin
+        self.candidates = candidates  # full field ("Candidates" list) when the year file has one
+
+    @property
+    def margin_int(self):
+        return sanitize_int(self.margin)
+
+    def to_dict(self):
+        """Same shape as a record of the district-keyed year results."""
+        return {
+            "#": str(self.no),
+            "Name": self.name,
+            "Winner": self.winner.to_dict(),
+            "Runner up": self.runner_up.to_dict(),
+            "Margin": self.margin,
+            **({"Candidates": [c.to_dict() for c in self.candidates]} if self.candidates is not None else {}),
+        }
+
+
+class Mla:
+    __slots__ = ("no", "constituency", "district", "name", "party", "alliance", "remarks")
+
+    def __init__(self, no, constituency, district, name, party, alliance, remarks):
+        self.no = no
+        self.constituency = constituency
+        self.district = district
+        self.name = name
+        self.party = party
+        self.alliance = alliance
+        self.remarks = remarks
+
+    def to_dict(self):
+        """Same shape as a row of current_mla.json."""
+        return {
+            "No.": str(self.no),
+            "Constituency": self.constituency,
+            "Name": self.name,
+            "Party": self.party,
+            "Alliance": self.alliance,
+            "Remarks": self.remarks,
+        }
+
+
+class SeatStore:
+    __slots__ = ("seats", "results", "mlas", "parties", "_by_no", "_by_slug", "_by_district")
+
+    def __init__(self):
+        self.seats = []
+        self.results = {}  # year -> [Result | None] aligned with seats
+        self.mlas = []  # [Mla | None] aligned with seats
+        self.parties = {}  # code -> party dict from parties.json
+        self._by_no = {}
+        self._by_slug = {}
+        self._by_district = {}
+
+    # --- construction -------------------------------------------------
+
+    @classmethod
+    def load(cls, root: Path = SRC, years=YEARS, normalized: bool = False):
+        """Load the inputs under `root`.
+
+        bihar_constituencies.json and every requested year file must exist
+        (FileNotFoundError) and at least one seat must load (ValueError), so a
+        wrong directory fails instead of building empty outputs.
+        current_mla.json and parties.json (see parties_path) are optional.
+        """
+        store = cls()
+        root = Path(root)
+        suffix = "_results.normalized.json" if normalized else "_results.json"
+        store.add_constituencies(load_json(root / "bihar_constituencies.json"))
+        for year in years:
+            store.add_year_results(year, load_json(root / f"{year}{suffix}"))
+        if (root / "current_mla.json").exists():
+            store.add_current_mla(load_json(root / "current_mla.json"))
+        if parties_path(root).exists():
+            store.add_parties(load_json(parties_path(root)))
+        if not store.seats:
+            raise ValueError(f"No seats loaded from {root}")
+        return store
+
+    def _slot(self, no: int) -> int:
+        idx = self._by_no.get(no)
+        if idx is not None:
+            return idx
+        idx = len(self.seats)
+        self.seats.append(Seat(no))
+        self.mlas.append(None)
+        for arr in self.results.values():
+            arr.append(None)
+        self._by_no[no] = idx
+        return idx
+
+    def add_constituencies(self, obj):
+        """Index bihar_constituencies.json ({ "1": {no, name, slug, ...} })."""
+        if not isinstance(obj, dict):
+            return
+        items = []
+        for no_str, base in obj.items():
+            no = parse_no(no_str)
+            if no is not None:
+                items.append((no, base or {}))
+        for no, base in sorted(items, key=lambda t: t[0]):
+            seat = self.seats[self._slot(no)]
+            seat.name = _s(base.get("name"))
+            seat.slug = _s(base.get("slug"))
+            seat.district = _s(base.get("district"))
+            seat.reserved = base.get("reserved")
+            seat.lok_sabha_no = base.get("lok_sabha_no")
+            seat.lok_sabha = _s(base.get("lok_sabha"))
+            if seat.slug:
+                self._by_slug[seat.slug] = self._by_no[no]
+            if seat.district:
+                self._by_district.setdefault(seat.district.casefold(), []).append(self._by_no[no])
+
+    def add_year_results(self, year: int, obj):
+        """Index a district-keyed year results file ({ District: [{#, Name, Winner, ...}] })."""
+        if year not in self.results:
+            self.results[year] = [None] * len(self.seats)
+        if not isinstance(obj, dict):
+            return
+        for district, rows in obj.items():
+            if not isinstance(rows, list):
+                continue
+            for rec in rows:
+                no = parse_no(rec.get("#"))
+                if no is None:
+                    continue
+                idx = self._slot(no)
+                self.results[year][idx] = Result(
+                    no,
+                    _s(rec.get("Name")),
+                    district,
+                    Candidate.from_json(rec.get("Winner")),
+                    Candidate.from_json(rec.get("Runner up")),
+                    _s(rec.get("Margin")),
+                    [Candidate.from_json(c) for c in cands] if isinstance(cands := rec.get("Candidates"), list) else None,
+                )
+
+    def add_current_mla(self, obj):
+        """Index current_mla.json ({ District: [{No., Constituency, Name, Party, Alliance, Remarks}] })."""
+        if not isinstance(obj, dict):
+            return
+        for district, rows in obj.items():
+            if not isinstance(rows, list):
+                continue
+            for row in rows:
+                no = parse_no(row.get("No."))
+                if no is None:
+                    continue
+                idx = self._slot(no)
+                self.mlas[idx] = Mla(
+                    no,
+                    _s(row.get("Constituency")),
+                    district,
+                    _s(row.get("Name")),
+                    _s(row.get("Party")),
+                    _s(row.get("Alliance")),
+                    _s(row.get("Remarks")),
+                )
+
+    def add_parties(self, arr):
+        if not isinstance(arr, list):
+            return
+        for p in arr:
+            if isinstance(p, dict) and p.get("code"):
+                self.parties[p["code"]] = p
+
+    # --- lookups ------------------------------------------------------
+
+    @property
+    def years(self):
+        return sorted(self.results)
+
+    def __len__(self):
+        return len(self.seats)
+
+    def __iter__(self):
+        return iter(self.seats)
+
+    def index_of(self, no: int):
+        return self._by_no.get(no)
+
+    def get(self, no: int):
+        idx = self._by_no.get(no)
+        return None if idx is None else self.seats[idx]
+
+    def by_slug(self, slug: str):
+        idx = self._by_slug.get(slug)
+        return None if idx is None else self.seats[idx]
+
+    def in_district(self, district: str):
+        return [self.seats[i] for i in self._by_district.get((district or "").casefold(), [])]
+
+    @property
+    def districts(self):
+        return sorted({s.district for s in self.seats if s.district})
+
+    def result(self, year: int, no: int):
+        idx = self._by_no.get(no)
+        arr = self.results.get(year)
+        if idx is None or arr is None:
+            return None
+        return arr[idx]
+
+    def mla(self, no: int):
+        idx = self._by_no.get(no)
+        return None if idx is None else self.mlas[idx]
+
+    def party(self, code: str):
+        return self.parties.get(code)
+
+    def iter_results(self, year: int):
+        """Results for `year` in seat-number order, skipping seats without one."""
+        return (r for r in self.results.get(year, []) if r is not None)
+
+    def iter_mlas(self):
+        return (m for m in self.mlas if m is not None)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Local JSON origin for the consolidated results (asyncio, stdlib only).
+
+Usage: python scripts/serve_api.py [--host 0.0.0.0] [--port 8080] [--poll 2]
+
+Endpoints (GET/HEAD):
+- /results             full bihar_election_results_consolidated.json
+- /parties             parties.json
+- /seat/<no>           one consolidated row (e.g. /seat/57 or /seat/057)
+- /district/<name>     rows for a district (case-insensitive)
+- /party/<code>        party metadata plus seats it holds; ?year=2020 uses
+                       y2020_winner_party, default is current_mla_party
+- /healthz             data version and row count
+
+Responses carry a strong ETag (sha256 of the body) and honour If-None-Match
+with 304. Bodies are gzip-compressed once when rendered and kept in an LRU
+cache. The input files are polled for changes; a reload swaps the whole
+dataset at once and clears the cache.
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import json_io  # noqa: E402
+
+RESULTS_PATH = ROOT / "bihar_election_results_consolidated.json"
+PARTIES_PATH = ROOT / "parties.json"
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _compact(obj) -> bytes:
+    return json_io.dumps_bytes(obj)
+
+
+class Rendered:
+    __slots__ = ("status", "body", "gzip_body", "etag")
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+class Dataset:
+    """Immutable snapshot of the inputs plus the lookup indexes built from them."""
+
+    def __init__(self, rows, parties, version: str):
+        self.rows = rows
+        self.parties = parties
+        self.version = version
+        self.by_no = {}
+        self.by_district = {}
+        for row in rows:
+            try:
+                self.by_no[int(str(row.get("no", "")))] = row
+            except ValueError:
+                continue
+            self.by_district.setdefault((row.get("district") or "").casefold(), []).append(row)
+        self.parties_by_code = {p.get("code"): p for p in parties if isinstance(p, dict)}
+
+    @classmethod
+    def load(cls, results_path: Path, parties_path: Path):
+        results_bytes = results_path.read_bytes()
+        parties_bytes = parties_path.read_bytes() if parties_path.exists() else b"[]"
+        version = hashlib.sha256(results_bytes + b"\0" + parties_bytes).hexdigest()[:16]
+        rows = json.loads(results_bytes.decode("utf-8-sig"))
+        parties = json.loads(parties_bytes.decode("utf-8-sig"))
+        return cls(rows if isinstance(rows, list) else [], parties if isinstance(parties, list) else [], version)
+
+    def render(self, path: str, query: dict):
+        """Return (status, payload) for a request path."""
+        parts = [unquote(p) for p in path.strip("/").split("/") if p]
+        if not parts or parts == ["results"]:
+            return 200, self.rows
+        head, rest = parts[0], "/".join(parts[1:])
+        if head == "parties" and not rest:
+            return 200, self.parties
+        if head == "healthz" and not rest:
+            return 200, {"version": self.version, "rows": len(self.rows)}
+        if head == "seat" and rest:
+            try:
+                row = self.by_no.get(int(rest))
+            except ValueError:
+                return 400, {"error": f"Invalid seat number: {rest}"}
+            return (200, row) if row else (404, {"error": f"Seat {rest} not found"})
+        if head == "district" and rest:
+            rows = self.by_district.get(rest.casefold())
+            return (200, rows) if rows else (404, {"error": f"District {rest} not found"})
+        if head == "party" and rest:
+            meta = self.parties_by_code.get(rest)
+            year = (query.get("year") or [""])[0]
+            field = f"y{year}_winner_party" if year else "current_mla_party"
+            seats = [r for r in self.rows if r.get(field) == rest]
+            if not meta and not seats:
+                return 404, {"error": f"Party {rest} not found"}
+            return 200, {"party": meta, "field": field, "count": len(seats), "seats": seats}
+        return 404, {"error": f"Unknown path: /{'/'.join(parts)}"}
+
+
+class ResponseCache:
+    """Small LRU of rendered responses keyed by (path, query)."""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+        return item
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+
+class ApiServer:
+    def __init__(self, results_path=RESULTS_PATH, parties_path=PARTIES_PATH, max_age: int = 10, cache_size: int = 512):
+        self.results_path = Path(results_path)
+        self.parties_path = Path(parties_path)
+        self.max_age = max_age
+        self.cache = ResponseCache(cache_size)
+        self.data = Dataset.load(self.results_path, self.parties_path)
+        self._mtimes = self._stat()
+
+    def _stat(self):
+        out = []
+        for p in (self.results_path, self.parties_path):
+            try:
+                st = p.stat()
+                out.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                out.append(None)
+        return tuple(out)
+
+    def reload_if_changed(self) -> bool:
+        mtimes = self._stat()
+        if mtimes == self._mtimes:
+            return False
+        try:
+            data = Dataset.load(self.results_path, self.parties_path)
+        except (OSError, ValueError) as e:
+            # Half-written file: keep serving the old snapshot and retry next poll
+            print(f"Reload skipped: {e}", file=sys.stderr)
+            return False
+        self._mtimes = mtimes
+        if data.version != self.data.version:
+            self.data = data
+            self.cache.clear()
+            print(f"Reloaded data version {data.version} ({len(data.rows)} rows)", file=sys.stderr)
+        return True
+
+    async def watch(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.reload_if_changed()
+
+    def lookup(self, target: str) -> Rendered:
+        parts = urlsplit(target)
+        key = (self.data.version, parts.path, parts.query)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+        status, payload = self.data.render(parts.path, parse_qs(parts.query))
+        rendered = Rendered(status, _compact(payload))
+        self.cache.put(key, rendered)
+        return rendered
+
+    def respond(self, method: str, target: str, headers: dict) -> bytes:
+        if method not in ("GET", "HEAD"):
+            return self._head(405, {"Allow": "GET, HEAD", "Content-Length": "0"})
+        r = self.lookup(target)
+        use_gzip = "gzip" in headers.get("accept-encoding", "")
+        # Strong ETags are per representation, so the gzip body gets its own tag
+        etag = r.etag[:-1] + '-gz"' if use_gzip else r.etag
+        common = {
+            "Content-Type": "application/json; charset=utf-8",
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": f"public, max-age={self.max_age}" if r.status == 200 else "no-store",
+            "Access-Control-Allow-Origin": "*",
+        }
+        inm = headers.get("if-none-match", "")
+        if r.status == 200 and inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+            return self._head(304, {k: v for k, v in common.items() if k != "Content-Type"})
+        body = r.body
+        if use_gzip:
+            body = r.gzip_body
+            common["Content-Encoding"] = "gzip"
+        common["Content-Length"] = str(len(body))
+        head = self._head(r.status, common)
+        return head if method == "HEAD" else head + body
+
+    @staticmethod
+    def _head(status: int, headers: dict) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    writer.write(self._head(400, {"Content-Length": "0", "Connection": "close"}))
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                writer.write(self.respond(method.upper(), target, headers))
+                await writer.drain()
+                conn = headers.get("connection", "").lower()
+                if conn == "close" or (version == "HTTP/1.0" and conn != "keep-alive"):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int, poll: float, max_age: int):
+    api = ApiServer(max_age=max_age)
+    server = await asyncio.start_server(api.handle, host, port)
+    print(f"Serving {len(api.data.rows)} rows (version {api.data.version}) on http://{host}:{port}", file=sys.stderr)
+    watcher = asyncio.create_task(api.watch(poll))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="serve_api.py", description="Serve consolidated results as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--poll", type=float, default=2.0, help="seconds between input file change checks")
+    parser.add_argument("--max-age", type=int, default=10, help="Cache-Control max-age for 200 responses")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.poll, args.max_age))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Replay a synthetic counting day as live_ingest.py updates.
+
+Usage:
+    python scripts/simulate_counting.py --drop incoming/ --speed 600
+    python scripts/simulate_counting.py --connect 127.0.0.1:9099 --speed 0   # as fast as possible
+    python scripts/simulate_counting.py --seed 7 > feed.ndjson               # stdout
+
+Every seat in the consolidated JSON is counted in 15-35 rounds spread over
+a simulated 08:00-18:00 day; the two contenders are the seat's 2020 winner
+and runner-up parties (placeholder candidate names), and cumulative votes
+drift round to round so leads can change hands before the final "won"
+update. --speed is simulated seconds per real second (600 replays the day
+in one minute; 0 sends everything without waiting). The same --seed gives
+the same feed.
+"""
+
+import argparse
+import json
+import random
+import socket
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_PATH = ROOT / "bihar_election_results_consolidated.json"
+
+DAY_SECONDS = 10 * 3600  # 08:00 -> 18:00
+
+
+def contenders(row, rng: random.Random):
+    no = str(row.get("no", ""))
+    a = row.get("y2020_winner_party") or rng.choice(["BJP", "JD(U)", "RJD", "INC"])
+    b = row.get("y2020_runner_party") or rng.choice(["RJD", "INC", "LJP", "IND"])
+    return [{"name": f"Candidate {no}A", "party": a}, {"name": f"Candidate {no}B", "party": b}]
+
+
+def seat_events(row, rng: random.Random):
+    """[(sim_second, update)] for one seat, ending with status "won"."""
+    rounds = rng.randint(15, 35)
+    finish = rng.uniform(0.4, 1.0) * DAY_SECONDS
+    total = rng.randint(90_000, 220_000)
+    share = rng.uniform(0.40, 0.60)  # final share of the two-way vote for contender A
+    people = contenders(row, rng)
+    votes = [0, 0]
+    events = []
+    for rnd in range(1, rounds + 1):
+        counted = total * rnd // rounds
+        # Early rounds wander around the final share; the last round lands on it
+        drift = rng.gauss(0, 0.06) * (1 - rnd / rounds)
+        target_a = int(counted * min(max(share + drift, 0.05), 0.95))
+        votes = [max(votes[0], target_a), max(votes[1], counted - target_a)]
+        lead = 0 if votes[0] >= votes[1] else 1
+        events.append((finish * rnd / rounds, {
+            "no": int(row["no"]),
+            "round": rnd,
+            "status": "won" if rnd == rounds else "leading",
+            "leader": {**people[lead], "votes": votes[lead]},
+            "trailing": {**people[1 - lead], "votes": votes[1 - lead]},
+        }))
+    return events
+
+
+def build_feed(rows, seed: int):
+    rng = random.Random(seed)
+    events = []
+    for row in rows:
+        events.extend(seat_events(row, rng))
+    events.sort(key=lambda e: (e[0], e[1]["no"]))
+    return events
+
+
+class Sink:
+    def __init__(self, drop=None, connect=None):
+        self.drop = Path(drop) if drop else None
+        self.sock = None
+        self.batch = 0
+        if self.drop:
+            self.drop.mkdir(parents=True, exist_ok=True)
+        if connect:
+            host, _, port = connect.rpartition(":")
+            self.sock = socket.create_connection((host or "127.0.0.1", int(port)))
+
+    def send(self, updates):
+        text = "".join(json.dumps(u, ensure_ascii=False) + "\n" for u in updates)
+        if self.drop:
+            self.batch += 1
+            # Write then rename so the watcher never sees a partial file
+            tmp = self.drop / f".feed-{self.batch:06d}.tmp"
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(self.drop / f"feed-{self.batch:06d}.ndjson")
+        elif self.sock:
+            self.sock.sendall(text.encode("utf-8"))
+        else:
+            sys.stdout.write(text)
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+
+
+def replay(events, sink: Sink, speed: float, tick: float = 0.1) -> int:
+    """Send events in simulated time; updates due within one tick are batched."""
+    start = time.perf_counter()
+    i = 0
+    while i < len(events):
+        if speed > 0:
+            now_sim = (time.perf_counter() - start) * speed
+            if events[i][0] > now_sim:
+                time.sleep(min(tick, (events[i][0] - now_sim) / speed))
+                continue
+            j = i
+            while j < len(events) and events[j][0] <= now_sim:
+                j += 1
+        else:
+            j = len(events)
+        sink.send([u for _t, u in events[i:j]])
+        i = j
+    return len(events)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="simulate_counting.py", description="Generate a synthetic counting-day feed.")
+    parser.add_argument("--results", default=str(RESULTS_PATH), help="consolidated JSON providing the seats")
+    parser.add_argument("--drop", help="write batches as files into this directory")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="send NDJSON to a live_ingest.py --listen socket")
+    parser.add_argument("--speed", type=float, default=600.0, help="simulated seconds per real second (0 = no waiting)")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args(argv)
+
+    with open(args.results, "r", encoding="utf-8-sig") as f:
+        rows = [r for r in json.load(f) if str(r.get("no", "")).strip().isdigit()]
+    events = build_feed(rows, args.seed)
+    sink = Sink(args.drop, args.connect)
+    t0 = time.perf_counter()
+    try:
+        n = replay(events, sink, args.speed)
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - t0
+    print(f"Sent {n} updates for {len(rows)} seats in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
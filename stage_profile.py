@@ -0,0 +1,238 @@
+"""Per-stage timing shared by the pipeline scripts (--profile).
+
+Usage (scripts):
+    import stage_profile
+    prof = stage_profile.start("build_consolidated", profile=True)
+    with stage_profile.stage("load") as st:
+        store = SeatStore.load(...)
+        st.records = len(store)
+    stage_profile.finish()
+
+Code that runs inside a profiled script calls `stage_profile.stage(name)`
+without caring whether profiling is on; with no active profiler it is a
+no-op. Streaming readers can be wrapped with `timed_iter(name, iterable)`,
+which charges only the time spent producing items to `name` (so a
+streaming convert splits into e.g. "parse" and the enclosing "convert").
+
+Each stage records wall seconds, CPU seconds (process time), allocations
+(tracemalloc peak and net growth, in KB) and an optional record count.
+finish() prints a table to stderr and appends one JSON line per run to the
+trace file (default .build_cache/trace.ndjson):
+
+    {"script": "build_consolidated", "started": "2025-...Z", "argv": [...],
+     "python": "3.11.7", "wall_s": 0.41, "cpu_s": 0.40,
+     "stages": [{"name": "load", "wall_s": 0.09, "cpu_s": 0.09,
+                 "alloc_peak_kb": 3120, "alloc_net_kb": 1450, "records": 243}, ...]}
+
+With a cProfile path the whole run is also profiled and dumped there
+(open with `python -m pstats FILE` or snakeviz). Stages that run inside
+worker processes (-j > 1) are not traced; the parent's stage around the
+pool still is. Allocation tracing slows Python down noticeably, so compare
+timings only between runs made with the same flags; a caller that drives
+the scripts in-process (scripts/benchmark.py) can set ALLOCATIONS = False
+for timing-only runs.
+"""
+
+import contextlib
+import cProfile
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+ROOT = Path(__file__).resolve().parent
+TRACE_PATH = ROOT / ".build_cache" / "trace.ndjson"
+# Whether profilers started by start() trace allocations
+ALLOCATIONS = True
+
+
+class Stage:
+    __slots__ = ("name", "records", "wall_s", "cpu_s", "alloc_peak_kb", "alloc_net_kb")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.records = None
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.alloc_peak_kb = None
+        self.alloc_net_kb = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {"name": self.name, "wall_s": round(self.wall_s, 6), "cpu_s": round(self.cpu_s, 6)}
+        if self.alloc_peak_kb is not None:
+            out["alloc_peak_kb"] = self.alloc_peak_kb
+            out["alloc_net_kb"] = self.alloc_net_kb
+        if self.records is not None:
+            out["records"] = self.records
+        return out
+
+
+class Profiler:
+    def __init__(self, script: str, trace_path: Path | None = TRACE_PATH, cprofile_path: Path | None = None,
+                 allocations: bool = True):
+        self.script = script
+        self.trace_path = trace_path
+        self.cprofile_path = cprofile_path
+        self.allocations = allocations
+        self.stages: List[Stage] = []
+        self._by_name: Dict[str, Stage] = {}
+        self._started = datetime.now(timezone.utc)
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._cprofile = None
+        if allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def _get(self, name: str) -> Stage:
+        st = self._by_name.get(name)
+        if st is None:
+            st = self._by_name[name] = Stage(name)
+            self.stages.append(st)
+        return st
+
+    @contextlib.contextmanager
+    def stage(self, name: str, records: int | None = None):
+        """Time a block; repeated names accumulate into one stage."""
+        st = self._get(name)
+        if records is not None:
+            st.records = (st.records or 0) + records
+        tracing = self.allocations and tracemalloc.is_tracing()
+        if tracing:
+            before, _peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        w0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield st
+        finally:
+            st.wall_s += time.perf_counter() - w0
+            st.cpu_s += time.process_time() - c0
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                st.alloc_peak_kb = max(st.alloc_peak_kb or 0, (peak - before) // 1024)
+                st.alloc_net_kb = (st.alloc_net_kb or 0) + (current - before) // 1024
+
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield from `iterable`, charging only the time spent in next() to `name`."""
+        st = self._get(name)
+        st.records = st.records or 0
+        it = iter(iterable)
+        while True:
+            w0, c0 = time.perf_counter(), time.process_time()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                st.wall_s += time.perf_counter() - w0
+                st.cpu_s += time.process_time() - c0
+            st.records += 1
+            yield item
+
+    def finish(self, extra: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        if self._cprofile:
+            self._cprofile.disable()
+            self.cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cprofile.dump_stats(str(self.cprofile_path))
+        run = {
+            "script": self.script,
+            "started": self._started.isoformat().replace("+00:00", "Z"),
+            "argv": sys.argv[1:],
+            "python": platform.python_version(),
+            "wall_s": round(time.perf_counter() - self._wall0, 6),
+            "cpu_s": round(time.process_time() - self._cpu0, 6),
+            "stages": [st.to_dict() for st in self.stages],
+        }
+        if extra:
+            run.update(extra)
+        if self.allocations and tracemalloc.is_tracing():
+            run["alloc_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+        if self.trace_path:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.trace_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(run, ensure_ascii=False, separators=(",", ":")) + "\n")
+        print(format_run(run), file=sys.stderr)
+        return run
+
+
+def format_run(run: Dict[str, Any]) -> str:
+    lines = [f"-- profile: {run['script']} ({run['wall_s']:.3f}s wall, {run['cpu_s']:.3f}s cpu)"]
+    for st in run["stages"]:
+        alloc = f"{st['alloc_peak_kb']:>9,} KB peak" if "alloc_peak_kb" in st else ""
+        recs = f"{st['records']:>10,} rec" if "records" in st else ""
+        lines.append(f"  {st['name']:<28}{st['wall_s'] * 1000:>10.1f} ms wall{st['cpu_s'] * 1000:>10.1f} ms cpu  {alloc}  {recs}")
+    return "\n".join(lines)
+
+
+_ACTIVE: Profiler | None = None
+
+
+def start(script: str, profile: bool | str = False, cprofile: str | None = None) -> Profiler | None:
+    """Activate a profiler for this process (profile=True or a trace path); returns it or None."""
+    global _ACTIVE
+    if not profile and not cprofile:
+        _ACTIVE = None
+        return None
+    trace = TRACE_PATH if profile is True or not profile else Path(profile)
+    _ACTIVE = Profiler(script, trace, Path(cprofile) if cprofile else None, allocations=ALLOCATIONS)
+    return _ACTIVE
+
+
+def active() -> Profiler | None:
+    return _ACTIVE
+
+
+class _NullStage:
+    records = None
+
+
+@contextlib.contextmanager
+def _null_stage():
+    yield _NullStage()
+
+
+def stage(name: str, records: int | None = None):
+    """Profiler.stage on the active profiler, or a no-op."""
+    return _ACTIVE.stage(name, records) if _ACTIVE else _null_stage()
+
+
+def timed_iter(name: str, iterable: Iterable) -> Iterable:
+    return _ACTIVE.timed_iter(name, iterable) if _ACTIVE else iterable
+
+
+def finish(extra: Dict[str, Any] | None = None) -> Dict[str, Any] | None:
+    global _ACTIVE
+    prof, _ACTIVE = _ACTIVE, None
+    return prof.finish(extra) if prof else None
+
+
+def add_arguments(parser) -> None:
+    """--profile [TRACE] and --cprofile FILE for argparse-based scripts."""
+    parser.add_argument("--profile", nargs="?", const=True, default=False, metavar="TRACE",
+                        help=f"record per-stage timings (appended to TRACE, default {TRACE_PATH.relative_to(ROOT)})")
+    parser.add_argument("--cprofile", metavar="FILE", help="also dump a cProfile of the run to FILE")
+
+
+def pop_arguments(args: List[str]) -> tuple:
+    """Strip --profile[=TRACE] / --cprofile=FILE from a hand-parsed argv; returns (args, profile, cprofile)."""
+    rest, profile, cprofile = [], False, None
+    it = iter(args)
+    for a in it:
+        if a == "--profile":
+            profile = True
+        elif a.startswith("--profile="):
+            profile = a.split("=", 1)[1] or True
+        elif a == "--cprofile":
+            cprofile = next(it, None)
+        elif a.startswith("--cprofile="):
+            cprofile = a.split("=", 1)[1]
+        else:
+            rest.append(a)
+    return rest, profile, cprofile